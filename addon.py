@@ -1,14 +1,39 @@
 import bpy
+import bmesh
 import mathutils
+import math
+import numpy as np
 import json
+import sys
+import argparse
 import threading
 import socket
 import time
+import urllib.parse
+import zlib
 import requests
 import tempfile
 import traceback
 import os
 import shutil
+import stat
+import struct
+import queue
+import collections
+import concurrent.futures
+import contextlib
+import itertools
+import types
+import bisect
+import fnmatch
+import hashlib
+import re
+try:
+    import fcntl
+    msvcrt = None
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 from bpy.props import StringProperty, IntProperty, BoolProperty, EnumProperty
 
 # Required dependencies
@@ -24,13 +49,1762 @@ bl_info = {
     "category": "Interface",
 }
 
+# Wire protocol shared with the MCP server. Every message is a fixed header followed by
+# the JSON payload: magic (4s) | version (B) | flags (B) | reserved (H) | length (Q)
+# Clients that send raw JSON without a header are served with the legacy protocol.
+PROTOCOL_MAGIC = b"BMCP"
+PROTOCOL_VERSION = 1
+FRAME_HEADER = struct.Struct("!4sBBHQ")
+MAX_PAYLOAD_SIZE = 1 << 32
+# Frame flag: the payload is one chunk of a streamed reply and more frames follow. The chunk
+# is NDJSON whose first line is {"id": <request id>}; the final frame is a normal response.
+FLAG_PARTIAL = 0x01
+# Frame flag: the payload is a JSON document followed by binary attachments. Layout:
+# JSON length (I) | JSON | blobs. NumPy arrays at the top level of a result are sent as
+# little-endian blobs and replaced in the JSON by {"$attachment", "dtype", "shape", "offset",
+# "length"} references, with offsets relative to the start of the blobs.
+FLAG_ATTACHMENTS = 0x02
+ATTACHMENT_HEADER = struct.Struct("!I")
+# Frame flag (with FLAG_ATTACHMENTS): the blobs were written to a file in the MCP server's
+# shared memory directory and the JSON carries {"handle", "offset", "length"} under "shared"
+FLAG_SHARED = 0x04
+# Frame flag: the payload is compressed: codec (B) | uncompressed length (Q) | compressed data.
+# The codec and size threshold are negotiated in the handshake; small messages are never compressed.
+FLAG_COMPRESSED = 0x08
+COMPRESSION_HEADER = struct.Struct("!BQ")
+CODEC_IDS = {"zlib": 1, "lz4": 2}
+try:
+    import lz4.frame
+    COMPRESSION_CODECS = {"lz4", "zlib"}
+except ImportError:
+    COMPRESSION_CODECS = {"zlib"}
+
+def _recv_exactly(sock, size):
+    """Receive exactly size bytes, or return None if the peer closed the connection"""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], min(size - received, 1 << 20))
+        if count == 0:
+            return None
+        received += count
+    return buffer
+
+def _json_default(value):
+    # Arrays that cannot travel as attachments (legacy clients, nested values) become lists
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _split_attachments(response):
+    """Move NumPy arrays at the top level of the result out of the JSON document"""
+    result = response.get("result")
+    if not isinstance(result, dict) or not any(isinstance(value, np.ndarray) for value in result.values()):
+        return response, []
+    
+    blobs = []
+    offset = 0
+    refs = {}
+    for key, value in result.items():
+        if isinstance(value, np.ndarray):
+            array = np.ascontiguousarray(value, dtype=value.dtype.newbyteorder('<'))
+            refs[key] = {
+                "$attachment": len(blobs),
+                "dtype": array.dtype.name,
+                "shape": list(array.shape),
+                "offset": offset,
+                "length": array.nbytes,
+            }
+            blobs.append(memoryview(array).cast('B'))
+            offset += array.nbytes
+    return {**response, "result": {**result, **refs}}, blobs
+
+class SharedMemoryWriter:
+    """Writes large attachments into the shared memory directory of an MCP server on this host.
+    
+    The server maps each file and removes it as soon as the reply arrives. Files are named
+    <pid>-<connection>-<n>.bin so that the server can sweep the files of a Blender that died,
+    and so that a connection can sweep its own unread files when it closes.
+    """
+    
+    _connections = itertools.count(1)
+    
+    def __init__(self, path, threshold):
+        self.path = path
+        self.threshold = threshold
+        self.prefix = f"{os.getpid()}-{next(self._connections)}-"
+        self._files = itertools.count(1)
+    
+    @classmethod
+    def accept(cls, offer):
+        """A writer for the offered directory, or None if it is not visible from this process"""
+        if not isinstance(offer, dict) or os.name != "posix":
+            return None
+        try:
+            # Reading the token back proves both processes see the same directory
+            with open(os.path.join(offer["path"], "token")) as f:
+                if f.read() != offer["token"]:
+                    return None
+            return cls(offer["path"], int(offer.get("threshold", 1 << 20)))
+        except (OSError, KeyError, TypeError, ValueError):
+            return None
+    
+    def write(self, blobs):
+        """Write the blobs into a new file and return its descriptor"""
+        handle = f"{self.prefix}{next(self._files)}.bin"
+        path = os.path.join(self.path, handle)
+        length = 0
+        try:
+            with open(path, "xb") as f:
+                for blob in blobs:
+                    f.write(blob)
+                    length += blob.nbytes
+        except Exception:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            raise
+        return {"handle": handle, "offset": 0, "length": length}
+    
+    def sweep(self):
+        """Remove the files of this connection that the server never mapped"""
+        try:
+            names = os.listdir(self.path)
+        except OSError:
+            return
+        for name in names:
+            if name.startswith(self.prefix):
+                try:
+                    os.unlink(os.path.join(self.path, name))
+                except OSError:
+                    pass
+
+class CompressionStats:
+    """Counters for the payloads compressed by all client connections"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.frames = 0
+        self.skipped = 0  # Compressed, but not smaller, so sent as is
+        self.uncompressed_bytes = 0
+        self.compressed_bytes = 0
+        self.seconds = 0.0
+    
+    def record(self, uncompressed, compressed, seconds):
+        with self.lock:
+            if compressed is None:
+                self.skipped += 1
+            else:
+                self.frames += 1
+                self.uncompressed_bytes += uncompressed
+                self.compressed_bytes += compressed
+            self.seconds += seconds
+    
+    def get_stats(self):
+        with self.lock:
+            return {
+                "frames": self.frames,
+                "skipped": self.skipped,
+                "uncompressed_bytes": self.uncompressed_bytes,
+                "compressed_bytes": self.compressed_bytes,
+                "ratio": round(self.uncompressed_bytes / self.compressed_bytes, 3) if self.compressed_bytes else None,
+                "cpu_ms": round(self.seconds * 1000, 3),
+            }
+
+compression_stats = CompressionStats()
+
+class PayloadCompressor:
+    """Compresses the large payloads of one client connection with the negotiated codec"""
+    
+    def __init__(self, codec, threshold):
+        self.codec = codec
+        self.threshold = threshold
+    
+    @classmethod
+    def negotiate(cls, offer):
+        """A compressor for the first offered codec available here, or None"""
+        if not isinstance(offer, dict):
+            return None
+        for codec in offer.get("codecs") or []:
+            if codec in COMPRESSION_CODECS:
+                return cls(codec, int(offer.get("threshold", 16384)))
+        return None
+    
+    def compress(self, payload):
+        """The compressed payload (with its header), or None if it is small or did not shrink"""
+        if len(payload) < self.threshold:
+            return None
+        start = time.perf_counter()
+        if self.codec == "lz4":
+            data = lz4.frame.compress(payload)
+        else:
+            # Level 1: most of the gain on JSON for a fraction of the CPU time
+            data = zlib.compress(payload, 1)
+        seconds = time.perf_counter() - start
+        if len(data) + COMPRESSION_HEADER.size >= len(payload):
+            compression_stats.record(len(payload), None, seconds)
+            return None
+        compression_stats.record(len(payload), len(data) + COMPRESSION_HEADER.size, seconds)
+        return COMPRESSION_HEADER.pack(CODEC_IDS[self.codec], len(payload)) + data
+
+def _frame(payload, flags, compressor):
+    """Header and payload of one frame, compressed when the payload is large enough"""
+    compressed = compressor.compress(payload) if compressor is not None else None
+    if compressed is not None:
+        payload = compressed
+        flags |= FLAG_COMPRESSED
+    return FRAME_HEADER.pack(PROTOCOL_MAGIC, PROTOCOL_VERSION, flags, 0, len(payload)) + payload
+
+def _encode_message(response, framed, shared=None, compressor=None):
+    """Serialize a response in the same protocol the request arrived in, as a list of buffers"""
+    blobs = []
+    if framed:
+        response, blobs = _split_attachments(response)
+    if shared is not None and blobs and sum(blob.nbytes for blob in blobs) >= shared.threshold:
+        response = {**response, "shared": shared.write(blobs)}
+        payload = json.dumps(response, default=_json_default).encode('utf-8')
+        length = ATTACHMENT_HEADER.size + len(payload)
+        header = FRAME_HEADER.pack(PROTOCOL_MAGIC, PROTOCOL_VERSION, FLAG_ATTACHMENTS | FLAG_SHARED, 0, length)
+        return [header + ATTACHMENT_HEADER.pack(len(payload)) + payload]
+    
+    payload = json.dumps(response, default=_json_default).encode('utf-8')
+    if not framed:
+        return [payload]
+    if not blobs:
+        return [_frame(payload, 0, compressor)]
+    
+    length = ATTACHMENT_HEADER.size + len(payload) + sum(blob.nbytes for blob in blobs)
+    header = FRAME_HEADER.pack(PROTOCOL_MAGIC, PROTOCOL_VERSION, FLAG_ATTACHMENTS, 0, length)
+    # The blobs are sent straight from the arrays' memory
+    return [header + ATTACHMENT_HEADER.pack(len(payload)) + payload, *blobs]
+
+class ClientReply:
+    """Sends the response (or streamed chunks) for one command back to the client that sent it"""
+    
+    def __init__(self, client, send_lock, request_id, framed, shared=None, compressor=None):
+        self.client = client
+        self.send_lock = send_lock
+        self.request_id = request_id
+        self.framed = framed
+        self.shared = shared
+        self.compressor = compressor
+    
+    @property
+    def can_stream(self):
+        # Chunks are routed by request id, which only framed clients send
+        return self.framed and self.request_id is not None
+    
+    def __call__(self, response):
+        if self.request_id is not None:
+            response = {**response, "id": self.request_id}
+        buffers = _encode_message(response, self.framed, self.shared, self.compressor)
+        with self.send_lock:
+            for data in buffers:
+                self.client.sendall(data)
+    
+    def send_chunk(self, records):
+        """Send a list of records as one partial NDJSON frame"""
+        lines = [json.dumps({"id": self.request_id})]
+        lines.extend(json.dumps(record, separators=(",", ":")) for record in records)
+        payload = ("\n".join(lines) + "\n").encode('utf-8')
+        data = _frame(payload, FLAG_PARTIAL, self.compressor)
+        with self.send_lock:
+            self.client.sendall(data)
+
+def collect_stream(generator):
+    """Collect a streamed result into one response for clients that cannot receive chunks"""
+    records = []
+    try:
+        while True:
+            try:
+                records.extend(next(generator))
+            except StopIteration as done:
+                return {"status": "success", "result": {**(done.value or {}), "records": records}}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+class Deferred:
+    """Handler result for commands whose slow part (e.g. a download) does not need bpy.
+    
+    The dispatcher calls run() on a worker thread and then finish(value) with its return value
+    back on the main thread; what finish returns is the command's result. run must not touch
+    bpy. Other commands keep running meanwhile, and the reply goes out when finish is done.
+    """
+    
+    def __init__(self, run, finish):
+        self.run = run
+        self.finish = finish
+
+def resolve_deferred(deferred):
+    """Run both phases of a deferred result in place, for callers that need it synchronously"""
+    try:
+        return {"status": "success", "result": deferred.finish(deferred.run())}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+class CommandDispatcher:
+    """Runs queued commands on Blender's main thread from one persistent timer.
+    
+    Each tick drains the queue until the time budget is spent and then yields so the UI
+    can redraw; the remaining commands run on the following ticks.
+    
+    A handler may return a generator of record lists instead of a result. Its chunks are
+    produced one per step, interleaved with other commands, and streamed to the client.
+    It may also return a Deferred, whose first phase runs on a thread pool.
+    """
+    IDLE_INTERVAL = 0.005  # Seconds between polls of an empty queue
+    WORKER_THREADS = 4  # For the first phase of Deferred results (downloads)
+    
+    def __init__(self, execute, budget_ms=8.0):
+        self.execute = execute
+        self.budget_ms = budget_ms
+        self.queue = queue.Queue()
+        self.streams = collections.deque()  # (generator, reply) of streamed results in progress
+        self.continuations = queue.Queue()  # (deferred, future, reply) whose first phase is done
+        self.executor = None
+        self.deferred_in_flight = 0
+        self.executed = 0
+        self.ticks = 0
+        self.over_budget_ticks = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_wait = 0.0
+    
+    def submit(self, command, reply):
+        """Queue a command from any thread; reply is called with the response"""
+        self.queue.put((command, reply, time.perf_counter()))
+    
+    def start(self):
+        # Timers never fire while a background (-b) script runs; serve_forever() ticks instead
+        if not bpy.app.background and not bpy.app.timers.is_registered(self.tick):
+            bpy.app.timers.register(self.tick, first_interval=0.0, persistent=True)
+    
+    def stop(self):
+        if bpy.app.timers.is_registered(self.tick):
+            bpy.app.timers.unregister(self.tick)
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+    
+    def tick(self):
+        """Timer callback: run queued commands until the budget is spent"""
+        start = time.perf_counter()
+        deadline = start + self.budget_ms / 1000.0
+        ran = False
+        while True:
+            # Alternate between new commands and open streams so neither starves the other
+            worked = False
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                item = None
+            if item is not None:
+                self._run(*item)
+                worked = True
+            try:
+                continuation = self.continuations.get_nowait()
+            except queue.Empty:
+                continuation = None
+            if continuation is not None:
+                self._finish(*continuation)
+                worked = True
+            if self.streams:
+                self._step_stream()
+                worked = True
+            if not worked:
+                break
+            ran = True
+            if time.perf_counter() >= deadline:
+                break
+        
+        if not ran:
+            return self.IDLE_INTERVAL
+        self.ticks += 1
+        if time.perf_counter() - start > self.budget_ms / 1000.0:
+            self.over_budget_ticks += 1
+        # Come back on the next event loop iteration if work is left
+        return 0.0 if self.streams or not self.queue.empty() or not self.continuations.empty() else self.IDLE_INTERVAL
+    
+    def _run(self, command, reply, enqueued_at):
+        wait = time.perf_counter() - enqueued_at
+        self.executed += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.last_wait = wait
+        
+        try:
+            response = self.execute(command)
+        except Exception as e:
+            print(f"Error executing command: {str(e)}")
+            traceback.print_exc()
+            response = {"status": "error", "message": str(e)}
+        
+        result = response.get("result")
+        if isinstance(result, types.GeneratorType):
+            if getattr(reply, "can_stream", False):
+                self.streams.append((result, reply))
+                return
+            response = collect_stream(result)
+        elif isinstance(result, Deferred):
+            self._defer(result, reply)
+            return
+        self._send(reply, response)
+    
+    def _defer(self, deferred, reply):
+        """Start the first phase of a deferred result on the thread pool"""
+        if self.executor is None:
+            self.executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.WORKER_THREADS, thread_name_prefix="BlenderMCP"
+            )
+        self.deferred_in_flight += 1
+        future = self.executor.submit(deferred.run)
+        # Called on the worker thread; the second phase waits for the next tick
+        future.add_done_callback(lambda future: self.continuations.put((deferred, future, reply)))
+    
+    def _finish(self, deferred, future, reply):
+        """Run the main-thread phase of a deferred result and send the response"""
+        self.deferred_in_flight -= 1
+        try:
+            response = {"status": "success", "result": deferred.finish(future.result())}
+        except Exception as e:
+            print(f"Error finishing command: {str(e)}")
+            traceback.print_exc()
+            response = {"status": "error", "message": str(e)}
+        self._send(reply, response)
+    
+    def _step_stream(self):
+        """Produce and send the next chunk of the oldest open stream"""
+        generator, reply = self.streams.popleft()
+        try:
+            records = next(generator)
+        except StopIteration as done:
+            self._send(reply, {"status": "success", "result": done.value or {}})
+            return
+        except Exception as e:
+            print(f"Error streaming result: {str(e)}")
+            traceback.print_exc()
+            self._send(reply, {"status": "error", "message": str(e)})
+            return
+        
+        try:
+            reply.send_chunk(records)
+        except Exception:
+            print("Failed to send stream chunk - client disconnected")
+            generator.close()
+            return
+        self.streams.append((generator, reply))
+    
+    @staticmethod
+    def _send(reply, response):
+        try:
+            reply(response)
+        except Exception:
+            print("Failed to send response - client disconnected")
+    
+    def get_stats(self):
+        """Queue depth and wait times, safe to call from any thread"""
+        return {
+            "queue_depth": self.queue.qsize(),
+            "active_streams": len(self.streams),
+            "deferred_in_flight": self.deferred_in_flight,
+            "executed": self.executed,
+            "ticks": self.ticks,
+            "over_budget_ticks": self.over_budget_ticks,
+            "budget_ms": self.budget_ms,
+            "avg_wait_ms": round(1000.0 * self.total_wait / self.executed, 3) if self.executed else 0.0,
+            "max_wait_ms": round(1000.0 * self.max_wait, 3),
+            "last_wait_ms": round(1000.0 * self.last_wait, 3),
+        }
+
+class SceneChangeFeed:
+    """Monotonic scene revision and a bounded ring buffer of change records.
+    
+    Clients remember the revision they last saw and ask for the changes after it. When the
+    records they need have been dropped from the buffer (or the scene was reloaded or undone)
+    they are told to resync instead.
+    """
+    
+    # Changes that only say "look at this object again"; repeating one adds nothing
+    COLLAPSIBLE = ("transformed", "geometry_changed", "material_changed")
+    
+    def __init__(self, capacity=10000):
+        self.records = collections.deque(maxlen=capacity)
+        self.revision = 0
+        self.floor = 0  # Changes up to and including this revision are no longer available
+        self.reset_reason = None  # Why changes up to the floor were dropped
+    
+    def record(self, change, name, **details):
+        if len(self.records) == self.records.maxlen:
+            self.floor = self.records[0]["revision"]
+            self.reset_reason = "change buffer overrun"
+        self.revision += 1
+        self.records.append({"revision": self.revision, "change": change, "name": name, **details})
+    
+    def reset(self, reason):
+        """Forget all records; every client has to resync"""
+        self.records.clear()
+        self.revision += 1
+        self.floor = self.revision
+        self.reset_reason = reason
+    
+    def since(self, revision):
+        """Changes after revision, in order; back-to-back state changes of the same object
+        (e.g. the transforms of a drag) are collapsed into the latest one"""
+        if revision < self.floor or revision > self.revision:
+            return {
+                "revision": self.revision,
+                "resync_required": True,
+                "reason": self.reset_reason if revision < self.floor else "unknown revision",
+            }
+        start = max(0, len(self.records) - (self.revision - revision))
+        changes = []
+        for record in itertools.islice(self.records, start, None):
+            # Only adjacent records: names can be reused, so merging across other changes
+            # could move a record past the removal or rename it depends on
+            if (changes and record["change"] in self.COLLAPSIBLE and changes[-1]["change"] == record["change"]
+                    and changes[-1]["name"] == record["name"]):
+                changes[-1] = record
+            else:
+                changes.append(record)
+        return {"revision": self.revision, "resync_required": False, "changes": changes}
+
+class SceneIndex:
+    """Name, type and collection lookups over bpy.data.objects, maintained incrementally.
+    
+    Entries are keyed by the object's pointer so a rename does not orphan them. Objects and
+    collections reported by depsgraph_update_post are re-indexed; removals, undo and file
+    loads that the handler cannot see are caught by an object count check and a resync.
+    Each object also gets a serial number, so "objects added since" needs no full diff, and
+    every add, remove, rename, transform, material or geometry change is recorded in a
+    SceneChangeFeed.
+    """
+    
+    def __init__(self):
+        self.changes = SceneChangeFeed()
+        self._entries = {}  # pointer -> (object, name, type, serial)
+        self._names = {}  # name -> pointer
+        self._types = collections.defaultdict(set)  # type -> pointers
+        self._collections = {}  # collection pointer -> (collection, object pointers)
+        self._sorted_names = None  # Built on demand for prefix queries
+        self._next_serial = 0
+        self._stale = True
+        self._reset_reason = "addon started"
+        self.resyncs = 0
+        self.updates = 0
+    
+    @staticmethod
+    def _alive(item):
+        try:
+            item.name
+            return True
+        except ReferenceError:
+            return False
+    
+    def invalidate(self, reason="file loaded, undo or redo"):
+        """Resync on the next query (undo, redo, file load); the change feed starts over"""
+        self._stale = True
+        self._reset_reason = reason
+    
+    def _ensure(self):
+        if self._stale or len(bpy.data.objects) != len(self._entries):
+            self._resync()
+    
+    def _resync(self):
+        """Re-index everything, keeping the serials of objects that were already known"""
+        reset = self._stale
+        if reset:
+            # Objects may have changed in ways no record describes
+            self.changes.reset(self._reset_reason)
+        current = {obj.as_pointer(): obj for obj in bpy.data.objects}
+        for pointer in [pointer for pointer in self._entries if pointer not in current]:
+            self._remove(pointer, record=not reset)
+        for obj in current.values():
+            self._index_object(obj, record=not reset)
+        
+        self._collections = {}
+        for coll in bpy.data.collections:
+            self._index_collection(coll)
+        for scene in bpy.data.scenes:
+            self._index_collection(scene.collection)
+        self._stale = False
+        self.resyncs += 1
+    
+    def _index_object(self, obj, record=True):
+        pointer = obj.as_pointer()
+        entry = self._entries.get(pointer)
+        if entry is not None and not self._alive(entry[0]):
+            # The memory of a removed object was reused for this one
+            self._remove(pointer)
+            entry = None
+        if entry is not None:
+            if entry[1] == obj.name:
+                # Keep the fresh reference; the stored one may be invalidated (e.g. by undo)
+                self._entries[pointer] = (obj,) + entry[1:]
+                return
+            self._names.pop(entry[1], None)
+            serial = entry[3]
+            if record:
+                self.changes.record("renamed", obj.name, old_name=entry[1])
+        else:
+            serial = self._next_serial
+            self._next_serial += 1
+            self._types[obj.type].add(pointer)
+            if record:
+                self.changes.record("added", obj.name, type=obj.type)
+        self._entries[pointer] = (obj, obj.name, obj.type, serial)
+        self._names[obj.name] = pointer
+        self._sorted_names = None
+    
+    def _index_collection(self, coll):
+        self._collections[coll.as_pointer()] = (coll, {obj.as_pointer() for obj in coll.objects})
+    
+    def _remove(self, pointer, record=True):
+        entry = self._entries.pop(pointer, None)
+        if entry is None:
+            return
+        _, name, type, _ = entry
+        if record:
+            self.changes.record("removed", name, type=type)
+        if self._names.get(name) == pointer:
+            del self._names[name]
+        self._types[type].discard(pointer)
+        for _, members in self._collections.values():
+            members.discard(pointer)
+        self._sorted_names = None
+    
+    def on_depsgraph_update(self, depsgraph):
+        """Re-index the objects and collections of one depsgraph update"""
+        if self._stale:
+            return
+        self.updates += 1
+        for update in depsgraph.updates:
+            data = update.id.original
+            if isinstance(data, bpy.types.Object):
+                is_new = data.as_pointer() not in self._entries
+                self._index_object(data)
+                if is_new:
+                    continue
+                if update.is_updated_transform:
+                    self.changes.record("transformed", data.name)
+                if update.is_updated_geometry:
+                    self.changes.record("geometry_changed", data.name)
+                if update.is_updated_shading:
+                    self.changes.record("material_changed", data.name)
+            elif isinstance(data, bpy.types.Material):
+                self.changes.record("material_changed", data.name, datablock="MATERIAL")
+            elif isinstance(data, bpy.types.Collection):
+                self._index_collection(data)
+                for obj in data.objects:
+                    self._index_object(obj)
+            elif isinstance(data, bpy.types.Scene):
+                self._index_collection(data.collection)
+        # Removed objects are not reported; the count check in _ensure() resyncs on the next query
+    
+    def discard(self, obj):
+        """Forget an object that is about to be removed"""
+        self._remove(obj.as_pointer())
+    
+    def get(self, name):
+        """Object by name, or None"""
+        self._ensure()
+        pointer = self._names.get(name)
+        if pointer is not None:
+            obj = self._entries[pointer][0]
+            if self._alive(obj) and obj.name == name:
+                return obj
+        # Renamed without a depsgraph update: look it up and fix the entry
+        obj = bpy.data.objects.get(name)
+        if obj is not None:
+            self._index_object(obj)
+        return obj
+    
+    def objects(self, types=None, collection=None):
+        """Objects of the given types (all if None), optionally only those directly in a collection"""
+        self._ensure()
+        if types:
+            pointers = set().union(*(self._types.get(type.upper(), ()) for type in types))
+        else:
+            pointers = set(self._entries)
+        if collection is not None:
+            entry = self._collections.get(collection.as_pointer())
+            if entry is None:
+                self._index_collection(collection)
+                entry = self._collections[collection.as_pointer()]
+            pointers &= entry[1]
+        return [obj for obj in (self._entries[pointer][0] for pointer in pointers) if self._alive(obj)]
+    
+    def collections_of(self, obj):
+        """Collections (including scene master collections) that directly contain an object"""
+        self._ensure()
+        pointer = obj.as_pointer()
+        return [coll for coll, members in self._collections.values() if pointer in members and self._alive(coll)]
+    
+    def with_prefix(self, prefix):
+        """Objects whose name starts with prefix"""
+        self._ensure()
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self._names)
+        start = bisect.bisect_left(self._sorted_names, prefix)
+        result = []
+        for name in self._sorted_names[start:]:
+            if not name.startswith(prefix):
+                break
+            obj = self.get(name)
+            if obj is not None:
+                result.append(obj)
+        return result
+    
+    def mark(self):
+        """Token for added_since(), taken before an operation that creates objects"""
+        self._ensure()
+        return self._next_serial
+    
+    def added_since(self, mark):
+        """Objects indexed after mark() was taken"""
+        self._ensure()
+        return [entry[0] for entry in self._entries.values() if entry[3] >= mark and self._alive(entry[0])]
+    
+    def flush(self):
+        """Evaluate pending edits so depsgraph_update_post records them. Edits made through
+        bpy.data (e.g. setting a location) are otherwise only reported on the next redraw,
+        and never in background mode."""
+        bpy.context.view_layer.update()
+        self._ensure()
+    
+    def revision(self):
+        """Current scene revision, after catching up on unreported changes"""
+        self.flush()
+        return self.changes.revision
+    
+    def changes_since(self, revision):
+        """Change records after revision, or a resync marker"""
+        self.flush()
+        return self.changes.since(revision)
+    
+    def get_stats(self):
+        return {
+            "revision": self.changes.revision,
+            "buffered_changes": len(self.changes.records),
+            "objects": len(self._entries),
+            # Called from client threads: copy the keys before reading
+            "types": {type: len(self._types[type]) for type in list(self._types) if self._types[type]},
+            "collections": len(self._collections),
+            "depsgraph_updates": self.updates,
+            "resyncs": self.resyncs,
+        }
+
+scene_index = SceneIndex()
+
+@bpy.app.handlers.persistent
+def _scene_index_depsgraph_update(scene, depsgraph):
+    scene_index.on_depsgraph_update(depsgraph)
+
+@bpy.app.handlers.persistent
+def _scene_index_invalidate(*args):
+    scene_index.invalidate()
+
+SCENE_INDEX_HANDLERS = (
+    ("depsgraph_update_post", _scene_index_depsgraph_update),
+    ("load_post", _scene_index_invalidate),
+    ("undo_post", _scene_index_invalidate),
+    ("redo_post", _scene_index_invalidate),
+)
+
+# Gathering from the whole bpy.data.objects collection with one foreach_get beats reading
+# objects one by one once the request covers more than this share of the file
+BULK_GATHER_RATIO = 0.25
+
+def _gather_boxes(objects, from_data=True):
+    """Local bound_box corners (N, 8, 3) and transposed world matrices (N, 4, 4) of objects
+    
+    Uses foreach_get when objects is an RNA collection or (with from_data, for original
+    objects only) a large share of bpy.data.objects. Matrices come out column-major (the
+    transpose of matrix_world) either way.
+    """
+    count = len(objects)
+    corners = np.empty((count, 8, 3), dtype=np.float32)
+    matrices = np.empty((count, 4, 4), dtype=np.float32)
+    if count == 0:
+        return corners, matrices
+    
+    if hasattr(objects, "foreach_get"):
+        objects.foreach_get("bound_box", corners.ravel())
+        objects.foreach_get("matrix_world", matrices.ravel())
+        return corners, matrices
+    
+    all_objects = bpy.data.objects
+    if from_data and count > BULK_GATHER_RATIO * len(all_objects):
+        total = len(all_objects)
+        all_corners = np.empty((total, 8, 3), dtype=np.float32)
+        all_matrices = np.empty((total, 4, 4), dtype=np.float32)
+        all_objects.foreach_get("bound_box", all_corners.ravel())
+        all_objects.foreach_get("matrix_world", all_matrices.ravel())
+        position = {obj.as_pointer(): i for i, obj in enumerate(all_objects)}
+        rows = np.fromiter((position[obj.as_pointer()] for obj in objects), dtype=np.int64, count=count)
+        return all_corners[rows], all_matrices[rows]
+    
+    for i, obj in enumerate(objects):
+        corners[i] = obj.bound_box
+        matrices[i] = np.array(obj.matrix_world, dtype=np.float32).T
+    return corners, matrices
+
+def world_aabbs(objects, mode="box"):
+    """World-space axis-aligned bounding boxes of many objects as (mins, maxs), each (N, 3)
+    
+    mode:
+    - "box": transform each object's bound_box (fast, one batched matmul)
+    - "evaluated": the same, from the evaluated object so modifiers are included
+    - "tight": min/max of the evaluated mesh vertices in world space, which stays exact
+      when the object is rotated; non-mesh objects fall back to "evaluated"
+    """
+    if mode not in ("box", "evaluated", "tight"):
+        raise ValueError(f"Unknown bounds mode: {mode}")
+    
+    if mode != "box":
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        objects = [obj.evaluated_get(depsgraph) for obj in objects]
+    corners, matrices = _gather_boxes(objects, from_data=mode == "box")
+    
+    # Homogeneous corners times the transposed matrices: (N, 8, 4) @ (N, 4, 4)
+    homogeneous = np.concatenate([corners, np.ones(corners.shape[:2] + (1,), dtype=np.float32)], axis=2)
+    world = np.matmul(homogeneous, matrices)[:, :, :3]
+    # float64 so that rounding for JSON does not expose float32 noise
+    mins = world.min(axis=1).astype(np.float64)
+    maxs = world.max(axis=1).astype(np.float64)
+    
+    if mode == "tight":
+        for i, obj in enumerate(objects):
+            if obj.type != 'MESH':
+                continue
+            mesh = obj.to_mesh()
+            try:
+                count = len(mesh.vertices)
+                if count == 0:
+                    continue
+                coords = np.empty(count * 3, dtype=np.float32)
+                mesh.vertices.foreach_get("co", coords)
+                coords = coords.reshape(count, 3) @ matrices[i, :3, :3] + matrices[i, 3, :3]
+                mins[i] = coords.min(axis=0)
+                maxs[i] = coords.max(axis=0)
+            finally:
+                obj.to_mesh_clear()
+    return mins, maxs
+
+class SpatialIndex:
+    """Uniform grid over the world AABBs of the scene's objects.
+    
+    Built with world_aabbs() in one pass and brought up to date from the scene change feed
+    before every query, so only added, moved or removed objects are recomputed. Box and
+    overlap queries visit the grid cells they touch; objects spanning more than MAX_CELLS
+    cells are kept aside and always checked. Candidates are refined with NumPy.
+    """
+    MAX_CELLS = 64  # Larger objects go in the "large" list instead of the grid
+    MAX_QUERY_CELLS = 4096  # Bigger query boxes scan all rows (vectorized) instead
+    REBUILD_RATIO = 0.25  # Rebuild instead of updating when this share of rows changed
+    CELL_BITS = 21  # Cell coordinates are clamped to 21 bits per axis and packed into one int
+    
+    def __init__(self):
+        self.revision = None  # Change feed revision the index reflects, None before building
+        self.scene_pointer = None
+        self.cell_size = 1.0
+        self.rebuilds = 0
+        self.updated_objects = 0
+        self._reset(0)
+    
+    def _reset(self, capacity):
+        self._mins = np.zeros((capacity, 3))
+        self._maxs = np.zeros((capacity, 3))
+        self._types = np.full(capacity, "", dtype=object)
+        self._names = [None] * capacity  # row -> name, None for free rows
+        self._rows = {}  # name -> row
+        self._free = list(range(capacity - 1, -1, -1))
+        self._cells = {}  # packed cell key -> rows
+        self._large = set()
+        self._live = None  # Cached array of used rows
+    
+    def _cell_keys(self, mins, maxs, max_cells=None):
+        """Expand boxes (n, 3) into the packed keys of the cells they cover
+        
+        Boxes covering more than max_cells (default MAX_CELLS) cells are skipped.
+        
+        Returns (box index per key, keys, cell count per box). Coordinates are clamped, which
+        only merges far-away cells; exact boxes are always checked afterwards.
+        """
+        limit = (1 << (self.CELL_BITS - 1)) - 1
+        lo = np.clip(np.floor(mins / self.cell_size), -limit, limit).astype(np.int64)
+        hi = np.clip(np.floor(maxs / self.cell_size), -limit, limit).astype(np.int64)
+        dims = hi - lo + 1
+        counts = dims.prod(axis=1)
+        small = np.flatnonzero(counts <= (max_cells or self.MAX_CELLS))
+        owners = np.repeat(small, counts[small])
+        # Position of each key within its box, unravelled into per-axis offsets
+        starts = np.cumsum(counts[small]) - counts[small]
+        offset = np.arange(len(owners)) - np.repeat(starts, counts[small])
+        ny, nz = dims[owners, 1], dims[owners, 2]
+        cells = lo[owners] + np.stack([offset // (ny * nz), (offset // nz) % ny, offset % nz], axis=1)
+        cells += limit + 1
+        keys = (cells[:, 0] << (2 * self.CELL_BITS)) | (cells[:, 1] << self.CELL_BITS) | cells[:, 2]
+        return owners, keys, counts
+    
+    def _insert(self, rows):
+        rows = np.asarray(rows, dtype=np.int64)
+        owners, keys, counts = self._cell_keys(self._mins[rows], self._maxs[rows])
+        self._large.update(rows[counts > self.MAX_CELLS].tolist())
+        for key, row in zip(keys.tolist(), rows[owners].tolist()):
+            members = self._cells.get(key)
+            if members is None:
+                self._cells[key] = {row}
+            else:
+                members.add(row)
+    
+    def _unlink(self, row):
+        """Remove a row from the grid; call before its bounds change"""
+        if row in self._large:
+            self._large.discard(row)
+            return
+        _, keys, _ = self._cell_keys(self._mins[row:row + 1], self._maxs[row:row + 1])
+        for key in keys.tolist():
+            members = self._cells.get(key)
+            if members is not None:
+                members.discard(row)
+                if not members:
+                    del self._cells[key]
+    
+    def _allocate(self, name):
+        if not self._free:
+            capacity = len(self._names)
+            grow = max(capacity, 64)
+            self._mins = np.concatenate([self._mins, np.zeros((grow, 3))])
+            self._maxs = np.concatenate([self._maxs, np.zeros((grow, 3))])
+            self._types = np.concatenate([self._types, np.full(grow, "", dtype=object)])
+            self._names.extend([None] * grow)
+            self._free = list(range(capacity + grow - 1, capacity - 1, -1))
+        row = self._free.pop()
+        self._names[row] = name
+        self._rows[name] = row
+        self._live = None
+        return row
+    
+    def _release(self, name):
+        row = self._rows.pop(name, None)
+        if row is None:
+            return
+        self._unlink(row)
+        self._names[row] = None
+        self._types[row] = ""
+        self._free.append(row)
+        self._live = None
+    
+    def rebuild(self):
+        scene = bpy.context.scene
+        self.revision = scene_index.revision()
+        self.scene_pointer = scene.as_pointer()
+        objects = scene.objects
+        mins, maxs = world_aabbs(objects)
+        count = len(mins)
+        self._reset(count)
+        self._free = []
+        self._mins[:] = mins
+        self._maxs[:] = maxs
+        for row, obj in enumerate(objects):
+            self._names[row] = obj.name
+            self._types[row] = obj.type
+            self._rows[obj.name] = row
+        
+        # Cells about twice the typical object size keep most objects in 1-8 cells
+        extents = (maxs - mins).max(axis=1) if count else np.ones(1)
+        self.cell_size = max(float(np.median(extents)) * 2.0, 1e-3)
+        self._insert(np.arange(count))
+        self.rebuilds += 1
+    
+    def sync(self):
+        """Apply the scene changes since the last query, or rebuild"""
+        # Evaluate pending edits first, so both paths read current world matrices
+        scene_index.flush()
+        scene = bpy.context.scene
+        if self.revision is None or scene.as_pointer() != self.scene_pointer:
+            self.rebuild()
+            return
+        feed = scene_index.changes_since(self.revision)
+        changes = [] if feed["resync_required"] else feed["changes"]
+        if feed["resync_required"] or len(changes) > self.REBUILD_RATIO * max(len(self._rows), 64):
+            self.rebuild()
+            return
+        
+        dirty = []
+        for record in changes:
+            change, name = record["change"], record["name"]
+            if change == "removed":
+                self._release(name)
+            elif change == "renamed":
+                row = self._rows.pop(record["old_name"], None)
+                if row is not None:
+                    self._rows[name] = row
+                    self._names[row] = name
+            elif change in ("added", "transformed", "geometry_changed"):
+                dirty.append(name)
+        
+        objects = []
+        for name in dict.fromkeys(dirty):
+            obj = scene_index.get(name)
+            if obj is None:
+                self._release(name)
+            elif name in self._rows or scene in obj.users_scene:
+                objects.append(obj)
+        if objects:
+            mins, maxs = world_aabbs(objects)
+            for obj, lo, hi in zip(objects, mins, maxs):
+                row = self._rows.get(obj.name)
+                if row is None:
+                    row = self._allocate(obj.name)
+                else:
+                    self._unlink(row)
+                self._mins[row] = lo
+                self._maxs[row] = hi
+                self._types[row] = obj.type
+                self._insert([row])
+            self.updated_objects += len(objects)
+        self.revision = feed["revision"]
+    
+    def _live_rows(self):
+        if self._live is None:
+            self._live = np.fromiter((row for row, name in enumerate(self._names) if name is not None), dtype=np.int64)
+        return self._live
+    
+    def _filter_types(self, rows, types):
+        if not types or len(rows) == 0:
+            return rows
+        wanted = {type.upper() for type in types}
+        return rows[np.fromiter((type in wanted for type in self._types[rows]), dtype=bool, count=len(rows))]
+    
+    def _result(self, rows):
+        return sorted(self._names[row] for row in rows.tolist())
+    
+    def in_box(self, box_min, box_max, contain=False, types=None):
+        """Names of objects intersecting (or, with contain, entirely inside) a world box"""
+        self.sync()
+        # Corners given the other way round on some axis describe the same box
+        corners = np.asarray(box_min, dtype=np.float64), np.asarray(box_max, dtype=np.float64)
+        box_min, box_max = np.minimum(*corners), np.maximum(*corners)
+        cell_count = np.prod(np.floor(box_max / self.cell_size) - np.floor(box_min / self.cell_size) + 1)
+        if cell_count <= self.MAX_QUERY_CELLS:
+            candidates = set(self._large)
+            _, keys, _ = self._cell_keys(box_min[None, :], box_max[None, :], max_cells=self.MAX_QUERY_CELLS)
+            for key in keys.tolist():
+                candidates.update(self._cells.get(key, ()))
+            rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        else:
+            rows = self._live_rows()
+        
+        rows = self._filter_types(rows, types)
+        mins, maxs = self._mins[rows], self._maxs[rows]
+        if contain:
+            mask = np.all(mins >= box_min, axis=1) & np.all(maxs <= box_max, axis=1)
+        else:
+            mask = np.all(maxs >= box_min, axis=1) & np.all(mins <= box_max, axis=1)
+        return self._result(rows[mask])
+    
+    def nearest(self, point, k=5, types=None, max_distance=None):
+        """The k objects whose boxes are closest to a point (distance 0 when inside)"""
+        self.sync()
+        point = np.asarray(point, dtype=np.float64)
+        rows = self._filter_types(self._live_rows(), types)
+        if len(rows) == 0:
+            return []
+        gap = np.maximum(np.maximum(self._mins[rows] - point, point - self._maxs[rows]), 0.0)
+        distances = np.sqrt((gap * gap).sum(axis=1))
+        if max_distance is not None:
+            keep = distances <= max_distance
+            rows, distances = rows[keep], distances[keep]
+        k = min(k, len(rows))
+        if k <= 0:
+            return []
+        order = np.argpartition(distances, k - 1)[:k]
+        order = order[np.argsort(distances[order], kind="stable")]
+        return [{"name": self._names[row], "distance": round(float(distance), 4)}
+                for row, distance in zip(rows[order].tolist(), distances[order].tolist())]
+    
+    def overlapping_pairs(self, types=None, names=None, margin=0.0, limit=1000):
+        """Pairs of objects whose boxes overlap by more than margin on every axis"""
+        self.sync()
+        rows = self._filter_types(self._live_rows(), types)
+        large = np.array(sorted(self._large.intersection(rows.tolist())), dtype=np.int64)
+        
+        # Candidate pairs: rows sharing a grid cell, found by sorting the cell keys and pairing
+        # each entry with the following ones of the same key; plus every large object with all
+        owners, keys, _ = self._cell_keys(self._mins[rows], self._maxs[rows])
+        order = np.argsort(keys, kind="stable")
+        keys, members = keys[order], rows[owners[order]]
+        first, second = [], []
+        distance = 1
+        while distance < len(keys):
+            same = np.flatnonzero(keys[distance:] == keys[:-distance])
+            if len(same) == 0:
+                break
+            first.append(members[same])
+            second.append(members[same + distance])
+            distance += 1
+        for row in large.tolist():
+            # Only keep the actual hits; pairing a large object with every row would be huge
+            hit = np.all((self._mins[row] < self._maxs[rows] - margin) & (self._mins[rows] < self._maxs[row] - margin), axis=1)
+            others = rows[hit]
+            first.append(np.full(len(others), row))
+            second.append(others)
+        if not first:
+            return {"pairs": [], "count": 0, "truncated": False}
+        a = np.concatenate(first)
+        b = np.concatenate(second)
+        a, b = np.minimum(a, b), np.maximum(a, b)
+        pair_keys = np.unique(a[a != b] * len(self._names) + b[a != b])
+        a, b = pair_keys // len(self._names), pair_keys % len(self._names)
+        
+        hit = np.all((self._mins[a] < self._maxs[b] - margin) & (self._mins[b] < self._maxs[a] - margin), axis=1)
+        a, b = a[hit], b[hit]
+        if names:
+            focus = np.array([self._rows[name] for name in names if name in self._rows], dtype=np.int64)
+            keep = np.isin(a, focus) | np.isin(b, focus)
+            a, b = a[keep], b[keep]
+        
+        pairs = sorted(sorted((self._names[x], self._names[y])) for x, y in zip(a.tolist(), b.tolist()))
+        return {"pairs": pairs[:limit], "count": len(pairs), "truncated": len(pairs) > limit}
+    
+    def get_stats(self):
+        return {
+            "objects": len(self._rows),
+            "cell_size": round(self.cell_size, 4),
+            "cells": len(self._cells),
+            "large_objects": len(self._large),
+            "revision": self.revision,
+            "rebuilds": self.rebuilds,
+            "updated_objects": self.updated_objects,
+        }
+
+spatial_index = SpatialIndex()
+
+# Connection pool settings per host. Other hosts (the CDN serving GLB files) use "default".
+# timeout is (connect, read) seconds and applies when a call does not pass its own.
+HTTP_HOST_SETTINGS = {
+    "api.csm.ai": {"pool_maxsize": 4, "timeout": (10, 60)},
+    "animation.csm.ai": {"pool_maxsize": 2, "timeout": (10, 300)},
+    "default": {"pool_maxsize": 8, "timeout": (10, 120)},
+}
+
+class HttpClient:
+    """Keep-alive HTTP sessions, one connection pool per host.
+    
+    Calls to the same host reuse open TCP/TLS connections instead of paying a new handshake
+    for every request. requests only speaks HTTP/1.1, so there is no HTTP/2 multiplexing;
+    concurrent calls to one host use up to pool_maxsize parallel connections.
+    """
+    
+    def __init__(self, host_settings=None):
+        self.host_settings = host_settings or HTTP_HOST_SETTINGS
+        self._sessions = {}
+        self._requests = collections.Counter()
+        self._lock = threading.Lock()
+    
+    def _session(self, host):
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                settings = self.host_settings.get(host, self.host_settings["default"])
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=settings["pool_maxsize"])
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+            self._requests[host] += 1
+            return session
+    
+    def request(self, method, url, **kwargs):
+        host = urllib.parse.urlsplit(url).hostname or ""
+        settings = self.host_settings.get(host, self.host_settings["default"])
+        kwargs.setdefault("timeout", settings["timeout"])
+        return self._session(host).request(method, url, **kwargs)
+    
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+    
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+    
+    def get_stats(self):
+        """Requests and newly opened connections per host; the difference was served by reused connections"""
+        stats = {}
+        with self._lock:
+            for host, session in self._sessions.items():
+                opened = 0
+                for adapter in {id(a): a for a in session.adapters.values()}.values():
+                    pools = adapter.poolmanager.pools
+                    for key in pools.keys():
+                        pool = pools.get(key)
+                        if pool is not None:
+                            opened += pool.num_connections
+                stats[host] = {
+                    "requests": self._requests[host],
+                    "connections_opened": opened,
+                    "connections_reused": max(self._requests[host] - opened, 0),
+                }
+        return stats
+    
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+http_client = HttpClient()
+
+def fetch_csm_tier(api_key):
+    """Ask CSM.ai for the user's tier, or return None if the lookup failed"""
+    url = "https://api.csm.ai/user/userdata"
+    
+    # Set up the headers with the x-api-key
+    headers = {
+        'Accept': '*/*',
+        'Content-Type': 'application/json',
+        'x-platform': 'web',
+        'x-api-key': api_key
+    }
+    
+    print(f"Checking user tier with API key: {api_key[:5]}...")
+    
+    try:
+        response = http_client.get(url, headers=headers)
+        print(f"Response status code: {response.status_code}")
+        
+        if response.status_code == 200:
+            response_json = response.json()
+            print("User data retrieved successfully")
+            
+            # Extract data from the nested structure
+            if "data" in response_json:
+                tier = response_json["data"].get("tier", "free")
+                print(f"User tier: {tier}")
+                return tier
+            else:
+                print("Error: 'data' field not found in response")
+                return None
+        else:
+            print(f"Error: {response.status_code}")
+            print(f"Response: {response.text}")
+            return None
+        
+    except Exception as e:
+        print(f"Exception during API request: {e}")
+        return None
+
+class TierCache:
+    """CSM.ai user tiers per API key, so searches do not look the tier up every time.
+    
+    Entries younger than refresh_after are served as is. Older ones are still served, and
+    refreshed on a background thread so that Blender's main thread does not wait for the
+    network; only entries past ttl (or missing) are fetched in the foreground. Failed lookups
+    are not cached.
+    """
+    
+    def __init__(self, fetch, ttl=3600.0, refresh_after=600.0):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.refresh_after = refresh_after
+        self._entries = {}  # api_key -> (tier, fetched_at)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.background_refreshes = 0
+    
+    def get(self, api_key, refresh=False):
+        """The tier for api_key, or None if it is unknown and CSM.ai could not be reached"""
+        with self._lock:
+            entry = self._entries.get(api_key)
+        if entry is not None and not refresh:
+            tier, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < self.ttl:
+                self.hits += 1
+                if age > self.refresh_after:
+                    self._refresh_in_background(api_key)
+                return tier
+        
+        self.misses += 1
+        return self._update(api_key)
+    
+    def _update(self, api_key):
+        tier = self.fetch(api_key)
+        if tier is not None:
+            with self._lock:
+                self._entries[api_key] = (tier, time.monotonic())
+        return tier
+    
+    def _refresh_in_background(self, api_key):
+        with self._lock:
+            if api_key in self._refreshing:
+                return
+            self._refreshing.add(api_key)
+        self.background_refreshes += 1
+        
+        def refresh():
+            try:
+                self._update(api_key)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(api_key)
+        
+        threading.Thread(target=refresh, daemon=True).start()
+    
+    def invalidate(self, api_key=None):
+        """Forget the tier of one API key, or of all of them"""
+        with self._lock:
+            if api_key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(api_key, None)
+    
+    def get_stats(self):
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "background_refreshes": self.background_refreshes,
+        }
+
+tier_cache = TierCache(fetch_csm_tier)
+
+def _default_cache_dir():
+    """Per-user cache directory shared by all Blender sessions (BLENDER_MCP_CACHE_DIR overrides it)"""
+    if os.environ.get("BLENDER_MCP_CACHE_DIR"):
+        return os.environ["BLENDER_MCP_CACHE_DIR"]
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or tempfile.gettempdir()
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "blender-mcp")
+
+CACHE_DIR = _default_cache_dir()
+
+class SearchCache:
+    """CSM.ai search results: an in-memory LRU in front of an optional JSON store on disk.
+    
+    Results younger than ttl are served as is. Until stale_ttl they are still served, marked
+    "stale", while a background thread fetches them again (stale-while-revalidate); older
+    results are fetched in the foreground. Only successful searches are stored.
+    """
+    
+    def __init__(self, directory, max_entries=256, max_disk_entries=4096, ttl=3600.0, stale_ttl=86400.0):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries = collections.OrderedDict()  # key -> (result, stored_at), least recent first
+        self._revalidating = set()
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.revalidations = 0
+    
+    @staticmethod
+    def make_key(search_text, limit, tier, use_private_assets, api_key):
+        # Private results depend on the account, so the key includes a digest of the API key
+        query = " ".join(search_text.lower().split())
+        account = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        return json.dumps([query, limit, tier, bool(use_private_assets), account])
+    
+    def get(self, key, fetch, bypass=False, persist=True):
+        """Return (result, "hit" | "stale" | "miss" | "bypass"), calling fetch() on a miss"""
+        if bypass:
+            self.bypasses += 1
+        else:
+            entry = self._lookup(key, persist)
+            if entry is not None:
+                result, stored_at = entry
+                age = time.time() - stored_at
+                if age < self.ttl:
+                    self.hits += 1
+                    return result, "hit"
+                if age < self.stale_ttl:
+                    self.stale_hits += 1
+                    self._revalidate(key, fetch, persist)
+                    return result, "stale"
+            self.misses += 1
+        
+        result = fetch()
+        if result.get("status") == "success":
+            self._store(key, result, persist)
+        return result, "bypass" if bypass else "miss"
+    
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+    
+    def _lookup(self, key, persist):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        if not persist:
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                record = json.load(f)
+            # The file name is a digest; make sure it is really this key
+            if record.get("key") != key:
+                return None
+            entry = (record["result"], record["stored_at"])
+        except (OSError, ValueError, KeyError):
+            return None
+        self.disk_hits += 1
+        self._remember(key, entry)
+        return entry
+    
+    def _remember(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def _store(self, key, result, persist):
+        entry = (result, time.time())
+        self._remember(key, entry)
+        if not persist:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            # Write to a temporary file and rename it, so readers never see a partial file
+            handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(handle, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "stored_at": entry[1], "result": result}, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Could not write search cache entry: {str(e)}")
+            return
+        self._disk_writes += 1
+        if self._disk_writes % 64 == 0:
+            self._prune_disk()
+    
+    def _prune_disk(self):
+        """Delete expired entries, then the oldest ones beyond max_disk_entries"""
+        try:
+            files = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".json")]
+        except OSError:
+            return
+        dated = []
+        for entry in files:
+            try:
+                dated.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                # Deleted meanwhile, e.g. by another Blender sharing the cache directory
+                continue
+        dated.sort(reverse=True)
+        now = time.time()
+        for index, (mtime, path) in enumerate(dated):
+            if index >= self.max_disk_entries or now - mtime > self.stale_ttl:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+    
+    def _revalidate(self, key, fetch, persist):
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+        self.revalidations += 1
+        
+        def revalidate():
+            try:
+                result = fetch()
+                if result.get("status") == "success":
+                    self._store(key, result, persist)
+            except Exception as e:
+                print(f"Error refreshing cached search: {str(e)}")
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+        
+        threading.Thread(target=revalidate, daemon=True).start()
+    
+    def clear(self):
+        """Forget the results held in memory. The files stay: they are shared with other
+        Blender processes, and keyed by account, so another key never reads them."""
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self):
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "revalidations": self.revalidations,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else None,
+        }
+
+search_cache = SearchCache(os.path.join(CACHE_DIR, "search"))
+
+def _csm_api_key_update(self, context):
+    # A new key may belong to another account: drop its tier and the previous key's results in memory
+    tier_cache.invalidate()
+    search_cache.clear()
+
+class AssetCache:
+    """Downloaded CSM.ai GLB files, shared by every Blender process of the user.
+    
+    Files are stored as <model id>-<sha256>.glb and verified against their digest before they
+    are first used by this process. The model id part is the id made safe for file names plus a
+    digest of the raw id, so ids that differ only in unsafe characters never share a file. Downloads are written to a temporary file and renamed into
+    place, so readers never see a partial file, and a per-model lock (a thread lock plus a file
+    lock: flock, or msvcrt.locking on Windows) keeps two downloads of the same model from
+    running at once, also across processes. The
+    directory is kept under max_bytes by evicting the least recently used files; a file used
+    in the last min_age seconds is never evicted, as another process may be importing it.
+    """
+    
+    LOCK_STRIPES = 64
+    
+    def __init__(self, directory, max_bytes, min_age=300.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.min_age = min_age
+        self._thread_locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        self._verified = set()  # Paths whose digest was checked by this process
+        self.hits = 0
+        self.misses = 0
+        self.corrupt = 0
+        self.evictions = 0
+        self.bytes_downloaded = 0
+    
+    @staticmethod
+    def _safe_id(model_id):
+        readable = re.sub(r"[^A-Za-z0-9_.]", "_", str(model_id))[:64]
+        return f"{readable}.{hashlib.sha256(str(model_id).encode('utf-8')).hexdigest()[:16]}"
+    
+    @contextlib.contextmanager
+    def _model_lock(self, model_id):
+        stripe = int(hashlib.sha256(str(model_id).encode("utf-8")).hexdigest(), 16) % self.LOCK_STRIPES
+        with self._thread_locks[stripe]:
+            lock_dir = os.path.join(self.directory, "locks")
+            os.makedirs(lock_dir, exist_ok=True)
+            with open(os.path.join(lock_dir, f"{stripe}.lock"), "a") as lock_file:
+                self._lock_file(lock_file)
+                try:
+                    yield
+                finally:
+                    self._unlock_file(lock_file)
+    
+    @staticmethod
+    def _lock_file(lock_file):
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            return
+        # msvcrt locks bytes from the current position and gives up after about 10 seconds
+        lock_file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+    
+    @staticmethod
+    def _unlock_file(lock_file):
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+    
+    @staticmethod
+    def _stat_entries(entries):
+        """(entry, stat) pairs, skipping files deleted meanwhile (e.g. by another process)"""
+        stats = []
+        for entry in entries:
+            try:
+                stats.append((entry, entry.stat()))
+            except OSError:
+                continue
+        return stats
+    
+    @staticmethod
+    def _digest(path):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    @staticmethod
+    def _check_glb(path):
+        """The GLB header declares the file's total length; a truncated file does not match it"""
+        with open(path, "rb") as f:
+            header = f.read(12)
+        if len(header) < 12 or header[:4] != b"glTF":
+            raise ValueError("Downloaded file is not a GLB")
+        if struct.unpack("<I", header[8:12])[0] != os.path.getsize(path):
+            raise ValueError("Downloaded GLB is incomplete")
+    
+    def lookup(self, model_id):
+        """Path of a valid cached copy of the model, or None"""
+        prefix = self._safe_id(model_id) + "-"
+        try:
+            candidates = [entry for entry in os.scandir(self.directory)
+                          if entry.name.startswith(prefix) and entry.name.endswith(".glb")]
+        except OSError:
+            return None
+        candidates = self._stat_entries(candidates)
+        for entry, _ in sorted(candidates, key=lambda item: item[1].st_mtime, reverse=True):
+            expected = entry.name[len(prefix):-len(".glb")]
+            if entry.path not in self._verified:
+                try:
+                    valid = self._digest(entry.path) == expected
+                except OSError:
+                    continue
+                if not valid:
+                    self.corrupt += 1
+                    print(f"Removing corrupt cached asset: {entry.name}")
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        pass
+                    continue
+                self._verified.add(entry.path)
+            # The modification time doubles as the last use for LRU eviction
+            try:
+                os.utime(entry.path)
+            except OSError:
+                continue
+            return entry.path
+        return None
+    
+    def fetch(self, model_id, url):
+        """Return (path, from_cache) for the model's GLB, downloading it if needed"""
+        os.makedirs(self.directory, exist_ok=True)
+        with self._model_lock(model_id):
+            path = self.lookup(model_id)
+            if path is not None:
+                self.hits += 1
+                return path, True
+            self.misses += 1
+            path = self._download(model_id, url)
+        self._evict(keep=path)
+        return path, False
+    
+    def _download(self, model_id, url):
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        try:
+            digest = hashlib.sha256()
+            size = 0
+            with os.fdopen(handle, "wb") as f:
+                response = http_client.get(url, stream=True)
+                response.raise_for_status()  # Raise an exception for HTTP errors
+                for chunk in response.iter_content(chunk_size=1 << 16):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+            self._check_glb(temp_path)
+            path = os.path.join(self.directory, f"{self._safe_id(model_id)}-{digest.hexdigest()}.glb")
+            os.replace(temp_path, path)
+        except Exception:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        self._verified.add(path)
+        self.bytes_downloaded += size
+        return path
+    
+    def _evict(self, keep=None):
+        """Delete the least recently used files until the cache fits in max_bytes"""
+        try:
+            files = [entry for entry in os.scandir(self.directory) if entry.name.endswith((".glb", ".part"))]
+        except OSError:
+            return
+        stats = {entry.path: stat for entry, stat in self._stat_entries(files)}
+        now = time.time()
+        for path, stat in list(stats.items()):
+            # Partial downloads of a process that died
+            if path.endswith(".part") and now - stat.st_mtime > 3600:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+                del stats[path]
+        total = sum(stat.st_size for stat in stats.values())
+        for path, stat in sorted(stats.items(), key=lambda item: item[1].st_mtime):
+            if total <= self.max_bytes:
+                break
+            # Files in use and downloads in progress are recent
+            if path == keep or now - stat.st_mtime < self.min_age:
+                continue
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            self._verified.discard(path)
+            total -= stat.st_size
+            self.evictions += 1
+    
+    def get_stats(self):
+        try:
+            files = self._stat_entries(entry for entry in os.scandir(self.directory) if entry.name.endswith(".glb"))
+        except OSError:
+            files = []
+        size = sum(stat.st_size for _, stat in files)
+        return {
+            "directory": self.directory,
+            "files": len(files),
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "corrupt": self.corrupt,
+            "evictions": self.evictions,
+            "bytes_downloaded": self.bytes_downloaded,
+        }
+
+asset_cache = AssetCache(
+    os.path.join(CACHE_DIR, "assets"),
+    max_bytes=int(float(os.environ.get("BLENDER_MCP_ASSET_CACHE_MB", "2048")) * (1 << 20))
+)
+
+def parse_endpoint(endpoint):
+    """(host, port, unix_path) for an endpoint of the form tcp://host:port or unix:///path"""
+    scheme, separator, rest = endpoint.partition("://")
+    if scheme == "unix" and separator and rest:
+        return "localhost", 0, rest
+    if scheme == "tcp" and separator:
+        host, _, port = rest.rpartition(":")
+        if host and port.isdigit():
+            return host.strip("[]"), int(port), None
+    raise ValueError(f"Invalid endpoint {endpoint!r}, expected tcp://host:port or unix:///path")
+
 class BlenderMCPServer:
-    def __init__(self, host='localhost', port=9876):
+    def __init__(self, host='localhost', port=9876, tick_budget_ms=8.0, unix_path=None):
         self.host = host
         self.port = port
+        # When set, listen on this Unix domain socket instead of host:port
+        self.unix_path = unix_path
         self.running = False
         self.socket = None
         self.server_thread = None
+        self.dispatcher = CommandDispatcher(self.execute_command, budget_ms=tick_budget_ms)
+        # Shared primitive meshes, keyed by (type, *sorted generation parameters)
+        self._mesh_cache = {}
     
     def start(self):
         if self.running:
@@ -41,9 +1815,12 @@ class BlenderMCPServer:
         
         try:
             # Create socket
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.socket.bind((self.host, self.port))
+            if self.unix_path:
+                self.socket = self._bind_unix_socket(self.unix_path)
+            else:
+                self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                self.socket.bind((self.host, self.port))
             self.socket.listen(1)
             
             # Start server thread
@@ -51,13 +1828,17 @@ class BlenderMCPServer:
             self.server_thread.daemon = True
             self.server_thread.start()
             
-            print(f"BlenderMCP server started on {self.host}:{self.port}")
+            # Start draining commands on the main thread
+            self.dispatcher.start()
+            
+            print(f"BlenderMCP server started on {self.endpoint}")
         except Exception as e:
             print(f"Failed to start server: {str(e)}")
             self.stop()
             
     def stop(self):
         self.running = False
+        self.dispatcher.stop()
         
         # Close socket
         if self.socket:
@@ -66,6 +1847,11 @@ class BlenderMCPServer:
             except:
                 pass
             self.socket = None
+            if self.unix_path and self._is_socket(self.unix_path):
+                try:
+                    os.unlink(self.unix_path)
+                except OSError:
+                    pass
         
         # Wait for thread to finish
         if self.server_thread:
@@ -78,6 +1864,60 @@ class BlenderMCPServer:
         
         print("BlenderMCP server stopped")
     
+    @property
+    def endpoint(self):
+        return f"unix://{self.unix_path}" if self.unix_path else f"tcp://{self.host}:{self.port}"
+    
+    @staticmethod
+    def _is_socket(path):
+        try:
+            return stat.S_ISSOCK(os.lstat(path).st_mode)
+        except OSError:
+            return False
+    
+    @classmethod
+    def _bind_unix_socket(cls, path):
+        """Bind a Unix domain socket that only the current user can connect to"""
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("Unix domain sockets are not supported on this platform")
+        if os.path.lexists(path):
+            # Connecting to a regular file is refused too: never delete anything but a socket
+            if not cls._is_socket(path):
+                raise RuntimeError(f"{path} exists and is not a socket")
+            # A socket file left by a Blender that crashed is replaced, a live one is not
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(path)
+            except ConnectionRefusedError:
+                os.unlink(path)
+            else:
+                raise RuntimeError(f"Another server is already listening on {path}")
+            finally:
+                probe.close()
+        
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Sockets are created with the umask applied; restrict access before anyone can connect
+        old_umask = os.umask(0o177)
+        try:
+            sock.bind(path)
+        except Exception:
+            sock.close()
+            raise
+        finally:
+            os.umask(old_umask)
+        return sock
+    
+    def serve_forever(self):
+        """Run the main-thread dispatcher in a blocking loop, for background (-b) mode"""
+        self.start()
+        try:
+            while self.running:
+                time.sleep(self.dispatcher.tick())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+    
     def _server_loop(self):
         """Main server loop in a separate thread"""
         print("Server thread started")
@@ -111,54 +1951,113 @@ class BlenderMCPServer:
         
         print("Server thread stopped")
     
+    def _read_message(self, client):
+        """Read one command, returning (command, framed) or None when the client disconnects"""
+        prefix = _recv_exactly(client, len(PROTOCOL_MAGIC))
+        if prefix is None:
+            return None
+        
+        if prefix == PROTOCOL_MAGIC:
+            rest = _recv_exactly(client, FRAME_HEADER.size - len(PROTOCOL_MAGIC))
+            if rest is None:
+                return None
+            _, version, flags, _, length = FRAME_HEADER.unpack(prefix + rest)
+            if version > PROTOCOL_VERSION:
+                raise ValueError(f"Unsupported protocol version: {version}")
+            if length > MAX_PAYLOAD_SIZE:
+                raise ValueError(f"Message too large: {length} bytes")
+            payload = _recv_exactly(client, length)
+            if payload is None:
+                return None
+            return json.loads(payload), True
+        
+        # Legacy client: raw JSON with no header, parse until the document is complete
+        buffer = bytearray(prefix)
+        while True:
+            try:
+                return json.loads(buffer), False
+            except ValueError:
+                # Incomplete data, wait for more
+                pass
+            data = client.recv(8192)
+            if not data:
+                return None
+            buffer += data
+
+    def _handshake_response(self, shared, compressor):
+        features = ["request_ids", "stream", "attachments"]
+        if shared is not None:
+            features.append("shared_memory")
+        return {"status": "success", "result": {
+            "protocol_version": PROTOCOL_VERSION,
+            "features": features,
+            "compression": compressor.codec if compressor is not None else None,
+        }}
+
+    def _immediate_command(self, command):
+        """Answer commands that are safe to run on the client thread, or return None"""
+        cmd_type = command.get("type")
+        if cmd_type == "ping":
+            return {"status": "success", "result": {"pong": True}}
+        if cmd_type == "get_server_stats":
+            return {"status": "success", "result": self.get_server_stats()}
+        return None
+
+    def get_server_stats(self):
+        """Runtime statistics of the addon server"""
+        return {
+            "background": bpy.app.background,
+            "endpoint": self.endpoint,
+            "commands": sorted(self._get_handlers()),
+            "primitive_mesh_cache": len(self._mesh_cache),
+            "scene_index": scene_index.get_stats(),
+            "spatial_index": spatial_index.get_stats(),
+            "dispatcher": self.dispatcher.get_stats(),
+            "compression": compression_stats.get_stats(),
+            "http": http_client.get_stats(),
+            "csm_tier_cache": tier_cache.get_stats(),
+            "csm_search_cache": search_cache.get_stats(),
+            "csm_asset_cache": asset_cache.get_stats(),
+        }
+
     def _handle_client(self, client):
         """Handle connected client"""
         print("Client handler started")
         client.settimeout(None)  # No timeout
-        buffer = b''
+        # Responses are sent from the main thread and the client thread, possibly out of order
+        send_lock = threading.Lock()
+        # Set by the handshake when the client offers a shared memory directory on this host
+        # and a compression codec we support
+        shared = None
+        compressor = None
         
         try:
             while self.running:
                 # Receive data
                 try:
-                    data = client.recv(8192)
-                    if not data:
+                    message = self._read_message(client)
+                    if message is None:
                         print("Client disconnected")
                         break
+                    command, framed = message
+                    reply = ClientReply(client, send_lock, command.get("id"), framed, shared, compressor)
                     
-                    buffer += data
-                    try:
-                        # Try to parse command
-                        command = json.loads(buffer.decode('utf-8'))
-                        buffer = b''
-                        
-                        # Execute command in Blender's main thread
-                        def execute_wrapper():
-                            try:
-                                response = self.execute_command(command)
-                                response_json = json.dumps(response)
-                                try:
-                                    client.sendall(response_json.encode('utf-8'))
-                                except:
-                                    print("Failed to send response - client disconnected")
-                            except Exception as e:
-                                print(f"Error executing command: {str(e)}")
-                                traceback.print_exc()
-                                try:
-                                    error_response = {
-                                        "status": "error",
-                                        "message": str(e)
-                                    }
-                                    client.sendall(json.dumps(error_response).encode('utf-8'))
-                                except:
-                                    pass
-                            return None
-                        
-                        # Schedule execution in main thread
-                        bpy.app.timers.register(execute_wrapper, first_interval=0.0)
-                    except json.JSONDecodeError:
-                        # Incomplete data, wait for more
-                        pass
+                    if command.get("type") == "handshake":
+                        # The handshake itself is raw JSON; the options apply to the framed messages after it
+                        params = command.get("params") or {}
+                        shared = SharedMemoryWriter.accept(params.get("shared_memory"))
+                        compressor = PayloadCompressor.negotiate(params.get("compression"))
+                        reply(self._handshake_response(shared, compressor))
+                        continue
+                    
+                    # Commands that do not touch Blender data are answered right away
+                    response = self._immediate_command(command)
+                    if response is not None:
+                        reply(response)
+                        continue
+                    
+                    # Everything else runs on Blender's main thread
+                    self.dispatcher.submit(command, reply)
                 except Exception as e:
                     print(f"Error receiving data: {str(e)}")
                     break
@@ -169,23 +2068,16 @@ class BlenderMCPServer:
                 client.close()
             except:
                 pass
+            if shared is not None:
+                shared.sweep()
             print("Client handler stopped")
 
     def execute_command(self, command):
         """Execute a command in the main Blender thread"""
         try:
-            cmd_type = command.get("type")
-            params = command.get("params", {})
-            
-            # Ensure we're in the right context
-            if cmd_type in ["create_object", "modify_object", "delete_object"]:
-                override = bpy.context.copy()
-                override['area'] = [area for area in bpy.context.screen.areas if area.type == 'VIEW_3D'][0]
-                with bpy.context.temp_override(**override):
-                    return self._execute_command_internal(command)
-            else:
-                return self._execute_command_internal(command)
-                
+            # Handlers only use the bpy.data API (or operators that need no window),
+            # so commands run the same with a UI and in background (-b) mode
+            return self._execute_command_internal(command)
         except Exception as e:
             print(f"Error executing command: {str(e)}")
             traceback.print_exc()
@@ -196,10 +2088,35 @@ class BlenderMCPServer:
         cmd_type = command.get("type")
         params = command.get("params", {})
         
-        # Base handlers that are always available
-        handlers = {
+        handlers = self._get_handlers()
+        handler = handlers.get(cmd_type)
+        if handler:
+            try:
+                print(f"Executing handler for {cmd_type}")
+                result = handler(**params)
+                print(f"Handler execution complete")
+                return {"status": "success", "result": result}
+            except Exception as e:
+                print(f"Error in handler: {str(e)}")
+                traceback.print_exc()
+                return {"status": "error", "message": str(e)}
+        else:
+            return {"status": "error", "message": f"Unknown command type: {cmd_type}"}
+
+    def _get_handlers(self):
+        """Map of command type to handler; identical in GUI and background mode"""
+        return {
             "get_scene_info": self.get_scene_info,
+            "get_scene_changes": self.get_scene_changes,
+            "get_bounds": self.get_bounds,
+            "get_objects_info": self.get_objects_info,
+            "get_mesh_data": self.get_mesh_data,
+            "find_objects_in_box": self.find_objects_in_box,
+            "find_nearest_objects": self.find_nearest_objects,
+            "find_overlapping_objects": self.find_overlapping_objects,
             "create_object": self.create_object,
+            "create_objects": self.create_objects,
+            "make_single_user": self.make_single_user,
             "modify_object": self.modify_object,
             "delete_object": self.delete_object,
             "get_object_info": self.get_object_info,
@@ -211,22 +2128,65 @@ class BlenderMCPServer:
             "animate_object": lambda **kwargs: self.animate_object(**kwargs),
             "get_correct_tier": lambda **kwargs: self.get_correct_tier(**kwargs),
             "import_file": lambda **kwargs: self.import_file(**kwargs),
+            "batch": self.batch,
+            "render_scene": self.render_scene,
+            "export_scene": self.export_scene,
+            "save_blend": self.save_blend,
+            "open_blend": self.open_blend,
+            "clear_scene": self.clear_scene,
         }
 
-        handler = handlers.get(cmd_type)
-        if handler:
-            try:
-                print(f"Executing handler for {cmd_type}")
-                result = handler(**params)
-                print(f"Handler execution complete")
-                return {"status": "success", "result": result}
-            except Exception as e:
-                print(f"Error in handler: {str(e)}")
-                traceback.print_exc()
-                return {"status": "error", "message": str(e)}
-        else:
-            return {"status": "error", "message": f"Unknown command type: {cmd_type}"}
+    @staticmethod
+    def _is_failed_response(response):
+        """Whether a command response reports a failure, at the protocol or handler level"""
+        if response.get("status") == "error":
+            return True
+        result = response.get("result")
+        if isinstance(result, dict):
+            return "error" in result or result.get("succeed") is False or result.get("status") == "error"
+        return False
 
+    def batch(self, commands, stop_on_error=False, undo_message="MCP Batch"):
+        """Run an ordered list of commands in one main-thread slot
+        
+        Parameters:
+        - commands: List of {"type": ..., "params": {...}} commands
+        - stop_on_error: Skip the remaining commands after the first failure
+        - undo_message: Name of the single undo step recorded for the whole batch
+        
+        Returns the per-command responses in order.
+        """
+        results = []
+        failed = 0
+        for command in commands:
+            if command.get("type") == "batch":
+                response = {"status": "error", "message": "Nested batch commands are not supported"}
+            else:
+                response = self.execute_command(command)
+                if isinstance(response.get("result"), types.GeneratorType):
+                    response = collect_stream(response["result"])
+                elif isinstance(response.get("result"), Deferred):
+                    response = resolve_deferred(response["result"])
+            results.append(response)
+            
+            if self._is_failed_response(response):
+                failed += 1
+                if stop_on_error:
+                    break
+        
+        # Record the whole batch as one undo step (not available in every context)
+        try:
+            bpy.ops.ed.undo_push(message=undo_message)
+        except Exception as e:
+            print(f"Could not push undo step for batch: {str(e)}")
+        
+        return {
+            "results": results,
+            "executed": len(results),
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "skipped": len(commands) - len(results),
+        }
     
     def get_simple_info(self):
         """Get basic Blender information"""
@@ -236,39 +2196,300 @@ class BlenderMCPServer:
             "object_count": len(bpy.context.scene.objects)
         }
     
-    def get_scene_info(self):
-        """Get information about the current Blender scene"""
+    # Per-object fields that get_scene_info can project
+    OBJECT_FIELDS = {
+        "name": lambda obj: obj.name,
+        "type": lambda obj: obj.type,
+        "location": lambda obj: [round(float(v), 4) for v in obj.location],
+        "rotation": lambda obj: [round(float(v), 4) for v in obj.rotation_euler],
+        "scale": lambda obj: [round(float(v), 4) for v in obj.scale],
+        "dimensions": lambda obj: [round(float(v), 4) for v in obj.dimensions],
+        "visible": lambda obj: obj.visible_get(),
+        "parent": lambda obj: obj.parent.name if obj.parent else None,
+        "collections": lambda obj: [coll.name for coll in obj.users_collection],
+        "data": lambda obj: obj.data.name if obj.data else None,
+        "materials": lambda obj: [slot.material.name for slot in obj.material_slots if slot.material],
+        "mesh": lambda obj: {
+            "vertices": len(obj.data.vertices),
+            "edges": len(obj.data.edges),
+            "polygons": len(obj.data.polygons),
+        } if obj.type == 'MESH' and obj.data else None,
+    }
+    DEFAULT_OBJECT_FIELDS = ("name", "type", "location")
+
+    def _filter_scene_objects(self, types=None, collection=None, name_pattern=None, visible=None):
+        """Names of the scene objects matching all given filters, sorted by name"""
+        scene = bpy.context.scene
+        if collection:
+            coll = bpy.data.collections.get(collection)
+            if coll is None:
+                raise ValueError(f"Collection not found: {collection}")
+            objects = coll.all_objects
+        elif types:
+            objects = scene_index.objects(types)
+        else:
+            objects = scene.objects
+        
+        # Objects from a collection or the index may belong to other scenes (or none)
+        in_scene = {obj.as_pointer() for obj in scene.objects} if collection or types else None
+        type_set = {t.upper() for t in types} if types else None
+        name_match = re.compile(fnmatch.translate(name_pattern)).match if name_pattern else None
+        names = [
+            obj.name for obj in objects
+            if (in_scene is None or obj.as_pointer() in in_scene)
+            and (type_set is None or obj.type in type_set)
+            and (name_match is None or name_match(obj.name))
+            and (visible is None or obj.visible_get() == visible)
+        ]
+        names.sort()
+        return names
+
+    def _project_objects(self, names, fields):
+        """Build the records for the named objects, skipping any removed in the meantime"""
+        getters = [(field, self.OBJECT_FIELDS[field]) for field in fields]
+        records = []
+        for name in names:
+            obj = scene_index.get(name)
+            if obj is not None:
+                records.append({field: getter(obj) for field, getter in getters})
+        return records
+
+    def get_scene_info(self, cursor=None, limit=100, types=None, collection=None, name_pattern=None,
+                       visible=None, fields=None, stream=False, chunk_size=500):
+        """Get information about the current Blender scene
+        
+        Parameters:
+        - cursor: Name of the last object of the previous page; objects are ordered by name
+        - limit: Maximum number of objects to return (None for all)
+        - types: Only objects of these types (e.g. ["MESH", "LIGHT"])
+        - collection: Only objects in this collection or its children
+        - name_pattern: Only objects whose name matches this glob (e.g. "Rock_*")
+        - visible: Only visible (True) or hidden (False) objects
+        - fields: Object fields to return, from OBJECT_FIELDS (default name, type, location)
+        - stream: Stream the objects in chunks of chunk_size instead of one document
+        """
         try:
             print("Getting scene info...")
-            # Simplify the scene info to reduce data size
+            fields = list(fields or self.DEFAULT_OBJECT_FIELDS)
+            unknown = [field for field in fields if field not in self.OBJECT_FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(self.OBJECT_FIELDS)}")
+            
+            names = self._filter_scene_objects(types, collection, name_pattern, visible)
+            matched_count = len(names)
+            if cursor:
+                names = names[bisect.bisect_right(names, cursor):]
+            next_cursor = None
+            if limit is not None and len(names) > limit:
+                names = names[:limit]
+                next_cursor = names[-1] if names else None
+            
             scene_info = {
                 "name": bpy.context.scene.name,
+                "revision": scene_index.revision(),
                 "object_count": len(bpy.context.scene.objects),
-                "objects": [],
                 "materials_count": len(bpy.data.materials),
+                "matched_count": matched_count,
+                "next_cursor": next_cursor,
             }
             
-            # Collect minimal object information (limit to first 10 objects)
-            for i, obj in enumerate(bpy.context.scene.objects):
-                if i >= 10:  # Reduced from 20 to 10
-                    break
-                    
-                obj_info = {
-                    "name": obj.name,
-                    "type": obj.type,
-                    # Only include basic location data
-                    "location": [round(float(obj.location.x), 2), 
-                                round(float(obj.location.y), 2), 
-                                round(float(obj.location.z), 2)],
-                }
-                scene_info["objects"].append(obj_info)
+            if stream:
+                return self._stream_objects(names, fields, max(1, chunk_size), scene_info)
             
+            scene_info["objects"] = self._project_objects(names, fields)
             print(f"Scene info collected: {len(scene_info['objects'])} objects")
             return scene_info
         except Exception as e:
             print(f"Error in get_scene_info: {str(e)}")
             traceback.print_exc()
             return {"error": str(e)}
+
+    def get_bounds(self, names=None, types=None, collection=None, name_pattern=None, mode="box"):
+        """World-space AABBs of many objects in one pass
+        
+        Parameters:
+        - names: Objects to measure; if omitted, the scene objects matching the filters
+        - types, collection, name_pattern: Filters as in get_scene_info
+        - mode: "box", "evaluated" (with modifiers) or "tight" (exact, from mesh vertices)
+        
+        Returns columnar names/min/max lists plus the union of all boxes.
+        """
+        missing = []
+        if names is not None:
+            objects = []
+            for name in names:
+                obj = scene_index.get(name)
+                if obj is None:
+                    missing.append(name)
+                else:
+                    objects.append(obj)
+        elif types or collection or name_pattern:
+            objects = [scene_index.get(name) for name in self._filter_scene_objects(types, collection, name_pattern)]
+        else:
+            objects = bpy.context.scene.objects
+        
+        mins, maxs = world_aabbs(objects, mode)
+        result = {
+            "mode": mode,
+            "names": [obj.name for obj in objects],
+            "min": np.round(mins, 4).tolist(),
+            "max": np.round(maxs, 4).tolist(),
+            "bounds": [np.round(mins.min(axis=0), 4).tolist(), np.round(maxs.max(axis=0), 4).tolist()] if len(mins) else None,
+        }
+        if missing:
+            result["missing"] = missing
+        return result
+
+    def find_objects_in_box(self, min, max, contain=False, types=None):
+        """Objects whose bounding boxes intersect (or lie inside) a world-space box"""
+        names = spatial_index.in_box(min, max, contain=contain, types=types)
+        return {"objects": names, "count": len(names)}
+
+    def find_nearest_objects(self, point, k=5, types=None, max_distance=None):
+        """The k objects whose bounding boxes are closest to a point"""
+        return {"objects": spatial_index.nearest(point, k=k, types=types, max_distance=max_distance)}
+
+    def find_overlapping_objects(self, types=None, names=None, margin=0.0, limit=1000):
+        """Pairs of objects whose bounding boxes overlap"""
+        return spatial_index.overlapping_pairs(types=types, names=names, margin=margin, limit=limit)
+
+    def get_objects_info(self, names=None, types=None, collection=None, name_pattern=None, visible=None,
+                         fields=None):
+        """Information about many objects at once, as one list per field
+        
+        Parameters:
+        - names: Objects to describe; if omitted, the scene objects matching the filters
+        - types, collection, name_pattern, visible: Filters as in get_scene_info
+        - fields: Fields from OBJECT_FIELDS, plus "world_bounding_box" (computed in bulk);
+          default name, type, location, rotation, scale, visible
+        
+        Returns {"count", "columns": {field: [value per object]}} with objects in the same
+        order in every column, and "missing" for names that were not found.
+        """
+        fields = list(dict.fromkeys(["name", *(fields or ("type", "location", "rotation", "scale", "visible"))]))
+        unknown = [field for field in fields if field not in self.OBJECT_FIELDS and field != "world_bounding_box"]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}. "
+                             f"Available: {', '.join(self.OBJECT_FIELDS)}, world_bounding_box")
+        
+        missing = []
+        if names is not None:
+            objects = []
+            for name in names:
+                obj = scene_index.get(name)
+                if obj is None:
+                    missing.append(name)
+                else:
+                    objects.append(obj)
+        else:
+            objects = [scene_index.get(name)
+                       for name in self._filter_scene_objects(types, collection, name_pattern, visible)]
+        
+        columns = {}
+        for field in fields:
+            if field == "world_bounding_box":
+                columns[field] = [None] * len(objects)
+                meshes = [i for i, obj in enumerate(objects) if obj.type == 'MESH']
+                mins, maxs = world_aabbs([objects[i] for i in meshes])
+                for i, lo, hi in zip(meshes, np.round(mins, 4).tolist(), np.round(maxs, 4).tolist()):
+                    columns[field][i] = [lo, hi]
+            else:
+                getter = self.OBJECT_FIELDS[field]
+                columns[field] = [getter(obj) for obj in objects]
+        
+        result = {"count": len(objects), "columns": columns}
+        if missing:
+            result["missing"] = missing
+        return result
+
+    MESH_ATTRIBUTES = ("vertices", "triangles", "normals", "uvs")
+
+    def get_mesh_data(self, name, evaluated=False, attributes=None):
+        """Geometry of a mesh object as flat binary buffers
+        
+        Parameters:
+        - name: Mesh object name
+        - evaluated: Use the geometry after modifiers instead of the base mesh
+        - attributes: Any of "vertices" (float32 V x 3, local space), "triangles" (uint32 T x 3
+          vertex indices), "normals" (float32 V x 3 vertex normals) and "uvs" (float32 L x 2
+          per loop of the active UV map, plus uint32 T x 3 "triangle_loops"). Default: all.
+        
+        The arrays travel as binary attachments to framed clients and as lists otherwise.
+        """
+        attributes = list(attributes or self.MESH_ATTRIBUTES)
+        unknown = [attribute for attribute in attributes if attribute not in self.MESH_ATTRIBUTES]
+        if unknown:
+            raise ValueError(f"Unknown mesh attributes: {', '.join(unknown)}")
+        obj = scene_index.get(name)
+        if obj is None:
+            raise ValueError(f"Object not found: {name}")
+        
+        source = obj.evaluated_get(bpy.context.evaluated_depsgraph_get()) if evaluated else obj
+        if evaluated:
+            mesh = source.to_mesh()
+        elif obj.type == 'MESH':
+            mesh = obj.data
+        else:
+            raise ValueError(f"Object {name} is not a mesh (type: {obj.type}); use evaluated=True for other geometry")
+        
+        try:
+            mesh.calc_loop_triangles()
+            vertex_count = len(mesh.vertices)
+            triangle_count = len(mesh.loop_triangles)
+            result = {
+                "name": obj.name,
+                "evaluated": evaluated,
+                "vertex_count": vertex_count,
+                "triangle_count": triangle_count,
+                "matrix_world": [list(row) for row in obj.matrix_world],
+            }
+            
+            if "vertices" in attributes:
+                coords = np.empty(vertex_count * 3, dtype=np.float32)
+                mesh.vertices.foreach_get("co", coords)
+                result["vertices"] = coords.reshape(vertex_count, 3)
+            if "triangles" in attributes:
+                indices = np.empty(triangle_count * 3, dtype=np.int32)
+                mesh.loop_triangles.foreach_get("vertices", indices)
+                result["triangles"] = indices.view(np.uint32).reshape(triangle_count, 3)
+            if "normals" in attributes:
+                normals = np.empty(vertex_count * 3, dtype=np.float32)
+                if hasattr(mesh, "vertex_normals"):
+                    mesh.vertex_normals.foreach_get("vector", normals)  # Blender 3.5+
+                else:
+                    mesh.vertices.foreach_get("normal", normals)
+                result["normals"] = normals.reshape(vertex_count, 3)
+            if "uvs" in attributes and mesh.uv_layers.active is not None:
+                uv_layer = mesh.uv_layers.active
+                uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+                uv_layer.data.foreach_get("uv", uvs)
+                loops = np.empty(triangle_count * 3, dtype=np.int32)
+                mesh.loop_triangles.foreach_get("loops", loops)
+                result["uv_map"] = uv_layer.name
+                result["uvs"] = uvs.reshape(len(mesh.loops), 2)
+                result["triangle_loops"] = loops.view(np.uint32).reshape(triangle_count, 3)
+            return result
+        finally:
+            if evaluated:
+                source.to_mesh_clear()
+
+    def get_scene_changes(self, since_revision=0):
+        """Changes to scene objects after a revision from get_scene_info or get_scene_changes
+        
+        Returns the current revision and the change records (added, removed, renamed,
+        transformed, geometry_changed, material_changed), or resync_required when the
+        changes are no longer available.
+        """
+        return scene_index.changes_since(since_revision)
+
+    def _stream_objects(self, names, fields, chunk_size, summary):
+        """Yield object records chunk by chunk, then return the summary with the count sent"""
+        count = 0
+        for start in range(0, len(names), chunk_size):
+            records = self._project_objects(names[start:start + chunk_size], fields)
+            count += len(records)
+            yield records
+        return {**summary, "count": count}
     
     @staticmethod
     def _get_aabb(obj):
@@ -276,84 +2497,180 @@ class BlenderMCPServer:
         if obj.type != 'MESH':
             raise TypeError("Object must be a mesh")
 
-        # Get the bounding box corners in local space
-        local_bbox_corners = [mathutils.Vector(corner) for corner in obj.bound_box]
+        mins, maxs = world_aabbs([obj])
+        return [mins[0].tolist(), maxs[0].tolist()]
 
-        # Convert to world coordinates
-        world_bbox_corners = [obj.matrix_world @ corner for corner in local_bbox_corners]
+    # Default object and mesh names, matching the ones Blender's "Add" menu uses
+    PRIMITIVE_NAMES = {
+        "CUBE": "Cube", "SPHERE": "Sphere", "CYLINDER": "Cylinder", "PLANE": "Plane",
+        "CONE": "Cone", "TORUS": "Torus", "EMPTY": "Empty", "CAMERA": "Camera", "LIGHT": "Light",
+    }
 
-        # Compute axis-aligned min/max coordinates
-        min_corner = mathutils.Vector(map(min, zip(*world_bbox_corners)))
-        max_corner = mathutils.Vector(map(max, zip(*world_bbox_corners)))
+    TORUS_DEFAULTS = {
+        "major_segments": 48, "minor_segments": 12, "mode": "MAJOR_MINOR",
+        "major_radius": 1.0, "minor_radius": 0.25, "abso_major_rad": 1.25, "abso_minor_rad": 0.75,
+        "generate_uvs": True,
+    }
 
-        return [
-            [*min_corner], [*max_corner]
-        ]
+    @staticmethod
+    def _build_torus(bm, major_segments, minor_segments, major_radius, minor_radius, generate_uvs):
+        """Add a torus to a bmesh; bmesh.ops has no torus primitive"""
+        verts = []
+        for i in range(major_segments):
+            u = 2.0 * math.pi * i / major_segments
+            for j in range(minor_segments):
+                v = 2.0 * math.pi * j / minor_segments
+                ring = major_radius + minor_radius * math.cos(v)
+                verts.append(bm.verts.new((ring * math.cos(u), ring * math.sin(u), minor_radius * math.sin(v))))
+        
+        uv_layer = bm.loops.layers.uv.new("UVMap") if generate_uvs else None
+        for i in range(major_segments):
+            next_i = (i + 1) % major_segments
+            for j in range(minor_segments):
+                next_j = (j + 1) % minor_segments
+                face = bm.faces.new((
+                    verts[i * minor_segments + j],
+                    verts[next_i * minor_segments + j],
+                    verts[next_i * minor_segments + next_j],
+                    verts[i * minor_segments + next_j],
+                ))
+                if uv_layer:
+                    # Unwrapped per face so the seams do not wrap around
+                    corners = ((i, j), (i + 1, j), (i + 1, j + 1), (i, j + 1))
+                    for loop, (ci, cj) in zip(face.loops, corners):
+                        loop[uv_layer].uv = (ci / major_segments, cj / minor_segments)
 
-    def create_object(self, type="CUBE", name=None, location=(0, 0, 0), rotation=(0, 0, 0), scale=(1, 1, 1),
-                    align="WORLD", major_segments=48, minor_segments=12, mode="MAJOR_MINOR",
-                    major_radius=1.0, minor_radius=0.25, abso_major_rad=1.25, abso_minor_rad=0.75, generate_uvs=True):
-        """Create a new object in the scene"""
+    @classmethod
+    def _torus_params(cls, mesh_params):
+        """Torus parameters with the Add menu defaults filled in"""
+        unknown = set(mesh_params) - set(cls.TORUS_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown torus parameters: {', '.join(sorted(unknown))}")
+        return {**cls.TORUS_DEFAULTS, **mesh_params}
+
+    @classmethod
+    def _build_primitive_mesh(cls, type, name, **mesh_params):
+        """Build a primitive mesh datablock with bmesh, with the same defaults as the Add menu"""
+        bm = bmesh.new()
         try:
-            # Deselect all objects first
-            bpy.ops.object.select_all(action='DESELECT')
-            
-            # Create the object based on type
-            if type == "CUBE":
-                bpy.ops.mesh.primitive_cube_add(location=location, rotation=rotation, scale=scale)
-            elif type == "SPHERE":
-                bpy.ops.mesh.primitive_uv_sphere_add(location=location, rotation=rotation, scale=scale)
-            elif type == "CYLINDER":
-                bpy.ops.mesh.primitive_cylinder_add(location=location, rotation=rotation, scale=scale)
-            elif type == "PLANE":
-                bpy.ops.mesh.primitive_plane_add(location=location, rotation=rotation, scale=scale)
-            elif type == "CONE":
-                bpy.ops.mesh.primitive_cone_add(location=location, rotation=rotation, scale=scale)
-            elif type == "TORUS":
-                bpy.ops.mesh.primitive_torus_add(
-                    align=align,
-                    location=location,
-                    rotation=rotation,
-                    major_segments=major_segments,
-                    minor_segments=minor_segments,
-                    mode=mode,
-                    major_radius=major_radius,
-                    minor_radius=minor_radius,
-                    abso_major_rad=abso_major_rad,
-                    abso_minor_rad=abso_minor_rad,
-                    generate_uvs=generate_uvs
-                )
-            elif type == "EMPTY":
-                bpy.ops.object.empty_add(location=location, rotation=rotation, scale=scale)
-            elif type == "CAMERA":
-                bpy.ops.object.camera_add(location=location, rotation=rotation)
-            elif type == "LIGHT":
-                bpy.ops.object.light_add(type='POINT', location=location, rotation=rotation, scale=scale)
+            if type == "TORUS":
+                p = cls._torus_params(mesh_params)
+                major_radius, minor_radius = p["major_radius"], p["minor_radius"]
+                if p["mode"] == "EXT_INT":
+                    major_radius = (p["abso_major_rad"] + p["abso_minor_rad"]) / 2.0
+                    minor_radius = (p["abso_major_rad"] - p["abso_minor_rad"]) / 2.0
+                cls._build_torus(bm, p["major_segments"], p["minor_segments"], major_radius, minor_radius,
+                                 p["generate_uvs"])
             else:
-                raise ValueError(f"Unsupported object type: {type}")
-            
-            # Force update the view layer
-            bpy.context.view_layer.update()
-            
-            # Get the active object (which should be our newly created object)
-            obj = bpy.context.view_layer.objects.active
-            
-            # If we don't have an active object, something went wrong
-            if obj is None:
-                raise RuntimeError("Failed to create object - no active object")
+                bm.loops.layers.uv.new("UVMap")
+                if type == "CUBE":
+                    bmesh.ops.create_cube(bm, size=2.0, calc_uvs=True)
+                elif type == "SPHERE":
+                    bmesh.ops.create_uvsphere(bm, u_segments=32, v_segments=16, radius=1.0, calc_uvs=True)
+                elif type == "CYLINDER":
+                    bmesh.ops.create_cone(bm, cap_ends=True, segments=32, radius1=1.0, radius2=1.0, depth=2.0, calc_uvs=True)
+                elif type == "CONE":
+                    bmesh.ops.create_cone(bm, cap_ends=True, segments=32, radius1=1.0, radius2=0.0, depth=2.0, calc_uvs=True)
+                elif type == "PLANE":
+                    bmesh.ops.create_grid(bm, x_segments=1, y_segments=1, size=1.0, calc_uvs=True)
+                else:
+                    raise ValueError(f"Unsupported mesh primitive: {type}")
             
-            # Make sure it's selected
+            mesh = bpy.data.meshes.new(name)
+            bm.to_mesh(mesh)
+            return mesh
+        finally:
+            bm.free()
+
+    def _get_primitive_mesh(self, type, **mesh_params):
+        """Return the shared mesh for a primitive type and parameters, building it on first use"""
+        params = self._torus_params(mesh_params) if type == "TORUS" else mesh_params
+        key = (type,) + tuple(sorted(params.items()))
+        mesh = self._mesh_cache.get(key)
+        if mesh is not None:
+            try:
+                # Removed datablocks (deleted, new file loaded) raise on access
+                if bpy.data.meshes.get(mesh.name) == mesh:
+                    return mesh
+            except ReferenceError:
+                pass
+        
+        mesh = self._build_primitive_mesh(type, self.PRIMITIVE_NAMES[type], **mesh_params)
+        self._mesh_cache[key] = mesh
+        return mesh
+
+    def _uses_shared_data(self, obj):
+        """Whether editing obj.data would affect other objects: it has other users, or it is
+        a cached primitive mesh that later primitives will reuse (even while it has one user)"""
+        data = obj.data
+        return data.users > 1 or any(mesh == data for mesh in self._mesh_cache.values())
+
+    def _new_object(self, type, name=None, share_mesh=True, **mesh_params):
+        """Create an unlinked object (and its data) of the given type without operators
+        
+        Mesh primitives share one cached mesh per type and parameters unless share_mesh is False.
+        """
+        if type not in self.PRIMITIVE_NAMES:
+            raise ValueError(f"Unsupported object type: {type}")
+        name = name or self.PRIMITIVE_NAMES[type]
+        
+        if type == "EMPTY":
+            obj = bpy.data.objects.new(name, None)
+            obj.empty_display_type = 'PLAIN_AXES'
+        elif type == "CAMERA":
+            obj = bpy.data.objects.new(name, bpy.data.cameras.new(name))
+        elif type == "LIGHT":
+            obj = bpy.data.objects.new(name, bpy.data.lights.new(name, type='POINT'))
+        else:
+            if share_mesh:
+                mesh = self._get_primitive_mesh(type, **mesh_params)
+            else:
+                mesh = self._build_primitive_mesh(type, name, **mesh_params)
+            obj = bpy.data.objects.new(name, mesh)
+        return obj
+
+    def _spawn_object(self, collection, type="CUBE", name=None, location=(0, 0, 0), rotation=(0, 0, 0),
+                      scale=(1, 1, 1), align="WORLD", share_mesh=True, **mesh_params):
+        """Build an object from a spec and link it into a collection, without updating the view layer"""
+        if type == "TORUS":
+            # The torus is not scaled; align to the 3D cursor like the Add menu does
+            scale = (1, 1, 1)
+            if align == "CURSOR":
+                rotation = bpy.context.scene.cursor.rotation_euler
+        else:
+            if type == "CAMERA":
+                scale = (1, 1, 1)
+            mesh_params = {}
+        
+        obj = self._new_object(type, name, share_mesh=share_mesh, **mesh_params)
+        obj.location = location
+        obj.rotation_euler = rotation
+        obj.scale = scale
+        collection.objects.link(obj)
+        return obj
+
+    def create_object(self, type="CUBE", name=None, location=(0, 0, 0), rotation=(0, 0, 0), scale=(1, 1, 1),
+                    align="WORLD", share_mesh=True, **mesh_params):
+        """Create a new object in the scene
+        
+        Torus parameters (major_segments, minor_segments, mode, major_radius, minor_radius,
+        abso_major_rad, abso_minor_rad, generate_uvs) are passed through mesh_params.
+        Mesh primitives are linked duplicates of a cached mesh unless share_mesh is False;
+        use make_single_user before editing the geometry of one of them.
+        """
+        try:
+            # Link into the active collection and make it the only selected, active object
+            view_layer = bpy.context.view_layer
+            collection = view_layer.active_layer_collection.collection
+            obj = self._spawn_object(collection, type=type, name=name, location=location, rotation=rotation,
+                                     scale=scale, align=align, share_mesh=share_mesh, **mesh_params)
+            for selected in view_layer.objects.selected:
+                selected.select_set(False)
             obj.select_set(True)
+            view_layer.objects.active = obj
             
-            # Rename if name is provided
-            if name:
-                obj.name = name
-                if obj.data:
-                    obj.data.name = name
-            
-            # Patch for PLANE: scale don't work with bpy.ops.mesh.primitive_plane_add()
-            if type in {"PLANE"}:
-                obj.scale = scale
+            # Force update the view layer
+            view_layer.update()
 
             # Return the object info
             result = {
@@ -374,10 +2691,71 @@ class BlenderMCPServer:
             traceback.print_exc()
             return {"error": str(e)}
 
+    def create_objects(self, objects, collection=None):
+        """Create many objects in one call
+        
+        Parameters:
+        - objects: List of specs with the same keys as create_object
+          (type, name, location, rotation, scale and the torus parameters)
+        - collection: Optional name of the collection to link the objects into;
+          created under the scene collection if missing. Defaults to the active collection.
+        
+        The view layer is updated once at the end instead of once per object. A bad spec
+        is reported in "errors" and does not stop the rest.
+        """
+        view_layer = bpy.context.view_layer
+        if collection:
+            target = bpy.data.collections.get(collection)
+            if target is None:
+                target = bpy.data.collections.new(collection)
+                bpy.context.scene.collection.children.link(target)
+        else:
+            target = view_layer.active_layer_collection.collection
+        
+        created = []
+        errors = []
+        for index, spec in enumerate(objects):
+            try:
+                created.append(self._spawn_object(target, **spec))
+            except Exception as e:
+                errors.append({"index": index, "error": str(e)})
+        
+        # Leave the new objects selected, with the last one active
+        if created:
+            for selected in view_layer.objects.selected:
+                selected.select_set(False)
+            for obj in created:
+                obj.select_set(True)
+            view_layer.objects.active = created[-1]
+        
+        view_layer.update()
+        
+        return {
+            "created": [obj.name for obj in created],
+            "count": len(created),
+            "collection": target.name,
+            "errors": errors,
+        }
+
+    def make_single_user(self, names):
+        """Give objects their own copy of shared object data so it can be edited independently"""
+        results = {}
+        for name in names:
+            obj = scene_index.get(name)
+            if obj is None:
+                results[name] = "not found"
+            elif obj.data is None or not self._uses_shared_data(obj):
+                results[name] = "already single user"
+            else:
+                obj.data = obj.data.copy()
+                obj.data.name = obj.name
+                results[name] = "made single user"
+        return {"objects": results}
+
     def modify_object(self, name, location=None, rotation=None, scale=None, visible=None):
         """Modify an existing object in the scene"""
         # Find the object by name
-        obj = bpy.data.objects.get(name)
+        obj = scene_index.get(name)
         if not obj:
             raise ValueError(f"Object not found: {name}")
         
@@ -395,6 +2773,10 @@ class BlenderMCPServer:
             obj.hide_viewport = not visible
             obj.hide_render = not visible
         
+        # Recompute matrix_world for the bounding box below, and record the change for
+        # get_scene_changes and the spatial index (also in background mode)
+        bpy.context.view_layer.update()
+        
         result = {
             "name": obj.name,
             "type": obj.type,
@@ -412,7 +2794,7 @@ class BlenderMCPServer:
 
     def delete_object(self, name):
         """Delete an object from the scene"""
-        obj = bpy.data.objects.get(name)
+        obj = scene_index.get(name)
         if not obj:
             raise ValueError(f"Object not found: {name}")
         
@@ -421,13 +2803,14 @@ class BlenderMCPServer:
         
         # Select and delete the object
         if obj:
+            scene_index.discard(obj)
             bpy.data.objects.remove(obj, do_unlink=True)
         
         return {"deleted": obj_name}
     
     def get_object_info(self, name):
         """Get detailed information about a specific object"""
-        obj = bpy.data.objects.get(name)
+        obj = scene_index.get(name)
         if not obj:
             raise ValueError(f"Object not found: {name}")
         
@@ -490,7 +2873,7 @@ class BlenderMCPServer:
         """Set or create a material for an object"""
         try:
             # Get the object
-            obj = bpy.data.objects.get(object_name)
+            obj = scene_index.get(object_name)
             if not obj:
                 raise ValueError(f"Object not found: {object_name}")
             
@@ -542,7 +2925,16 @@ class BlenderMCPServer:
             
             # Assign material to object if not already assigned
             if mat:
-                if not obj.data.materials:
+                shared = self._uses_shared_data(obj)
+                if shared and obj.data.materials:
+                    # Shared (instanced or cached primitive) data: link the material to this object only
+                    obj.material_slots[0].link = 'OBJECT'
+                    obj.material_slots[0].material = mat
+                elif shared:
+                    # A new slot would be added to every object sharing the data: copy it first
+                    self.make_single_user([obj.name])
+                    obj.data.materials.append(mat)
+                elif not obj.data.materials:
                     obj.data.materials.append(mat)
                 else:
                     # Only modify first material slot
@@ -589,6 +2981,73 @@ class BlenderMCPServer:
             "resolution": [bpy.context.scene.render.resolution_x, bpy.context.scene.render.resolution_y],
         }
 
+    def export_scene(self, filepath, format="GLB", names=None):
+        """Export the scene, or only the named objects, to GLB, GLTF, FBX or OBJ"""
+        format = format.upper()
+        use_selection = names is not None
+        if use_selection:
+            wanted = set(names)
+            for obj in bpy.context.view_layer.objects:
+                obj.select_set(obj.name in wanted)
+        
+        if format in ("GLB", "GLTF"):
+            bpy.ops.export_scene.gltf(
+                filepath=filepath,
+                export_format='GLB' if format == "GLB" else 'GLTF_SEPARATE',
+                use_selection=use_selection
+            )
+        elif format == "FBX":
+            bpy.ops.export_scene.fbx(filepath=filepath, use_selection=use_selection)
+        elif format == "OBJ":
+            if bpy.app.version >= (3, 2, 0):
+                bpy.ops.wm.obj_export(filepath=filepath, export_selected_objects=use_selection)
+            else:
+                bpy.ops.export_scene.obj(filepath=filepath, use_selection=use_selection)
+        else:
+            raise ValueError(f"Unsupported export format: {format}")
+        
+        return {"filepath": filepath, "format": format}
+
+    def save_blend(self, filepath, names=None):
+        """Save a copy of the whole file, or only the named objects, to a .blend file"""
+        if names is None:
+            bpy.ops.wm.save_as_mainfile(filepath=filepath, copy=True)
+            return {"filepath": filepath}
+        
+        objects = set()
+        for name in names:
+            obj = scene_index.get(name)
+            if not obj:
+                raise ValueError(f"Object not found: {name}")
+            objects.add(obj)
+            objects.update(obj.children_recursive)
+        
+        # Writes the objects together with the data they use (meshes, materials, images)
+        bpy.data.libraries.write(filepath, objects, fake_user=True)
+        return {"filepath": filepath, "objects": sorted(obj.name for obj in objects)}
+
+    def open_blend(self, filepath):
+        """Replace the current file with a .blend file (used by background workers)"""
+        if not os.path.exists(filepath):
+            raise ValueError(f"File not found: {filepath}")
+        bpy.ops.wm.open_mainfile(filepath=filepath)
+        return {"filepath": filepath, "object_count": len(bpy.context.scene.objects)}
+
+    def clear_scene(self):
+        """Remove all objects and the data they used, giving a worker a clean slate"""
+        removed = len(bpy.data.objects)
+        for obj in list(bpy.data.objects):
+            scene_index.discard(obj)
+            bpy.data.objects.remove(obj, do_unlink=True)
+        for collection in list(bpy.context.scene.collection.children):
+            bpy.data.collections.remove(collection)
+        for datablocks in (bpy.data.meshes, bpy.data.materials, bpy.data.images,
+                           bpy.data.armatures, bpy.data.actions, bpy.data.cameras, bpy.data.lights):
+            for block in list(datablocks):
+                if block.users == 0:
+                    datablocks.remove(block)
+        return {"removed_objects": removed}
+
     def ensure_valid_csm_token(self):
         """Check if CSM.ai integration is enabled and an API key is set"""
         scene = bpy.context.scene
@@ -617,7 +3076,7 @@ class BlenderMCPServer:
         
         return {"enabled": True}
 
-    def search_csm_models(self, search_text, limit=20, tier=None):
+    def search_csm_models(self, search_text, limit=20, tier=None, bypass_cache=False):
         """Search for 3D models on CSM.ai using text"""
         try:
             # Add detailed debug information about all parameters
@@ -663,83 +3122,95 @@ class BlenderMCPServer:
                 filter_tier = actual_tier if use_private_assets else 'free'
                 print(f"Using tier based on settings: {filter_tier}")
             
-            # Set up the headers
-            headers = {
-                'Content-Type': 'application/json',
-                'x-api-key': api_key,
-                'x-platform': 'web',
-            }
-            
-            # Set up the request body
-            data = {
-                'search_text': search_text,
-                'limit': limit,
-                'filter_body': {
-                    'tier': filter_tier
-                }
-            }
-            
-            print(f"Searching for '{search_text}' models on CSM.ai using tier: {filter_tier}")
-            print(f"Request data: {data}")
-            
-            # Make the API request to CSM.ai
-            response = requests.post(
-                'https://api.csm.ai/image-to-3d-sessions/session-search/vector-search',
-                headers=headers,
-                json=data
+            # Repeated queries are answered from the cache
+            key = SearchCache.make_key(search_text, limit, filter_tier, use_private_assets, api_key)
+            result, cache_status = search_cache.get(
+                key,
+                lambda: self._vector_search(api_key, search_text, limit, filter_tier),
+                bypass=bypass_cache,
+                persist=bpy.context.scene.blendermcp_csm_persist_search_cache
             )
-            
-            print(f"Response status code: {response.status_code}")
-            
-            if response.status_code != 200:
-                error_details = response.text
-                error_message = "API request failed"
-                print(f"CSM API error: {error_details}")
-                
-                # Check for specific error types
-                if response.status_code == 403:
-                    error_message = "Authentication failed: Your API key may be invalid"
-                elif response.status_code == 401:
-                    error_message = "Authentication failed: Unauthorized"
-                
-                return {
-                    "status": "error", 
-                    "message": f"{error_message} (Status code: {response.status_code})",
-                    "details": error_details
-                }
-            
-            data = response.json()
-            print(f"Response data: {data}")
-            
-            # Filter results to only include models that have GLB files available
-            available_models = []
-            for model in data.get('data', []):
-                if model.get('mesh_url_glb'):
-                    available_models.append({
-                        "id": model.get("_id"),
-                        "session_code": model.get("session_code"),
-                        "image_url": model.get("image_url"),
-                        "mesh_url_glb": model.get("mesh_url_glb"),
-                        "status": model.get("status"),
-                        "tier": model.get("tier_at_creation")
-                    })
-            
-            print(f"Found {len(available_models)} models with GLB files out of {len(data.get('data', []))} total models")
-            
-            return {
-                "status": "success",
-                "models": available_models,
-                "total_found": len(data.get('data', [])),
-                "available_models": len(available_models),
-                "tier_used": filter_tier,
-                "models_by_tier": self._count_models_by_tier(data.get('data', []))
-            }
+            return {**result, "cache": cache_status}
             
         except Exception as e:
             print(f"Error in CSM search: {str(e)}")
             traceback.print_exc()
             return {"status": "error", "message": f"Error searching CSM models: {str(e)}"}
 
+    def _vector_search(self, api_key, search_text, limit, filter_tier):
+        """Run one vector search on CSM.ai; does not touch bpy, so it can run on any thread"""
+        # Set up the headers
+        headers = {
+            'Content-Type': 'application/json',
+            'x-api-key': api_key,
+            'x-platform': 'web',
+        }
+        
+        # Set up the request body
+        data = {
+            'search_text': search_text,
+            'limit': limit,
+            'filter_body': {
+                'tier': filter_tier
+            }
+        }
+        
+        print(f"Searching for '{search_text}' models on CSM.ai using tier: {filter_tier}")
+        print(f"Request data: {data}")
+        
+        # Make the API request to CSM.ai
+        response = http_client.post(
+            'https://api.csm.ai/image-to-3d-sessions/session-search/vector-search',
+            headers=headers,
+            json=data
+        )
+        
+        print(f"Response status code: {response.status_code}")
+        
+        if response.status_code != 200:
+            error_details = response.text
+            error_message = "API request failed"
+            print(f"CSM API error: {error_details}")
+            
+            # Check for specific error types
+            if response.status_code == 403:
+                error_message = "Authentication failed: Your API key may be invalid"
+            elif response.status_code == 401:
+                error_message = "Authentication failed: Unauthorized"
+            
+            return {
+                "status": "error", 
+                "message": f"{error_message} (Status code: {response.status_code})",
+                "details": error_details
+            }
+        
+        data = response.json()
+        print(f"Response data: {data}")
+        
+        # Filter results to only include models that have GLB files available
+        available_models = []
+        for model in data.get('data', []):
+            if model.get('mesh_url_glb'):
+                available_models.append({
+                    "id": model.get("_id"),
+                    "session_code": model.get("session_code"),
+                    "image_url": model.get("image_url"),
+                    "mesh_url_glb": model.get("mesh_url_glb"),
+                    "status": model.get("status"),
+                    "tier": model.get("tier_at_creation")
+                })
+        
+        print(f"Found {len(available_models)} models with GLB files out of {len(data.get('data', []))} total models")
+        
+        return {
+            "status": "success",
+            "models": available_models,
+            "total_found": len(data.get('data', [])),
+            "available_models": len(available_models),
+            "tier_used": filter_tier,
+            "models_by_tier": self._count_models_by_tier(data.get('data', []))
+        }
+
     def _count_models_by_tier(self, models):
         """Helper function to count models by tier"""
         tier_counts = {}
@@ -750,44 +3221,34 @@ class BlenderMCPServer:
 
     def import_csm_model(self, model_id, mesh_url_glb, name=None):
         """Import a 3D model from CSM.ai by its GLB URL"""
-        try:
-            if not mesh_url_glb:
-                return {"status": "error", "message": "No GLB URL provided"}
-            
-            if not name:
-                name = f"CSM_Model_{model_id}"
-            
-            # Create a temporary file to download the GLB
-            temp_file = tempfile.NamedTemporaryFile(
-                delete=False,
-                prefix=f"csm_{model_id}_",
-                suffix=".glb",
-            )
-            
+        if not mesh_url_glb:
+            return {"status": "error", "message": "No GLB URL provided"}
+        
+        if not name:
+            name = f"CSM_Model_{model_id}"
+        
+        def download():
+            # Worker thread: repeat imports of a model are served from the local asset cache
             try:
-                # Download the content
-                response = requests.get(mesh_url_glb, stream=True)
-                response.raise_for_status()  # Raise an exception for HTTP errors
-                
-                # Write the content to the temporary file
-                for chunk in response.iter_content(chunk_size=8192):
-                    temp_file.write(chunk)
-                    
-                # Close the file
-                temp_file.close()
-                
+                return asset_cache.fetch(model_id, mesh_url_glb), None
             except Exception as e:
-                # Clean up the file if there's an error
-                temp_file.close()
-                os.unlink(temp_file.name)
-                return {"succeed": False, "error": str(e)}
-            
+                return None, str(e)
+        
+        def finish(downloaded):
+            # Main thread: only the import itself touches Blender data
+            fetched, error = downloaded
+            if error is not None:
+                return {"succeed": False, "error": error}
+            filepath, from_cache = fetched
             try:
                 obj = self._clean_imported_glb(
-                    filepath=temp_file.name,
+                    filepath=filepath,
                     mesh_name=name
                 )
+                if obj is None:
+                    return {"succeed": False, "error": "GLB did not contain a single mesh"}
                 result = {
+                    "from_cache": from_cache,
                     "name": obj.name,
                     "type": obj.type,
                     "location": [obj.location.x, obj.location.y, obj.location.z],
@@ -804,15 +3265,15 @@ class BlenderMCPServer:
                 }
             except Exception as e:
                 return {"succeed": False, "error": str(e)}
-                
-        except Exception as e:
-            return {"succeed": False, "error": str(e)}
+        
+        # The download runs off the main thread so the UI and other commands are not blocked
+        return Deferred(download, finish)
 
     @staticmethod
     def _clean_imported_glb(filepath, mesh_name=None):
         """Clean up an imported GLB file by removing empty parent nodes and renaming the mesh"""
         # Get the set of existing objects before import
-        existing_objects = set(bpy.data.objects)
+        import_mark = scene_index.mark()
 
         # Import the GLB file
         bpy.ops.import_scene.gltf(filepath=filepath)
@@ -821,7 +3282,7 @@ class BlenderMCPServer:
         bpy.context.view_layer.update()
         
         # Get all imported objects
-        imported_objects = list(set(bpy.data.objects) - existing_objects)
+        imported_objects = scene_index.added_since(import_mark)
         
         if not imported_objects:
             print("Error: No objects were imported.")
@@ -883,7 +3344,7 @@ class BlenderMCPServer:
             file_ext = os.path.splitext(filepath)[1].lower()
             
             # Get existing objects before import
-            existing_objects = set(bpy.data.objects)
+            import_mark = scene_index.mark()
             
             # Import the file based on its extension
             if file_ext in ['.glb', '.gltf']:
@@ -898,9 +3359,10 @@ class BlenderMCPServer:
                     data_to.objects = data_from.objects
                 
                 # Link the objects to the scene
+                collection = bpy.context.view_layer.active_layer_collection.collection
                 for obj in data_to.objects:
                     if obj is not None:
-                        bpy.context.collection.objects.link(obj)
+                        collection.objects.link(obj)
             else:
                 return {"succeed": False, "error": f"Unsupported file format: {file_ext}"}
             
@@ -908,7 +3370,7 @@ class BlenderMCPServer:
             bpy.context.view_layer.update()
             
             # Get newly imported objects
-            imported_objects = list(set(bpy.data.objects) - existing_objects)
+            imported_objects = scene_index.added_since(import_mark)
             
             if not imported_objects:
                 return {"succeed": False, "error": "No objects were imported"}
@@ -922,15 +3384,16 @@ class BlenderMCPServer:
                 bpy.context.view_layer.objects.active = imported_objects[0]
             
             # If a name is provided, rename the active object
-            if name and bpy.context.active_object:
-                bpy.context.active_object.name = name
-                if bpy.context.active_object.data:
-                    bpy.context.active_object.data.name = name
+            active_object = bpy.context.view_layer.objects.active
+            if name and active_object:
+                active_object.name = name
+                if active_object.data:
+                    active_object.data.name = name
             
             # Compile results
             result = {
                 "imported_objects": [obj.name for obj in imported_objects],
-                "active_object": bpy.context.active_object.name if bpy.context.active_object else None,
+                "active_object": active_object.name if active_object else None,
                 "filepath": filepath
             }
             
@@ -982,7 +3445,7 @@ class BlenderMCPServer:
         print(f"Request data: {data}")
         
         # Make the API request to CSM.ai
-        response = requests.post(
+        response = http_client.post(
             'https://api.csm.ai/image-to-3d-sessions/session-search/vector-search',
             headers=headers,
             json=data
@@ -1018,13 +3481,16 @@ class BlenderMCPServer:
             "models": data.get('data', [])
         }
 
-    def get_correct_tier(self, api_key=None, get_key_only=False):
+    def get_correct_tier(self, api_key=None, get_key_only=False, refresh=False, with_key=False):
         """
         Checks the tier of a CSM.ai user using their API key.
         
         Args:
             api_key: The CSM.ai API key (if None, gets it from Blender)
             get_key_only: If True, just return the API key directly
+            refresh: If True, ignore the cached tier and ask CSM.ai again
+            with_key: If True, return both as {"api_key": ..., "tier": ...}; tier is
+                None when get_key_only is also True
             
         Returns:
             str: The user's tier information or "free" on error,
@@ -1036,53 +3502,11 @@ class BlenderMCPServer:
             
         # If we just need the key, return it now
         if get_key_only:
-            return api_key
-            
-        url = "https://api.csm.ai/user/userdata"
-        
-        # Set up the headers with the x-api-key
-        headers = {
-            'Accept': '*/*',
-            'Content-Type': 'application/json',
-            'x-platform': 'web',
-            'x-api-key': api_key
-        }
-        
-        print(f"Checking user tier with API key: {api_key[:5]}...")
+            return {"api_key": api_key, "tier": None} if with_key else api_key
         
-        try:
-            response = requests.get(url, headers=headers)
-            print(f"Response status code: {response.status_code}")
-            
-            if response.status_code == 200:
-                response_json = response.json()
-                print("User data retrieved successfully")
-                
-                # Extract data from the nested structure
-                if "data" in response_json:
-                    user_data = response_json["data"]
-                    
-                    # Extract tier information
-                    tier = user_data.get("tier", "free")
-                    print(f"User tier: {tier}")
-                    
-                    # IMPORTANT: Always use the detected tier if private assets are enabled
-                    if bpy.context.scene.blendermcp_csm_use_private_assets and tier != "free":
-                        print(f"Private assets enabled, using actual tier: {tier}")
-                        return tier
-                    else:
-                        return tier
-                else:
-                    print("Error: 'data' field not found in response")
-                    return "free"
-            else:
-                print(f"Error: {response.status_code}")
-                print(f"Response: {response.text}")
-                return "free"
-            
-        except Exception as e:
-            print(f"Exception during API request: {e}")
-            return "free"
+        # Tiers practically never change, so lookups are served from the cache
+        tier = tier_cache.get(api_key, refresh=refresh) or "free"
+        return {"api_key": api_key, "tier": tier} if with_key else tier
 
     def test_claude_search(self, search_text="blue car", limit=10):
         """
@@ -1098,6 +3522,14 @@ class BlenderMCPServer:
         
         return result
 
+    @staticmethod
+    def _find_backup(object_name, backup_collection):
+        """The hidden backup copy of an object in the backup collection, or None"""
+        backup_obj = scene_index.get(f"{object_name}_backup")
+        if backup_obj is not None and backup_collection in scene_index.collections_of(backup_obj):
+            return backup_obj
+        return None
+
     def animate_object(self, object_name, animation_prompt, temp_format="glb", handle_original="hide", collection_name=None):
         """
         Animate an object using the animation API
@@ -1118,17 +3550,13 @@ class BlenderMCPServer:
             import requests
             
             # Check if the object exists
-            obj = bpy.data.objects.get(object_name)
+            obj = scene_index.get(object_name)
             if not obj:
                 # Try to find a backup of the object in the special backup collection
                 backup_obj = None
                 backup_collection = bpy.data.collections.get("MCP_Backup_Meshes")
                 if backup_collection:
-                    backup_obj_name = f"{object_name}_backup"
-                    for o in backup_collection.objects:
-                        if o.name == backup_obj_name:
-                            backup_obj = o
-                            break
+                    backup_obj = self._find_backup(object_name, backup_collection)
                 
                 if backup_obj:
                     print(f"Using backup mesh for {object_name}")
@@ -1162,11 +3590,7 @@ class BlenderMCPServer:
             
             # Check if we already have a backup of this mesh
             backup_obj_name = f"{object_name}_backup"
-            backup_obj = None
-            for o in backup_collection.objects:
-                if o.name == backup_obj_name:
-                    backup_obj = o
-                    break
+            backup_obj = self._find_backup(object_name, backup_collection)
             
             # Flag to track if we're using the original object or a potentially hidden one
             using_original = (obj.name == object_name and not obj.hide_viewport)
@@ -1188,7 +3612,10 @@ class BlenderMCPServer:
                     for i, material_slot in enumerate(obj.material_slots):
                         if i >= len(backup_obj.material_slots):
                             backup_obj.data.materials.append(None)
-                        if material_slot.material:
+                        # Data-linked materials come with the shared data; writing them through
+                        # the backup's slots would edit the mesh, which may be a cached primitive
+                        if material_slot.material and material_slot.link == 'OBJECT':
+                            backup_obj.material_slots[i].link = 'OBJECT'
                             backup_obj.material_slots[i].material = material_slot.material
                 
                 # Add to backup collection
@@ -1227,7 +3654,8 @@ class BlenderMCPServer:
                 temp_mesh_path = os.path.join(temp_dir, f"{object_name}_temp.{temp_format}")
                 
                 # Select only the export object
-                bpy.ops.object.select_all(action='DESELECT')
+                for selected in bpy.context.view_layer.objects.selected:
+                    selected.select_set(False)
                 export_obj.select_set(True)
                 bpy.context.view_layer.objects.active = export_obj
                 
@@ -1300,7 +3728,7 @@ class BlenderMCPServer:
                 
                 # Send request and stream response to file
                 print(f"Sending animation request for prompt: '{animation_prompt}'...")
-                resp = requests.post(server_url, json=payload, headers=headers, stream=True)
+                resp = http_client.post(server_url, json=payload, headers=headers, stream=True)
                 
                 if resp.status_code != 200:
                     error_text = resp.text
@@ -1330,20 +3758,17 @@ class BlenderMCPServer:
                 original_collection = None
                 
                 # Find the original object's collection(s)
-                for coll in bpy.data.collections:
-                    if obj.name in coll.objects:
-                        original_collection = coll
-                        break
+                original_collection = next(iter(scene_index.collections_of(obj)), None)
                 
                 # Import the animated file
                 # First store current objects to determine which are new
-                existing_objects = set(bpy.data.objects)
+                import_mark = scene_index.mark()
                 
                 # Import the animated FBX
                 bpy.ops.import_scene.fbx(filepath=output_fbx_path)
                 
                 # Get new objects
-                imported_objects = list(set(bpy.data.objects) - existing_objects)
+                imported_objects = scene_index.added_since(import_mark)
                 
                 if not imported_objects:
                     return {
@@ -1428,20 +3853,29 @@ class BLENDERMCP_PT_Panel(bpy.types.Panel):
         layout = self.layout
         scene = context.scene
         
-        layout.prop(scene, "blendermcp_port")
+        layout.prop(scene, "blendermcp_transport")
+        if scene.blendermcp_transport == 'UNIX':
+            layout.prop(scene, "blendermcp_socket_path")
+        else:
+            layout.prop(scene, "blendermcp_port")
+        layout.prop(scene, "blendermcp_tick_budget_ms")
 
         # Add CSM.ai section
         layout.prop(scene, "blendermcp_use_csm", text="Use CSM.ai 3D models")
         if scene.blendermcp_use_csm:
             layout.prop(scene, "blendermcp_csm_api_key", text="API Key")
             layout.prop(scene, "blendermcp_csm_use_private_assets", text="Include Private Assets")
+            layout.prop(scene, "blendermcp_csm_persist_search_cache")
             layout.operator("blendermcp.get_csm_api_key", text="Get API Key", icon='URL')
         
         if not scene.blendermcp_server_running:
             layout.operator("blendermcp.start_server", text="Start MCP Server")
         else:
             layout.operator("blendermcp.stop_server", text="Stop MCP Server")
-            layout.label(text=f"Running on port {scene.blendermcp_port}")
+            if scene.blendermcp_transport == 'UNIX':
+                layout.label(text=f"Running on {scene.blendermcp_socket_path}")
+            else:
+                layout.label(text=f"Running on port {scene.blendermcp_port}")
 
 # Operator to start the server
 class BLENDERMCP_OT_StartServer(bpy.types.Operator):
@@ -1454,7 +3888,14 @@ class BLENDERMCP_OT_StartServer(bpy.types.Operator):
         
         # Create a new server instance
         if not hasattr(bpy.types, "blendermcp_server") or not bpy.types.blendermcp_server:
-            bpy.types.blendermcp_server = BlenderMCPServer(port=scene.blendermcp_port)
+            unix_path = None
+            if scene.blendermcp_transport == 'UNIX':
+                unix_path = bpy.path.abspath(scene.blendermcp_socket_path)
+            bpy.types.blendermcp_server = BlenderMCPServer(
+                port=scene.blendermcp_port,
+                tick_budget_ms=scene.blendermcp_tick_budget_ms,
+                unix_path=unix_path
+            )
         
         # Start the server
         bpy.types.blendermcp_server.start()
@@ -1512,6 +3953,31 @@ def register():
         max=65535
     )
     
+    bpy.types.Scene.blendermcp_transport = EnumProperty(
+        name="Transport",
+        description="How the MCP server connects to Blender",
+        items=[
+            ('TCP', "TCP", "Listen on localhost:<port> (tcp://localhost:<port>)"),
+            ('UNIX', "Unix Socket", "Listen on a Unix domain socket file (unix://<path>), faster and private to your user"),
+        ],
+        default='TCP'
+    )
+    
+    bpy.types.Scene.blendermcp_socket_path = StringProperty(
+        name="Socket Path",
+        description="Unix domain socket for the BlenderMCP server; start blender-mcp with --endpoint unix://<path>",
+        default=os.path.join(tempfile.gettempdir(), "blender-mcp.sock"),
+        subtype='FILE_PATH'
+    )
+    
+    bpy.types.Scene.blendermcp_tick_budget_ms = bpy.props.FloatProperty(
+        name="Tick Budget (ms)",
+        description="Main-thread time spent running MCP commands before yielding to the UI",
+        default=8.0,
+        min=1.0,
+        max=100.0
+    )
+    
     bpy.types.Scene.blendermcp_server_running = bpy.props.BoolProperty(
         name="Server Running",
         default=False
@@ -1527,7 +3993,8 @@ def register():
         name="CSM API Key",
         subtype="PASSWORD",
         description="API Key for CSM.ai",
-        default=""
+        default="",
+        update=_csm_api_key_update
     )
     
     bpy.types.Scene.blendermcp_csm_use_private_assets = bpy.props.BoolProperty(
@@ -1536,11 +4003,23 @@ def register():
         default=True
     )
     
+    bpy.types.Scene.blendermcp_csm_persist_search_cache = bpy.props.BoolProperty(
+        name="Keep Search Results on Disk",
+        description="Store CSM.ai search results in the user cache directory so they are reused across sessions",
+        default=True
+    )
+    
     bpy.utils.register_class(BLENDERMCP_PT_Panel)
     bpy.utils.register_class(BLENDERMCP_OT_StartServer)
     bpy.utils.register_class(BLENDERMCP_OT_StopServer)
     bpy.utils.register_class(BLENDERMCP_OT_GetCSMAPIKey)
     
+    for handler_name, handler in SCENE_INDEX_HANDLERS:
+        handlers = getattr(bpy.app.handlers, handler_name)
+        if handler not in handlers:
+            handlers.append(handler)
+    scene_index.invalidate("addon started")
+    
     print("BlenderMCP addon registered")
 
 def unregister():
@@ -1554,13 +4033,44 @@ def unregister():
     bpy.utils.unregister_class(BLENDERMCP_OT_StopServer)
     bpy.utils.unregister_class(BLENDERMCP_OT_GetCSMAPIKey)
     
+    for handler_name, handler in SCENE_INDEX_HANDLERS:
+        handlers = getattr(bpy.app.handlers, handler_name)
+        if handler in handlers:
+            handlers.remove(handler)
+    http_client.close()
+    
     del bpy.types.Scene.blendermcp_port
+    del bpy.types.Scene.blendermcp_transport
+    del bpy.types.Scene.blendermcp_socket_path
+    del bpy.types.Scene.blendermcp_tick_budget_ms
     del bpy.types.Scene.blendermcp_server_running
     del bpy.types.Scene.blendermcp_use_csm
     del bpy.types.Scene.blendermcp_csm_api_key
     del bpy.types.Scene.blendermcp_csm_use_private_assets
+    del bpy.types.Scene.blendermcp_csm_persist_search_cache
 
     print("BlenderMCP addon unregistered")
 
+def run_background_server(argv):
+    """Serve MCP commands from a headless worker: blender -b --python addon.py -- --port 9877
+    (or -- --endpoint unix:///tmp/blender-mcp.sock)"""
+    parser = argparse.ArgumentParser(prog="addon.py")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=9876)
+    parser.add_argument("--endpoint", help="tcp://host:port or unix:///path, overrides --host and --port")
+    args = parser.parse_args(argv)
+    
+    host, port, unix_path = args.host, args.port, None
+    if args.endpoint:
+        try:
+            host, port, unix_path = parse_endpoint(args.endpoint)
+        except ValueError as e:
+            parser.error(str(e))
+    server = BlenderMCPServer(host=host, port=port, unix_path=unix_path)
+    bpy.types.blendermcp_server = server
+    server.serve_forever()
+
 if __name__ == "__main__":
     register()
+    if bpy.app.background:
+        run_background_server(sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
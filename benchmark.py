@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Compare the round-trip latency and throughput of Blender addon transports.
+
+Start one Blender per transport (or one Blender, then restart it on the other transport)
+and pass their endpoints, e.g.:
+
+    python benchmark.py tcp://localhost:9876 unix:///tmp/blender-mcp.sock --mesh Cube
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+from blender_mcp.server import BlenderConnection, parse_endpoint
+
+def measure(connection, command_type, params, count):
+    """Latencies in milliseconds of count sequential commands, after a short warm-up"""
+    for _ in range(min(count, 10)):
+        connection.send_command(command_type, params)
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        connection.send_command(command_type, params)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def report(endpoint, name, latencies, payload_bytes=0):
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    line = f"{endpoint:<40} {name:<16} p50 {p50:8.3f} ms   p99 {p99:8.3f} ms"
+    if payload_bytes:
+        line += f"   {payload_bytes / (p50 / 1000) / 1e6:8.1f} MB/s"
+    print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("endpoints", nargs="+", help="tcp://host:port or unix:///path")
+    parser.add_argument("--count", type=int, default=1000, help="round trips per measurement")
+    parser.add_argument("--mesh", help="also transfer the geometry of this mesh object with get_mesh_data")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    for endpoint in args.endpoints:
+        connection = BlenderConnection(**parse_endpoint(endpoint))
+        if not connection.connect():
+            print(f"{endpoint:<40} could not connect")
+            continue
+        try:
+            # ping is answered by the addon's client thread: transport cost only
+            report(endpoint, "ping", measure(connection, "ping", {}, args.count))
+            # get_scene_info also waits for Blender's main thread
+            report(endpoint, "get_scene_info", measure(connection, "get_scene_info", {"limit": 10}, args.count))
+            if args.mesh:
+                params = {"name": args.mesh}
+                result = connection.send_command("get_mesh_data", params)
+                size = sum(value.nbytes for value in result.values() if isinstance(value, memoryview))
+                report(endpoint, "get_mesh_data", measure(connection, "get_mesh_data", params, max(args.count // 10, 10)), size)
+        finally:
+            connection.disconnect()
+
+if __name__ == "__main__":
+    main()
@@ -2,25 +2,368 @@
 from mcp.server.fastmcp import FastMCP, Context, Image
 import socket
 import json
+import argparse
 import asyncio
+import atexit
+import collections
+import itertools
 import logging
-from dataclasses import dataclass
+import mmap
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
 from contextlib import asynccontextmanager
 from typing import AsyncIterator, Dict, Any, List
 import os
+import re
 import requests
+import secrets
+import shutil
+import struct
+import sys
+import tempfile
 import time
+import urllib.parse
+import zlib
+from pathlib import Path
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("BlenderMCPServer")
 
+# Wire protocol shared with the addon. Every message is a fixed header followed by
+# the JSON payload: magic (4s) | version (B) | flags (B) | reserved (H) | length (Q)
+PROTOCOL_MAGIC = b"BMCP"
+PROTOCOL_VERSION = 1
+FRAME_HEADER = struct.Struct("!4sBBHQ")
+MAX_PAYLOAD_SIZE = 1 << 32
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+# Frame flag: the payload is one chunk of a streamed reply and more frames follow. The chunk
+# is NDJSON whose first line is {"id": <request id>}; the final frame is a normal response.
+FLAG_PARTIAL = 0x01
+# Frame flag: the payload is a JSON document followed by binary attachments. Layout:
+# JSON length (I) | JSON | blobs. Results reference them as {"$attachment", "dtype", "shape",
+# "offset", "length"}, with offsets relative to the start of the blobs (little-endian data).
+FLAG_ATTACHMENTS = 0x02
+ATTACHMENT_HEADER = struct.Struct("!I")
+ATTACHMENT_FORMATS = {"float32": "f", "float64": "d", "int32": "i", "uint32": "I", "uint8": "B"}
+# Frame flag (with FLAG_ATTACHMENTS): the blobs are not in the frame but in a file of the shared
+# memory directory, described by the "shared" member of the JSON as {"handle", "offset", "length"}
+FLAG_SHARED = 0x04
+# Frame flag: the payload is compressed: codec (B) | uncompressed length (Q) | compressed data.
+# The addon compresses JSON responses and stream chunks above the threshold sent in the handshake.
+FLAG_COMPRESSED = 0x08
+COMPRESSION_HEADER = struct.Struct("!BQ")
+CODEC_IDS = {"zlib": 1, "lz4": 2}
+try:
+    import lz4.frame
+    COMPRESSION_CODECS = ["lz4", "zlib"]  # In order of preference
+except ImportError:
+    COMPRESSION_CODECS = ["zlib"]
+# "auto" compresses only when Blender runs on another host: over loopback and Unix sockets
+# moving the bytes costs less than compressing them. "always" or "off" override it.
+COMPRESSION_MODE = os.environ.get("BLENDER_MCP_COMPRESSION", "auto")
+COMPRESSION_THRESHOLD = int(os.environ.get("BLENDER_MCP_COMPRESSION_THRESHOLD", "16384"))
+# The async connection decompresses larger frames on a worker thread to keep the event loop free
+THREADED_DECOMPRESSION_SIZE = 1 << 20
+
+# The addon that background workers run; the default works for a source checkout
+DEFAULT_ADDON_PATH = os.environ.get(
+    "BLENDER_MCP_ADDON_PATH",
+    str(Path(__file__).resolve().parents[2] / "addon.py")
+)
+
+def _recv_exactly(sock, size):
+    """Receive exactly size bytes into a preallocated buffer"""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], min(size - received, 1 << 20))
+        if count == 0:
+            raise ConnectionError("Connection closed while receiving a message")
+        received += count
+    return buffer
+
+def _send_frame(sock, payload: bytes, flags: int = 0):
+    """Send one framed message"""
+    header = _frame_header(payload, flags)
+    if len(payload) <= 65536:
+        sock.sendall(header + payload)
+    else:
+        # Avoid copying large payloads just to prepend the header
+        sock.sendall(header)
+        sock.sendall(payload)
+
+def _frame_header(payload: bytes, flags: int = 0) -> bytes:
+    """Build the header for one framed message"""
+    return FRAME_HEADER.pack(PROTOCOL_MAGIC, PROTOCOL_VERSION, flags, 0, len(payload))
+
+def _parse_frame_header(header) -> tuple:
+    """Validate a frame header and return (flags, payload length)"""
+    magic, version, flags, _, length = FRAME_HEADER.unpack(header)
+    if magic != PROTOCOL_MAGIC:
+        raise ValueError(f"Invalid message header from Blender: {bytes(magic)!r}")
+    if version > PROTOCOL_VERSION:
+        raise ValueError(f"Unsupported protocol version from Blender: {version}")
+    if length > MAX_PAYLOAD_SIZE:
+        raise ValueError(f"Message from Blender is too large: {length} bytes")
+    return flags, length
+
+class DecompressionStats:
+    """Counters for the compressed frames received from Blender"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.frames = 0
+        self.compressed_bytes = 0
+        self.uncompressed_bytes = 0
+        self.seconds = 0.0
+    
+    def record(self, compressed: int, uncompressed: int, seconds: float):
+        with self.lock:
+            self.frames += 1
+            self.compressed_bytes += compressed
+            self.uncompressed_bytes += uncompressed
+            self.seconds += seconds
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "frames": self.frames,
+                "compressed_bytes": self.compressed_bytes,
+                "uncompressed_bytes": self.uncompressed_bytes,
+                "ratio": round(self.uncompressed_bytes / self.compressed_bytes, 3) if self.compressed_bytes else None,
+                "cpu_ms": round(self.seconds * 1000, 3),
+            }
+
+decompression_stats = DecompressionStats()
+
+def _decompress(flags: int, payload) -> tuple:
+    """Undo FLAG_COMPRESSED, returning (flags, payload)"""
+    if not flags & FLAG_COMPRESSED:
+        return flags, payload
+    start = time.perf_counter()
+    codec, length = COMPRESSION_HEADER.unpack_from(payload)
+    if length > MAX_PAYLOAD_SIZE:
+        raise ValueError(f"Message from Blender is too large: {length} bytes")
+    data = memoryview(payload)[COMPRESSION_HEADER.size:]
+    # Inflate at most one byte past the declared length, so a bad frame cannot exhaust memory
+    if codec == CODEC_IDS["zlib"]:
+        result = zlib.decompressobj().decompress(data, length + 1)
+    elif codec == CODEC_IDS["lz4"] and "lz4" in COMPRESSION_CODECS:
+        result = lz4.frame.LZ4FrameDecompressor().decompress(data, max_length=length + 1)
+    else:
+        raise ValueError(f"Unsupported compression codec from Blender: {codec}")
+    if len(result) != length:
+        raise ValueError(f"Corrupt compressed message from Blender: {len(result)} of {length} bytes")
+    decompression_stats.record(len(payload), length, time.perf_counter() - start)
+    return flags & ~FLAG_COMPRESSED, result
+
+def _recv_frame(sock):
+    """Receive one framed message and return (flags, payload)"""
+    flags, length = _parse_frame_header(_recv_exactly(sock, FRAME_HEADER.size))
+    return _decompress(flags, _recv_exactly(sock, length))
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+class SharedMemoryArea:
+    """Directory of memory-mapped files that a Blender addon on this host writes large replies into.
+    
+    Instead of sending attachments over the socket, the addon writes them into a new file here
+    and sends only its handle. The server maps the file and unlinks it right away, so the data
+    lives exactly as long as the memoryviews over it, even if the server dies while using it.
+    Files are named <addon pid>-<connection>-<n>.bin; files of an addon that died before the
+    server mapped them are swept on disconnect, and the directories of dead servers at startup.
+    The directory is offered in the handshake and the addon proves it can see it (i.e. runs on
+    the same host) by reading back a token. POSIX only.
+    """
+    
+    PREFIX = "blender-mcp-shm-"
+    
+    def __init__(self, threshold: int):
+        self.threshold = threshold
+        self.path = None
+        self.token = None
+        self.files_mapped = 0
+        self.bytes_mapped = 0
+        self.files_swept = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return os.name == "posix" and self.threshold > 0
+    
+    @staticmethod
+    def _root() -> str:
+        # tmpfs keeps the files in memory; fall back to the temp directory elsewhere
+        if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+            return "/dev/shm"
+        return tempfile.gettempdir()
+    
+    def offer(self) -> Dict[str, Any]:
+        """Handshake parameters that let the addon use this directory"""
+        if self.path is None:
+            root = self._root()
+            self._sweep_dead_servers(root)
+            path = os.path.join(root, f"{self.PREFIX}{os.getpid()}")
+            os.makedirs(path, mode=0o700, exist_ok=True)
+            self.token = secrets.token_hex(16)
+            with open(os.path.join(path, "token"), "w") as f:
+                f.write(self.token)
+            self.path = path
+            atexit.register(self.close)
+        return {"path": self.path, "token": self.token, "threshold": self.threshold}
+    
+    def open(self, handle: str, offset: int, length: int) -> memoryview:
+        """Map one file written by the addon and remove its name"""
+        if self.path is None or os.path.basename(handle) != handle or not handle.endswith(".bin"):
+            raise ValueError(f"Invalid shared memory handle from Blender: {handle!r}")
+        path = os.path.join(self.path, handle)
+        with open(path, "rb") as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            finally:
+                os.unlink(path)
+        self.files_mapped += 1
+        self.bytes_mapped += length
+        return memoryview(mapped)[offset:offset + length]
+    
+    def sweep(self):
+        """Remove files left behind by addons that are no longer running"""
+        if self.path is None:
+            return
+        for name in os.listdir(self.path):
+            pid = name.split("-", 1)[0]
+            if name.endswith(".bin") and pid.isdigit() and not _pid_alive(int(pid)):
+                try:
+                    os.unlink(os.path.join(self.path, name))
+                    self.files_swept += 1
+                except FileNotFoundError:
+                    pass
+    
+    def _sweep_dead_servers(self, root: str):
+        for name in os.listdir(root):
+            pid = name[len(self.PREFIX):]
+            if name.startswith(self.PREFIX) and pid.isdigit() and not _pid_alive(int(pid)):
+                shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+    
+    def close(self):
+        if self.path:
+            shutil.rmtree(self.path, ignore_errors=True)
+            self.path = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "path": self.path,
+            "threshold": self.threshold,
+            "files_mapped": self.files_mapped,
+            "bytes_mapped": self.bytes_mapped,
+            "files_swept": self.files_swept,
+        }
+
+shared_memory = SharedMemoryArea(int(os.environ.get("BLENDER_MCP_SHARED_MEMORY_THRESHOLD", str(1 << 20))))
+
+def _attachment_view(blobs: memoryview, ref: Dict[str, Any]) -> memoryview:
+    """A view of one attachment, typed and shaped when the format allows it"""
+    view = blobs[ref["offset"]:ref["offset"] + ref["length"]]
+    fmt = ATTACHMENT_FORMATS.get(ref.get("dtype"))
+    # Attachments are little-endian; on other hosts hand out the raw bytes
+    if fmt and sys.byteorder == "little":
+        view = view.cast(fmt, ref.get("shape") or [len(view) // struct.calcsize(fmt)])
+    return view
+
+def _decode_payload(flags: int, payload) -> Dict[str, Any]:
+    """Parse a frame payload; binary attachments become memoryviews over the payload (no copies)"""
+    if not flags & FLAG_ATTACHMENTS:
+        return json.loads(payload)
+    (length,) = ATTACHMENT_HEADER.unpack_from(payload)
+    start = ATTACHMENT_HEADER.size
+    view = memoryview(payload)
+    response = json.loads(bytes(view[start:start + length]))
+    if flags & FLAG_SHARED:
+        blobs = shared_memory.open(**response.pop("shared"))
+    else:
+        blobs = view[start + length:]
+    result = response.get("result")
+    if isinstance(result, dict):
+        for key, value in result.items():
+            if isinstance(value, dict) and "$attachment" in value:
+                result[key] = _attachment_view(blobs, value)
+    return response
+
+def parse_endpoint(endpoint: str) -> Dict[str, Any]:
+    """Connection arguments for an endpoint of the form tcp://host:port or unix:///path"""
+    scheme, separator, rest = endpoint.partition("://")
+    if scheme == "unix" and separator and rest:
+        return {"host": "localhost", "port": 0, "unix_path": rest}
+    if scheme == "tcp" and separator:
+        host, _, port = rest.rpartition(":")
+        if host and port.isdigit():
+            return {"host": host.strip("[]"), "port": int(port), "unix_path": None}
+    raise ValueError(f"Invalid Blender endpoint {endpoint!r}, expected tcp://host:port or unix:///path")
+
+def _handshake_command(local: bool) -> bytes:
+    """The handshake is sent as raw JSON so that legacy addons can answer it"""
+    params = {"protocol_version": PROTOCOL_VERSION}
+    if shared_memory.enabled and local:
+        try:
+            params["shared_memory"] = shared_memory.offer()
+        except OSError as e:
+            logger.warning(f"Shared memory transport unavailable: {str(e)}")
+    if COMPRESSION_MODE == "always" or (COMPRESSION_MODE == "auto" and not local):
+        params["compression"] = {"codecs": COMPRESSION_CODECS, "threshold": COMPRESSION_THRESHOLD}
+    return json.dumps({"type": "handshake", "params": params}).encode('utf-8')
+
+def _parse_handshake(response: Dict[str, Any]) -> tuple:
+    """Return (framed, features) from the addon's handshake response"""
+    # Old addons reply with an "Unknown command type" error
+    result = response.get("result") if response.get("status") == "success" else None
+    if isinstance(result, dict) and result.get("protocol_version", 0) >= 1:
+        features = set(result.get("features", []))
+        logger.info(f"Using framed protocol version {result['protocol_version']} (features: {sorted(features)}, "
+                    f"compression: {result.get('compression') or 'none'})")
+        return True, features
+    logger.info("Blender addon does not support framing, using legacy JSON protocol")
+    return False, set()
+
+def _chunk_request_id(payload) -> int:
+    """Request id from the envelope line of a partial (streamed) frame"""
+    end = payload.find(b"\n")
+    return json.loads(payload[:end if end >= 0 else len(payload)]).get("id")
+
 @dataclass
 class BlenderConnection:
     host: str
     port: int
+    unix_path: str = None  # Connect to this Unix domain socket instead of host:port
     sock: socket.socket = None  # Changed from 'socket' to 'sock' to avoid naming conflict
+    framed: bool = False  # Negotiated on connect; False means the legacy raw JSON protocol
+    pipelined: bool = False  # The addon echoes request ids, so many commands can be in flight
+    _send_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _lockstep_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _pending: Dict[int, Future] = field(default_factory=dict, init=False, repr=False)
+    _pending_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    # The socket whose reader thread is running; cleared under _pending_lock when it stops,
+    # after which no request may be registered for it
+    _reader_sock: socket.socket = field(default=None, init=False, repr=False)
+    _request_ids: Any = field(default_factory=lambda: itertools.count(1), init=False, repr=False)
+    
+    @property
+    def endpoint(self) -> str:
+        return f"unix://{self.unix_path}" if self.unix_path else f"tcp://{self.host}:{self.port}"
+    
+    @property
+    def local(self) -> bool:
+        return bool(self.unix_path) or self.host in LOCAL_HOSTS
     
     def connect(self) -> bool:
         """Connect to the Blender addon socket server"""
@@ -28,14 +371,32 @@ class BlenderConnection:
             return True
             
         try:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.connect((self.host, self.port))
-            logger.info(f"Connected to Blender at {self.host}:{self.port}")
+            if self.unix_path:
+                self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.sock.connect(self.unix_path)
+            else:
+                self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                self.sock.connect((self.host, self.port))
+            logger.info(f"Connected to Blender at {self.endpoint}")
+            self._negotiate_protocol()
+            if self.pipelined:
+                with self._pending_lock:
+                    self._reader_sock = self.sock
+                threading.Thread(target=self._reader_loop, args=(self.sock,), daemon=True).start()
             return True
         except Exception as e:
             logger.error(f"Failed to connect to Blender: {str(e)}")
-            self.sock = None
+            self.disconnect()
             return False
+
+    def _negotiate_protocol(self):
+        """Ask the addon for framed messages, falling back to raw JSON for old addons"""
+        self.framed = self.pipelined = False
+        self.sock.sendall(_handshake_command(self.local))
+        response = json.loads(self.receive_full_response(self.sock).decode('utf-8'))
+        self.framed, features = _parse_handshake(response)
+        self.pipelined = "request_ids" in features
     
     def disconnect(self):
         """Disconnect from the Blender addon"""
@@ -46,9 +407,46 @@ class BlenderConnection:
                 logger.error(f"Error disconnecting from Blender: {str(e)}")
             finally:
                 self.sock = None
+                self.framed = False
+                self.pipelined = False
+                shared_memory.sweep()
+
+    def _reader_loop(self, sock):
+        """Route responses to their waiting callers by request id until the socket closes"""
+        try:
+            while True:
+                flags, payload = _recv_frame(sock)
+                if flags & FLAG_PARTIAL:
+                    # Streams are only requested through AsyncBlenderConnection
+                    continue
+                response = _decode_payload(flags, payload)
+                with self._pending_lock:
+                    future = self._pending.pop(response.get("id"), None)
+                if future is None:
+                    logger.warning(f"Dropping response for unknown request id: {response.get('id')}")
+                    continue
+                future.set_result(response)
+        except Exception as e:
+            if self.sock is sock:
+                logger.error(f"Socket connection error during receive: {str(e)}")
+                self.disconnect()
+            else:
+                try:
+                    sock.close()
+                except OSError:
+                    pass
+            error = ConnectionError(f"Connection to Blender lost: {str(e)}")
+            with self._pending_lock:
+                if self._reader_sock is not sock:
+                    # A newer connection's reader owns the pending requests
+                    return
+                self._reader_sock = None
+                pending, self._pending = self._pending, {}
+            for future in pending.values():
+                future.set_exception(error)
 
     def receive_full_response(self, sock, buffer_size=8192):
-        """Receive the complete response, potentially in multiple chunks"""
+        """Receive a complete legacy (unframed) JSON response, potentially in multiple chunks"""
         chunks = []
         # Remove timeout to wait indefinitely like in test_animation.py
         sock.settimeout(None)
@@ -103,9 +501,287 @@ class BlenderConnection:
         else:
             raise Exception("No data received")
 
+    def submit_command(self, command_type: str, params: Dict[str, Any] = None) -> Future:
+        """Send a command to Blender without waiting; the future resolves to the raw response.
+        
+        When the addon supports request ids many commands can be in flight on this socket and
+        replies may arrive in any order. Older addons are served one command at a time.
+        """
+        if not self.sock and not self.connect():
+            raise ConnectionError("Not connected to Blender")
+        
+        command = {
+            "type": command_type,
+            "params": params or {}
+        }
+        
+        # Log the command being sent
+        logger.info(f"Sending command: {command_type} with params: {params}")
+        
+        if not self.pipelined:
+            future = Future()
+            try:
+                future.set_result(self._send_lockstep(command))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        
+        sock = self.sock
+        request_id = next(self._request_ids)
+        command["id"] = request_id
+        future = Future()
+        with self._pending_lock:
+            # Once the reader has failed the pending requests, a new one would never be answered
+            if sock is None or self._reader_sock is not sock:
+                raise ConnectionError("Connection to Blender lost")
+            self._pending[request_id] = future
+        
+        try:
+            with self._send_lock:
+                _send_frame(sock, json.dumps(command).encode('utf-8'))
+        except Exception as e:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+            logger.error(f"Socket connection error: {str(e)}")
+            self.disconnect()
+            raise Exception(f"Connection to Blender lost: {str(e)}")
+        return future
+
     def send_command(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         """Send a command to Blender and return the response"""
-        if not self.sock and not self.connect():
+        try:
+            response = self.submit_command(command_type, params).result(timeout=RESPONSE_TIMEOUT)
+        except ConnectionError as e:
+            raise Exception(str(e))
+        except FutureTimeoutError:
+            raise Exception(f"No response from Blender to {command_type} within {RESPONSE_TIMEOUT:g} seconds")
+        logger.info(f"Response parsed, status: {response.get('status', 'unknown')}")
+        
+        if response.get("status") == "error":
+            logger.error(f"Blender error: {response.get('message')}")
+            raise Exception(response.get("message", "Unknown error from Blender"))
+        
+        return response.get("result", {})
+
+    def _send_lockstep(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one command and block until its response arrives (no request ids)"""
+        with self._lockstep_lock:
+            try:
+                # IMPORTANT: Don't set a timeout - this will allow it to wait indefinitely like test_animation.py
+                # For long-running operations like animation we want to wait as long as needed for the complete response.
+                self.sock.settimeout(None)
+                
+                # Send the command and receive the response
+                payload = json.dumps(command).encode('utf-8')
+                flags = 0
+                if self.framed:
+                    _send_frame(self.sock, payload)
+                    logger.info(f"Command sent, waiting for response...")
+                    flags, response_data = _recv_frame(self.sock)
+                else:
+                    self.sock.sendall(payload)
+                    logger.info(f"Command sent, waiting for response...")
+                    response_data = self.receive_full_response(self.sock)
+                logger.info(f"Received {len(response_data)} bytes of data")
+                
+                return _decode_payload(flags, response_data)
+            except socket.timeout:
+                logger.error("Socket timeout while waiting for response from Blender")
+                # Don't try to reconnect here - let the get_blender_connection handle reconnection
+                # Just invalidate the current socket so it will be recreated next time
+                self.sock = None
+                raise Exception("Timeout waiting for Blender response - animation processing may take longer than expected. Check Blender for results.")
+            except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
+                logger.error(f"Socket connection error: {str(e)}")
+                self.sock = None
+                raise Exception(f"Connection to Blender lost: {str(e)}")
+            except json.JSONDecodeError as e:
+                logger.error(f"Invalid JSON response from Blender: {str(e)}")
+                # Try to log what was received
+                if 'response_data' in locals() and response_data:
+                    logger.error(f"Raw response (first 200 bytes): {response_data[:200]}")
+                raise Exception(f"Invalid response from Blender: {str(e)}")
+            except Exception as e:
+                logger.error(f"Error communicating with Blender: {str(e)}")
+                # Don't try to reconnect here - let the get_blender_connection handle reconnection
+                self.sock = None
+                raise Exception(f"Communication error with Blender: {str(e)}")
+
+@dataclass
+class AsyncBlenderConnection:
+    """asyncio-streams connection to the Blender addon that concurrent tools can share.
+    
+    Waiting for a reply never blocks the event loop, and at most max_in_flight commands are
+    outstanding on the socket at once. When heartbeat_interval is set, an idle connection is
+    pinged so that a dead socket is noticed before the next tool call needs it.
+    """
+    host: str
+    port: int
+    unix_path: str = None  # Connect to this Unix domain socket instead of host:port
+    max_in_flight: int = 8
+    heartbeat_interval: float = 0.0
+    framed: bool = False  # Negotiated on connect; False means the legacy raw JSON protocol
+    pipelined: bool = False  # The addon echoes request ids, so many commands can be in flight
+    streaming: bool = False  # The addon can stream large results as NDJSON chunks
+    reader: asyncio.StreamReader = field(default=None, init=False, repr=False)
+    writer: asyncio.StreamWriter = field(default=None, init=False, repr=False)
+    _read_task: asyncio.Task = field(default=None, init=False, repr=False)
+    _heartbeat_task: asyncio.Task = field(default=None, init=False, repr=False)
+    _last_activity: float = field(default=0.0, init=False, repr=False)
+    _pending: Dict[int, asyncio.Future] = field(default_factory=dict, init=False, repr=False)
+    _streams: Dict[int, asyncio.Queue] = field(default_factory=dict, init=False, repr=False)
+    _request_ids: Any = field(default_factory=lambda: itertools.count(1), init=False, repr=False)
+    _write_lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False, repr=False)
+    _lockstep_lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False, repr=False)
+    _semaphore: asyncio.Semaphore = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+    @property
+    def connected(self) -> bool:
+        return self.writer is not None and not self.writer.is_closing()
+
+    @property
+    def endpoint(self) -> str:
+        return f"unix://{self.unix_path}" if self.unix_path else f"tcp://{self.host}:{self.port}"
+
+    @property
+    def local(self) -> bool:
+        return bool(self.unix_path) or self.host in LOCAL_HOSTS
+
+    async def connect(self) -> bool:
+        """Connect to the Blender addon socket server"""
+        if self.connected:
+            return True
+        
+        try:
+            if self.unix_path:
+                self.reader, self.writer = await asyncio.open_unix_connection(self.unix_path)
+            else:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            logger.info(f"Connected to Blender at {self.endpoint}")
+            
+            self.writer.write(_handshake_command(self.local))
+            await self.writer.drain()
+            response = json.loads(await self._read_legacy_response())
+            self.framed, features = _parse_handshake(response)
+            self.pipelined = "request_ids" in features
+            self.streaming = self.pipelined and "stream" in features
+            
+            if self.pipelined:
+                self._read_task = asyncio.create_task(self._read_loop(self.reader))
+            self._last_activity = time.monotonic()
+            if self.heartbeat_interval > 0:
+                self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+            return True
+        except Exception as e:
+            logger.error(f"Failed to connect to Blender: {str(e)}")
+            await self.disconnect()
+            return False
+
+    async def disconnect(self):
+        """Disconnect from the Blender addon"""
+        for task in (self._read_task, self._heartbeat_task):
+            if task and task is not asyncio.current_task():
+                task.cancel()
+        self._read_task = self._heartbeat_task = None
+        
+        writer, self.reader, self.writer = self.writer, None, None
+        self.framed = self.pipelined = self.streaming = False
+        if writer:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception as e:
+                logger.error(f"Error disconnecting from Blender: {str(e)}")
+        shared_memory.sweep()
+
+    async def _read_legacy_response(self) -> bytearray:
+        """Read one unframed JSON document"""
+        buffer = bytearray()
+        while True:
+            chunk = await self.reader.read(8192)
+            if not chunk:
+                raise ConnectionError("Connection closed before receiving a complete response")
+            buffer += chunk
+            try:
+                json.loads(buffer)
+                return buffer
+            except ValueError:
+                # Incomplete JSON, continue receiving
+                continue
+
+    @staticmethod
+    async def _read_frame(reader: asyncio.StreamReader) -> tuple:
+        """Read one framed message and return (flags, payload)"""
+        flags, length = _parse_frame_header(await reader.readexactly(FRAME_HEADER.size))
+        payload = await reader.readexactly(length)
+        if flags & FLAG_COMPRESSED and length >= THREADED_DECOMPRESSION_SIZE:
+            return await asyncio.to_thread(_decompress, flags, payload)
+        return _decompress(flags, payload)
+
+    def _write_frame(self, payload: bytes, flags: int = 0):
+        self.writer.write(_frame_header(payload, flags))
+        self.writer.write(payload)
+
+    async def _read_loop(self, reader: asyncio.StreamReader):
+        """Route responses to their waiting callers by request id until the stream closes"""
+        error = ConnectionError("Connection to Blender closed")
+        try:
+            while True:
+                flags, payload = await self._read_frame(reader)
+                if flags & FLAG_PARTIAL:
+                    chunks = self._streams.get(_chunk_request_id(payload))
+                    if chunks is not None:
+                        chunks.put_nowait(payload)
+                    continue
+                response = _decode_payload(flags, payload)
+                chunks = self._streams.pop(response.get("id"), None)
+                if chunks is not None:
+                    chunks.put_nowait(response)
+                    continue
+                future = self._pending.pop(response.get("id"), None)
+                if future is None:
+                    logger.warning(f"Dropping response for unknown request id: {response.get('id')}")
+                elif not future.done():
+                    future.set_result(response)
+        except asyncio.IncompleteReadError:
+            logger.error("Blender closed the connection")
+            error = ConnectionError("Connection to Blender lost: connection closed by Blender")
+        except Exception as e:
+            logger.error(f"Socket connection error during receive: {str(e)}")
+            error = ConnectionError(f"Connection to Blender lost: {str(e)}")
+        finally:
+            if self.reader is reader:
+                await self.disconnect()
+            pending, self._pending = self._pending, {}
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            streams, self._streams = self._streams, {}
+            for chunks in streams.values():
+                chunks.put_nowait(error)
+
+    async def _heartbeat_loop(self):
+        """Ping Blender whenever the connection has been idle for a full interval"""
+        while self.connected:
+            await asyncio.sleep(self.heartbeat_interval)
+            idle = time.monotonic() - self._last_activity >= self.heartbeat_interval
+            busy = self._pending or self._streams or self._lockstep_lock.locked()
+            if not idle or busy:
+                continue
+            try:
+                await self.send_command("ping")
+            except Exception as e:
+                # Old addons answer with an unknown command error, which still proves liveness.
+                # Connection errors have already closed the connection.
+                if not self.connected:
+                    logger.warning(f"Heartbeat failed, connection to Blender closed: {str(e)}")
+
+    async def send_command(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Send a command to Blender and return the response"""
+        if not self.connected and not await self.connect():
             raise ConnectionError("Not connected to Blender")
         
         command = {
@@ -113,52 +789,363 @@ class BlenderConnection:
             "params": params or {}
         }
         
+        # Log the command being sent
+        logger.info(f"Sending command: {command_type} with params: {params}")
+        
+        async with self._semaphore:
+            if self.pipelined:
+                response = await self._send_pipelined(command)
+            else:
+                response = await self._send_lockstep(command)
+        self._last_activity = time.monotonic()
+        logger.info(f"Response parsed, status: {response.get('status', 'unknown')}")
+        
+        if response.get("status") == "error":
+            logger.error(f"Blender error: {response.get('message')}")
+            raise Exception(response.get("message", "Unknown error from Blender"))
+        
+        return response.get("result", {})
+
+    async def stream_command(self, command_type: str, params: Dict[str, Any] = None) -> "CommandStream":
+        """Send a command whose result the addon streams; iterate the returned CommandStream.
+        
+        Only available when the handshake reported streaming support (see the streaming flag).
+        The stream holds one of the max_in_flight slots until it is exhausted or closed.
+        """
+        if not self.connected and not await self.connect():
+            raise ConnectionError("Not connected to Blender")
+        if not self.streaming:
+            raise Exception("The Blender addon does not support streamed results")
+        
+        request_id = next(self._request_ids)
+        command = {
+            "type": command_type,
+            "params": params or {},
+            "id": request_id,
+        }
+        logger.info(f"Sending streamed command: {command_type} with params: {params}")
+        
+        await self._semaphore.acquire()
+        chunks = asyncio.Queue()
+        self._streams[request_id] = chunks
         try:
-            # Log the command being sent
-            logger.info(f"Sending command: {command_type} with params: {params}")
-            
-            # Send the command
-            self.sock.sendall(json.dumps(command).encode('utf-8'))
-            logger.info(f"Command sent, waiting for response...")
-            
-            # IMPORTANT: Don't set a timeout - this will allow it to wait indefinitely like test_animation.py
-            # The socket already has a timeout set at connect time, but for long-running operations like animation,
-            # we want to wait as long as needed for the complete response.
-            self.sock.settimeout(None)
-            
-            # Receive the response using the improved receive_full_response method
-            response_data = self.receive_full_response(self.sock)
-            logger.info(f"Received {len(response_data)} bytes of data")
-            
-            response = json.loads(response_data.decode('utf-8'))
-            logger.info(f"Response parsed, status: {response.get('status', 'unknown')}")
-            
-            if response.get("status") == "error":
-                logger.error(f"Blender error: {response.get('message')}")
-                raise Exception(response.get("message", "Unknown error from Blender"))
-            
-            return response.get("result", {})
-        except socket.timeout:
-            logger.error("Socket timeout while waiting for response from Blender")
-            # Don't try to reconnect here - let the get_blender_connection handle reconnection
-            # Just invalidate the current socket so it will be recreated next time
-            self.sock = None
-            raise Exception("Timeout waiting for Blender response - animation processing may take longer than expected. Check Blender for results.")
-        except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
+            async with self._write_lock:
+                self._write_frame(json.dumps(command).encode('utf-8'))
+                await self.writer.drain()
+        except Exception as e:
+            self._end_stream(request_id)
             logger.error(f"Socket connection error: {str(e)}")
-            self.sock = None
+            await self.disconnect()
             raise Exception(f"Connection to Blender lost: {str(e)}")
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON response from Blender: {str(e)}")
-            # Try to log what was received
-            if 'response_data' in locals() and response_data:
-                logger.error(f"Raw response (first 200 bytes): {response_data[:200]}")
-            raise Exception(f"Invalid response from Blender: {str(e)}")
+        self._last_activity = time.monotonic()
+        return CommandStream(chunks, on_close=lambda: self._end_stream(request_id))
+
+    def _end_stream(self, request_id: int):
+        """Stop routing chunks to a stream and free its in-flight slot"""
+        self._streams.pop(request_id, None)
+        self._semaphore.release()
+
+    async def _send_pipelined(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        request_id = next(self._request_ids)
+        command["id"] = request_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        
+        try:
+            async with self._write_lock:
+                self._write_frame(json.dumps(command).encode('utf-8'))
+                await self.writer.drain()
         except Exception as e:
-            logger.error(f"Error communicating with Blender: {str(e)}")
-            # Don't try to reconnect here - let the get_blender_connection handle reconnection
-            self.sock = None
-            raise Exception(f"Communication error with Blender: {str(e)}")
+            self._pending.pop(request_id, None)
+            logger.error(f"Socket connection error: {str(e)}")
+            await self.disconnect()
+            raise Exception(f"Connection to Blender lost: {str(e)}")
+        
+        try:
+            return await future
+        except ConnectionError as e:
+            raise Exception(str(e))
+        finally:
+            # Forget the request if the caller was cancelled before the reply arrived
+            self._pending.pop(request_id, None)
+
+    async def _send_lockstep(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one command and wait for its response (no request ids)"""
+        async with self._lockstep_lock:
+            try:
+                payload = json.dumps(command).encode('utf-8')
+                flags = 0
+                if self.framed:
+                    self._write_frame(payload)
+                    await self.writer.drain()
+                    flags, response_data = await self._read_frame(self.reader)
+                else:
+                    self.writer.write(payload)
+                    await self.writer.drain()
+                    response_data = await self._read_legacy_response()
+                logger.info(f"Received {len(response_data)} bytes of data")
+                return _decode_payload(flags, response_data)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                logger.error(f"Socket connection error: {str(e)}")
+                await self.disconnect()
+                raise Exception(f"Connection to Blender lost: {str(e)}")
+            except json.JSONDecodeError as e:
+                logger.error(f"Invalid JSON response from Blender: {str(e)}")
+                raise Exception(f"Invalid response from Blender: {str(e)}")
+            except Exception as e:
+                logger.error(f"Error communicating with Blender: {str(e)}")
+                await self.disconnect()
+                raise Exception(f"Communication error with Blender: {str(e)}")
+
+class CommandStream:
+    """Async iterator over the records of a streamed reply.
+    
+    Records are decoded from the NDJSON chunks as they arrive. Once iteration finishes,
+    result holds the summary from the final response. Call aclose() when giving up on a
+    stream before it is exhausted.
+    """
+    
+    def __init__(self, chunks: asyncio.Queue, on_close=None):
+        self._chunks = chunks
+        self._records = collections.deque()
+        self._done = False
+        self._on_close = on_close
+        self.result = None
+    
+    def __aiter__(self):
+        return self
+    
+    def _finish(self):
+        self._done = True
+        on_close, self._on_close = self._on_close, None
+        if on_close is not None:
+            on_close()
+    
+    async def aclose(self):
+        """Stop reading the stream; records that arrive later are dropped"""
+        self._records.clear()
+        self._finish()
+    
+    async def __anext__(self) -> Dict[str, Any]:
+        while not self._records:
+            if self._done:
+                raise StopAsyncIteration
+            try:
+                item = await self._chunks.get()
+            except BaseException:
+                # Cancelled while waiting: nobody will read the rest of the stream
+                self._finish()
+                raise
+            if isinstance(item, Exception):
+                self._finish()
+                raise Exception(str(item))
+            if isinstance(item, dict):
+                self._finish()
+                if item.get("status") == "error":
+                    logger.error(f"Blender error: {item.get('message')}")
+                    raise Exception(item.get("message", "Unknown error from Blender"))
+                self.result = item.get("result", {})
+                continue
+            # Skip the envelope line that carries the request id
+            lines = bytes(item).splitlines()[1:]
+            self._records.extend(json.loads(line) for line in lines if line)
+        return self._records.popleft()
+
+@dataclass
+class BlenderWorker:
+    """One headless Blender process managed by BlenderWorkerPool"""
+    port: int
+    process: asyncio.subprocess.Process = None
+    connection: AsyncBlenderConnection = None
+    state: str = "stopped"  # stopped, starting, idle, busy or dead
+    restarts: int = 0
+    jobs_completed: int = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+class BlenderWorkerPool:
+    """Launches and supervises background Blender processes (blender -b) for independent jobs.
+    
+    Each worker runs the addon on its own port and handles one job at a time. Jobs borrow an
+    idle worker with acquire(); crashed or unresponsive workers are restarted by the supervisor.
+    """
+
+    def __init__(self, size: int, blender_executable: str = "blender", addon_path: str = None,
+                 base_port: int = 9877, health_interval: float = 10.0, startup_timeout: float = 60.0):
+        self.blender_executable = blender_executable
+        self.addon_path = addon_path or DEFAULT_ADDON_PATH
+        self.health_interval = health_interval
+        self.startup_timeout = startup_timeout
+        self.workers = [BlenderWorker(port=base_port + i) for i in range(size)]
+        self.scratch_dir = None
+        self.running = False
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._queued: set = set()  # Ports of the workers that have an entry in _idle
+        self._restarts: Dict[int, asyncio.Task] = {}  # Port -> restart in progress
+        self._supervisor: asyncio.Task = None
+
+    async def start(self):
+        """Launch all workers and start supervising them"""
+        self.running = True
+        self.scratch_dir = tempfile.mkdtemp(prefix="blender_mcp_workers_")
+        await asyncio.gather(*(self._restart(worker) for worker in self.workers))
+        self._supervisor = asyncio.create_task(self._supervise())
+        logger.info(f"Worker pool started with {self.ready_count} of {len(self.workers)} workers ready")
+
+    async def stop(self):
+        """Terminate all workers and remove their scratch files"""
+        self.running = False
+        if self._supervisor:
+            self._supervisor.cancel()
+            self._supervisor = None
+        for task in self._restarts.values():
+            task.cancel()
+        self._restarts.clear()
+        await asyncio.gather(*(self._terminate(worker) for worker in self.workers))
+        if self.scratch_dir:
+            shutil.rmtree(self.scratch_dir, ignore_errors=True)
+            self.scratch_dir = None
+        logger.info("Worker pool stopped")
+
+    @property
+    def ready_count(self) -> int:
+        return sum(1 for worker in self.workers if worker.state in ("idle", "busy"))
+
+    @property
+    def idle_count(self) -> int:
+        return sum(1 for worker in self.workers if worker.state == "idle")
+
+    def scratch_path(self, suffix: str) -> str:
+        """A fresh file path in the pool's scratch directory, visible to all processes on this host"""
+        handle, path = tempfile.mkstemp(suffix=suffix, dir=self.scratch_dir)
+        os.close(handle)
+        return path
+
+    @asynccontextmanager
+    async def acquire(self, timeout: float = None) -> AsyncIterator[AsyncBlenderConnection]:
+        """Borrow an idle worker's connection for the duration of one job"""
+        if not self.running or self.ready_count == 0:
+            raise RuntimeError("No Blender workers are available")
+        
+        async def next_idle():
+            while True:
+                worker = await self._idle.get()
+                self._queued.discard(worker.port)
+                # Entries for workers that died or restarted while queued are stale
+                if worker.state == "idle" and worker.alive:
+                    # Claimed before returning, so no other acquirer can take it in between
+                    worker.state = "busy"
+                    return worker
+        
+        worker = await asyncio.wait_for(next_idle(), timeout)
+        try:
+            yield worker.connection
+            worker.jobs_completed += 1
+        finally:
+            if worker.alive and worker.connection.connected:
+                self._make_idle(worker)
+            else:
+                worker.state = "dead"
+
+    def _make_idle(self, worker: BlenderWorker):
+        """Mark a worker idle and queue it, at most once"""
+        worker.state = "idle"
+        if worker.port not in self._queued:
+            self._queued.add(worker.port)
+            self._idle.put_nowait(worker)
+
+    async def _spawn(self, worker: BlenderWorker):
+        worker.state = "starting"
+        worker.process = await asyncio.create_subprocess_exec(
+            self.blender_executable, "-b", "--factory-startup", "--python", self.addon_path,
+            "--", "--port", str(worker.port),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        worker.connection = AsyncBlenderConnection(host="localhost", port=worker.port, max_in_flight=1)
+        
+        # Wait for the addon inside the worker to start listening
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if not worker.alive:
+                raise RuntimeError(f"Blender worker on port {worker.port} exited with code {worker.process.returncode}")
+            try:
+                _, writer = await asyncio.open_connection("localhost", worker.port)
+                writer.close()
+                break
+            except OSError:
+                await asyncio.sleep(0.5)
+        else:
+            raise RuntimeError(f"Blender worker on port {worker.port} did not start in {self.startup_timeout}s")
+        
+        if not await worker.connection.connect():
+            raise RuntimeError(f"Could not connect to Blender worker on port {worker.port}")
+        self._make_idle(worker)
+        logger.info(f"Blender worker ready on port {worker.port} (pid {worker.process.pid})")
+
+    async def _terminate(self, worker: BlenderWorker):
+        worker.state = "stopped"
+        if worker.connection:
+            await worker.connection.disconnect()
+        if worker.alive:
+            worker.process.terminate()
+            try:
+                await asyncio.wait_for(worker.process.wait(), 5.0)
+            except asyncio.TimeoutError:
+                worker.process.kill()
+                await worker.process.wait()
+
+    async def _restart(self, worker: BlenderWorker):
+        await self._terminate(worker)
+        try:
+            await self._spawn(worker)
+        except Exception as e:
+            logger.error(f"Failed to start Blender worker on port {worker.port}: {str(e)}")
+            await self._terminate(worker)
+            worker.state = "dead"
+
+    async def _supervise(self):
+        """Health-check the workers and restart the ones that crashed or stopped answering"""
+        while self.running:
+            await asyncio.sleep(self.health_interval)
+            for worker in self.workers:
+                if worker.port in self._restarts:
+                    continue
+                if worker.state == "idle":
+                    try:
+                        await asyncio.wait_for(worker.connection.send_command("ping"), self.health_interval)
+                    except Exception as e:
+                        logger.warning(f"Blender worker on port {worker.port} failed its health check: {str(e)}")
+                        worker.state = "dead"
+                elif worker.state == "busy" and not worker.alive:
+                    worker.state = "dead"
+                
+                if worker.state == "dead" or (worker.state == "idle" and not worker.alive):
+                    logger.warning(f"Restarting Blender worker on port {worker.port}")
+                    worker.restarts += 1
+                    # A slow startup must not hold up the checks of the other workers
+                    task = asyncio.create_task(self._restart(worker))
+                    self._restarts[worker.port] = task
+                    task.add_done_callback(lambda _, port=worker.port: self._restarts.pop(port, None))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self.workers),
+            "ready": self.ready_count,
+            "idle": self.idle_count,
+            "workers": [
+                {
+                    "port": worker.port,
+                    "pid": worker.process.pid if worker.process else None,
+                    "state": worker.state,
+                    "restarts": worker.restarts,
+                    "jobs_completed": worker.jobs_completed,
+                }
+                for worker in self.workers
+            ],
+        }
 
 @asynccontextmanager
 async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
@@ -173,17 +1160,35 @@ async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
         # Try to connect to Blender on startup to verify it's available
         try:
             # This will initialize the global connection if needed
-            blender = get_blender_connection()
+            blender = await get_async_blender_connection()
             logger.info("Successfully connected to Blender on startup")
         except Exception as e:
             logger.warning(f"Could not connect to Blender on startup: {str(e)}")
             logger.warning("Make sure the Blender addon is running before using Blender resources or tools")
         
+        # Workers take a while to boot; tools use the primary Blender until they are ready
+        global _worker_pool, _worker_pool_startup
+        if WORKER_COUNT > 0:
+            _worker_pool = BlenderWorkerPool(
+                WORKER_COUNT,
+                blender_executable=BLENDER_EXECUTABLE,
+                base_port=WORKER_BASE_PORT
+            )
+            _worker_pool_startup = asyncio.create_task(_worker_pool.start())
+        
         # Return an empty context - we're using the global connection
         yield {}
     finally:
-        # Clean up the global connection on shutdown
-        global _blender_connection
+        # Clean up the global connections on shutdown
+        global _blender_connection, _async_blender_connection
+        if _worker_pool:
+            _worker_pool_startup.cancel()
+            await _worker_pool.stop()
+            _worker_pool = None
+        if _async_blender_connection:
+            logger.info("Disconnecting from Blender on shutdown")
+            await _async_blender_connection.disconnect()
+            _async_blender_connection = None
         if _blender_connection:
             logger.info("Disconnecting from Blender on shutdown")
             _blender_connection.disconnect()
@@ -197,58 +1202,243 @@ mcp = FastMCP(
     lifespan=server_lifespan
 )
 
+# Keep-alive session for the CSM.ai calls the server makes itself (the addon pools its own),
+# so repeated searches reuse an open TCP/TLS connection instead of a new handshake each time
+CSM_API_TIMEOUT = (10, 60)  # (connect, read) seconds
+csm_session = requests.Session()
+csm_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
 # Resource endpoints
 
 # Global connection for resources (since resources can't access context)
 _blender_connection = None
 _csm_enabled = False  # Add this global variable
+_csm_checked_at = None  # time.monotonic() of the last CSM.ai status check
+CSM_STATUS_TTL = float(os.environ.get("BLENDER_MCP_CSM_STATUS_TTL", "30"))
+
+# Connection shared by the (async) MCP tools
+# Where the Blender addon listens: tcp://host:port or unix:///path/to/socket
+BLENDER_ENDPOINT = os.environ.get("BLENDER_MCP_ENDPOINT", "tcp://localhost:9876")
+_async_blender_connection = None
+_async_connection_lock = asyncio.Lock()
+MAX_IN_FLIGHT = int(os.environ.get("BLENDER_MCP_MAX_IN_FLIGHT", "8"))
+HEARTBEAT_INTERVAL = float(os.environ.get("BLENDER_MCP_HEARTBEAT_INTERVAL", "15"))
+# Upper bound for one synchronous command; generous, as animations and renders take minutes
+RESPONSE_TIMEOUT = float(os.environ.get("BLENDER_MCP_RESPONSE_TIMEOUT", "3600"))
+
+# Optional pool of headless Blender workers for imports, renders and exports
+_worker_pool = None
+_worker_pool_startup = None
+WORKER_COUNT = int(os.environ.get("BLENDER_MCP_WORKERS", "0"))
+WORKER_BASE_PORT = int(os.environ.get("BLENDER_MCP_WORKER_BASE_PORT", "9877"))
+BLENDER_EXECUTABLE = os.environ.get("BLENDER_EXECUTABLE", "blender")
+# Seconds to wait for a worker to become idle before running the job on the primary Blender
+WORKER_ACQUIRE_TIMEOUT = float(os.environ.get("BLENDER_MCP_WORKER_ACQUIRE_TIMEOUT", "10"))
 
 def get_blender_connection():
     """Get or create a persistent Blender connection"""
-    global _blender_connection, _csm_enabled
+    global _blender_connection
     
-    # If we have an existing connection, check if it's still valid
-    if _blender_connection is not None:
-        try:
-            # Check if CSM.ai is enabled
-            result = _blender_connection.send_command("get_csm_status")
-            _csm_enabled = result.get("enabled", False)
-            
-            return _blender_connection
-        except Exception as e:
-            # Connection is dead, close it and create a new one
-            logger.warning(f"Existing connection is no longer valid: {str(e)}")
-            try:
-                _blender_connection.disconnect()
-            except:
-                pass
-            _blender_connection = None
-    
-    # Create a new connection if needed
+    # A connection that failed is dropped by send_command and reconnected on the next call,
+    # so an existing connection can be returned without a health-check round trip
     if _blender_connection is None:
-        _blender_connection = BlenderConnection(host="localhost", port=9876)
+        _blender_connection = BlenderConnection(**parse_endpoint(BLENDER_ENDPOINT))
         if not _blender_connection.connect():
             logger.error("Failed to connect to Blender")
             _blender_connection = None
             raise Exception("Could not connect to Blender. Make sure the Blender addon is running.")
         logger.info("Created new persistent connection to Blender")
-        
-        # Check integrations status
-        try:
-            result = _blender_connection.send_command("get_csm_status")
-            _csm_enabled = result.get("enabled", False)
-        except Exception as e:
-            logger.warning(f"Failed to check integration status: {str(e)}")
     
     return _blender_connection
 
+async def get_async_blender_connection():
+    """Get or create the persistent Blender connection shared by the MCP tools"""
+    global _async_blender_connection
+    
+    # The reader task and heartbeat close a dead connection, so a connected one can be
+    # used as is: a tool call costs exactly one round trip
+    connection = _async_blender_connection
+    if connection is not None and connection.connected:
+        return connection
+    
+    # Only one caller (re)connects, the others wait for it
+    async with _async_connection_lock:
+        if _async_blender_connection is None:
+            _async_blender_connection = AsyncBlenderConnection(
+                **parse_endpoint(BLENDER_ENDPOINT),
+                max_in_flight=MAX_IN_FLIGHT,
+                heartbeat_interval=HEARTBEAT_INTERVAL,
+            )
+        connection = _async_blender_connection
+        if not connection.connected:
+            # The addon state may have changed while we were disconnected
+            invalidate_csm_status()
+            if not await connection.connect():
+                logger.error("Failed to connect to Blender")
+                raise Exception("Could not connect to Blender. Make sure the Blender addon is running.")
+            logger.info("Created new persistent connection to Blender")
+    
+    return connection
+
+def invalidate_csm_status():
+    """Forget the cached CSM.ai integration status"""
+    global _csm_enabled, _csm_checked_at
+    _csm_enabled = False
+    _csm_checked_at = None
+
+async def get_csm_enabled(blender: AsyncBlenderConnection, refresh: bool = False) -> bool:
+    """Return whether CSM.ai is enabled in Blender, asking the addon at most once per TTL"""
+    global _csm_enabled, _csm_checked_at
+    
+    expired = _csm_checked_at is None or time.monotonic() - _csm_checked_at > CSM_STATUS_TTL
+    if refresh or expired:
+        result = await blender.send_command("get_csm_status")
+        _csm_enabled = result.get("enabled", False)
+        _csm_checked_at = time.monotonic()
+    return _csm_enabled
+
+def workers_available() -> bool:
+    """Whether jobs can be offloaded to the worker pool: a worker is idle right now"""
+    return _worker_pool is not None and _worker_pool.idle_count > 0
+
+async def run_on_scene_snapshot(blender: AsyncBlenderConnection, command_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a read-only command in a worker against a saved copy of the primary scene
+    
+    Runs it on the primary Blender instead when no worker becomes idle within WORKER_ACQUIRE_TIMEOUT,
+    when no worker is left, or when the worker is lost during the job. Errors from the primary
+    Blender's save_blend are raised.
+    """
+    blend_path = _worker_pool.scratch_path(".blend")
+    try:
+        async with _worker_pool.acquire(WORKER_ACQUIRE_TIMEOUT) as worker:
+            await blender.send_command("save_blend", {"filepath": blend_path})
+            try:
+                await worker.send_command("open_blend", {"filepath": blend_path})
+                return await worker.send_command(command_type, params)
+            except Exception as e:
+                # An error from a live worker would happen in the primary Blender too
+                if worker.connected:
+                    raise
+                reason = f"Blender worker lost during {command_type}: {str(e)}"
+    except asyncio.TimeoutError:
+        # Only acquire() times out; commands have no timeout of their own
+        reason = "No Blender worker became idle"
+    except RuntimeError as e:
+        # acquire() found the pool stopped or every worker dead
+        reason = str(e)
+    finally:
+        if os.path.exists(blend_path):
+            os.remove(blend_path)
+    
+    logger.warning(f"{reason}, running {command_type} in the primary Blender")
+    return await blender.send_command(command_type, params)
+
+async def import_csm_model_via_worker(blender: AsyncBlenderConnection, model_id: str, mesh_url_glb: str, name: str = None) -> Dict[str, Any]:
+    """Download and clean up a CSM.ai model in a worker, then append it to the primary scene"""
+    blend_path = _worker_pool.scratch_path(".blend")
+    try:
+        # Raises TimeoutError when every worker stays busy; the caller then imports in the primary Blender
+        async with _worker_pool.acquire(WORKER_ACQUIRE_TIMEOUT) as worker:
+            await worker.send_command("clear_scene")
+            result = await worker.send_command("import_csm_model", {
+                "model_id": model_id,
+                "mesh_url_glb": mesh_url_glb,
+                "name": name
+            })
+            if not (isinstance(result, dict) and result.get("succeed", False)):
+                return result
+            await worker.send_command("save_blend", {"filepath": blend_path, "names": [result["name"]]})
+        
+        merged = await blender.send_command("import_file", {"filepath": blend_path})
+        if not merged.get("succeed", False):
+            return {"succeed": False, "error": merged.get("error", "Failed to merge the imported model")}
+        
+        # The appended object is renamed if the name is already taken in the primary scene
+        result["name"] = merged.get("active_object") or result["name"]
+        return result
+    finally:
+        if os.path.exists(blend_path):
+            os.remove(blend_path)
+
 
 @mcp.tool()
-def get_scene_info(ctx: Context) -> str:
-    """Get detailed information about the current Blender scene"""
+async def get_scene_info(
+    ctx: Context,
+    cursor: str = None,
+    limit: int = None,
+    types: List[str] = None,
+    collection: str = None,
+    name_pattern: str = None,
+    visible: bool = None,
+    fields: List[str] = None,
+    stream: bool = False,
+    output_path: str = None
+) -> str:
+    """
+    Get detailed information about the current Blender scene.
+    
+    Objects are listed in name order, one page at a time. Pass the returned next_cursor
+    as cursor to get the next page; next_cursor is null on the last page.
+    
+    Parameters:
+    - cursor: Optional next_cursor from the previous page
+    - limit: Maximum number of objects per page (default 100)
+    - types: Optional object types to include, e.g. ["MESH", "LIGHT"]
+    - collection: Optional collection name; only objects in it (or its children)
+    - name_pattern: Optional glob on object names, e.g. "Tree_*"
+    - visible: Optional; True for visible objects only, False for hidden ones only
+    - fields: Optional object fields to return (name, type, location, rotation, scale,
+      dimensions, visible, parent, collections, data, materials, mesh). Default: name, type, location
+    - stream: Write every matching object from the cursor on to an NDJSON file, one object
+      per line, as Blender sends them. Returns the file path, the object count and the summary.
+      Use for very large listings.
+    - output_path: Optional file for stream mode (default: a new file in the temp directory)
+    """
     try:
-        blender = get_blender_connection()
-        result = blender.send_command("get_scene_info")
+        blender = await get_async_blender_connection()
+        # Only the options that were set, so older addons (whose get_scene_info takes no
+        # parameters) keep working with the defaults
+        params = {}
+        for key, value in (("cursor", cursor), ("limit", limit), ("types", types), ("collection", collection),
+                           ("name_pattern", name_pattern), ("visible", visible), ("fields", fields)):
+            if value is not None:
+                params[key] = value
+        
+        if stream:
+            if blender.streaming:
+                # Everything from the cursor on, unless a limit was given
+                records = await blender.stream_command("get_scene_info", {"limit": None, **params, "stream": True})
+            elif params:
+                raise Exception("Streaming with a cursor, limit, filters or fields needs the updated Blender addon")
+            else:
+                # Older addons can neither stream nor filter; list the scene in one response instead
+                summary = await blender.send_command("get_scene_info")
+                records = summary.pop("objects", [])
+            
+            try:
+                if output_path:
+                    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+                else:
+                    handle, output_path = tempfile.mkstemp(prefix="blender_scene_", suffix=".ndjson")
+                    os.close(handle)
+                count = 0
+                with open(output_path, "w", encoding="utf-8") as f:
+                    if isinstance(records, CommandStream):
+                        async for record in records:
+                            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+                            count += 1
+                        summary = records.result
+                    else:
+                        for record in records:
+                            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+                            count += 1
+            finally:
+                # Frees the in-flight slot if writing the file failed part way
+                if isinstance(records, CommandStream):
+                    await records.aclose()
+            return json.dumps({"path": output_path, "count": count, "summary": summary}, indent=2)
+        
+        result = await blender.send_command("get_scene_info", params)
         
         # Just return the JSON representation of what Blender sent us
         return json.dumps(result, indent=2)
@@ -257,7 +1447,157 @@ def get_scene_info(ctx: Context) -> str:
         return f"Error getting scene info: {str(e)}"
 
 @mcp.tool()
-def get_object_info(ctx: Context, object_name: str) -> str:
+async def get_scene_changes(ctx: Context, since_revision: int) -> str:
+    """
+    Get what changed in the Blender scene since a revision, instead of re-reading the scene.
+    
+    get_scene_info and this tool return the current "revision"; pass it back next time.
+    Changes are "added", "removed", "renamed", "transformed", "geometry_changed" and
+    "material_changed" records, newest last. If "resync_required" is true the changes are no
+    longer available (too many changes, file reloaded, undo): call get_scene_info again.
+    
+    Parameters:
+    - since_revision: The revision returned by the previous get_scene_info or get_scene_changes call
+    """
+    try:
+        blender = await get_async_blender_connection()
+        result = await blender.send_command("get_scene_changes", {"since_revision": since_revision})
+        return json.dumps(result, separators=(",", ":"))
+    except Exception as e:
+        logger.error(f"Error getting scene changes from Blender: {str(e)}")
+        return f"Error getting scene changes: {str(e)}"
+
+@mcp.tool()
+async def get_bounds(
+    ctx: Context,
+    names: List[str] = None,
+    types: List[str] = None,
+    collection: str = None,
+    name_pattern: str = None,
+    mode: str = "box"
+) -> str:
+    """
+    Get the world-space bounding boxes of many objects at once.
+    
+    Much faster than get_object_info per object when checking placement or overlaps.
+    
+    Parameters:
+    - names: Optional object names; if omitted, all scene objects matching the filters
+    - types: Optional object types to include, e.g. ["MESH"]
+    - collection: Optional collection name
+    - name_pattern: Optional glob on object names
+    - mode: "box" (fast, default), "evaluated" (includes modifiers) or "tight" (exact
+      bounds of the evaluated mesh; slower, but not inflated by rotation)
+    
+    Returns "names", and matching "min" and "max" [x, y, z] lists, plus the overall "bounds".
+    """
+    try:
+        blender = await get_async_blender_connection()
+        params = {"mode": mode}
+        for key, value in (("names", names), ("types", types), ("collection", collection),
+                           ("name_pattern", name_pattern)):
+            if value is not None:
+                params[key] = value
+        result = await blender.send_command("get_bounds", params)
+        return json.dumps(result, separators=(",", ":"))
+    except Exception as e:
+        logger.error(f"Error getting bounds from Blender: {str(e)}")
+        return f"Error getting bounds: {str(e)}"
+
+@mcp.tool()
+async def find_objects_in_box(
+    ctx: Context,
+    min: List[float],
+    max: List[float],
+    contain: bool = False,
+    types: List[str] = None
+) -> str:
+    """
+    Find the objects whose bounding boxes intersect a world-space box.
+    
+    Use before placing an object to see what is already in the target region.
+    
+    Parameters:
+    - min: [x, y, z] minimum corner of the box
+    - max: [x, y, z] maximum corner of the box
+    - contain: If True, only objects entirely inside the box
+    - types: Optional object types to include, e.g. ["MESH"]
+    """
+    try:
+        blender = await get_async_blender_connection()
+        params = {"min": min, "max": max, "contain": contain}
+        if types:
+            params["types"] = types
+        result = await blender.send_command("find_objects_in_box", params)
+        return json.dumps(result, separators=(",", ":"))
+    except Exception as e:
+        logger.error(f"Error finding objects in box: {str(e)}")
+        return f"Error finding objects in box: {str(e)}"
+
+@mcp.tool()
+async def find_nearest_objects(
+    ctx: Context,
+    point: List[float],
+    k: int = 5,
+    types: List[str] = None,
+    max_distance: float = None
+) -> str:
+    """
+    Find the k objects closest to a point, measured to their bounding boxes.
+    
+    Parameters:
+    - point: [x, y, z] world-space point
+    - k: Number of objects to return
+    - types: Optional object types to include, e.g. ["MESH"]
+    - max_distance: Optional maximum distance
+    
+    Returns the objects with their distances, nearest first (0 means the point is inside the box).
+    """
+    try:
+        blender = await get_async_blender_connection()
+        params = {"point": point, "k": k}
+        if types:
+            params["types"] = types
+        if max_distance is not None:
+            params["max_distance"] = max_distance
+        result = await blender.send_command("find_nearest_objects", params)
+        return json.dumps(result, separators=(",", ":"))
+    except Exception as e:
+        logger.error(f"Error finding nearest objects: {str(e)}")
+        return f"Error finding nearest objects: {str(e)}"
+
+@mcp.tool()
+async def find_overlapping_objects(
+    ctx: Context,
+    types: List[str] = None,
+    names: List[str] = None,
+    margin: float = 0.0,
+    limit: int = 1000
+) -> str:
+    """
+    Find pairs of objects whose bounding boxes overlap, e.g. to check for clipping.
+    
+    Parameters:
+    - types: Optional object types to include, e.g. ["MESH"]
+    - names: Optional object names; only pairs involving one of them are returned
+    - margin: Ignore overlaps smaller than this on any axis (negative to include touching boxes)
+    - limit: Maximum number of pairs to return
+    """
+    try:
+        blender = await get_async_blender_connection()
+        params = {"margin": margin, "limit": limit}
+        if types:
+            params["types"] = types
+        if names:
+            params["names"] = names
+        result = await blender.send_command("find_overlapping_objects", params)
+        return json.dumps(result, separators=(",", ":"))
+    except Exception as e:
+        logger.error(f"Error finding overlapping objects: {str(e)}")
+        return f"Error finding overlapping objects: {str(e)}"
+
+@mcp.tool()
+async def get_object_info(ctx: Context, object_name: str) -> str:
     """
     Get detailed information about a specific object in the Blender scene.
     
@@ -265,8 +1605,8 @@ def get_object_info(ctx: Context, object_name: str) -> str:
     - object_name: The name of the object to get information about
     """
     try:
-        blender = get_blender_connection()
-        result = blender.send_command("get_object_info", {"name": object_name})
+        blender = await get_async_blender_connection()
+        result = await blender.send_command("get_object_info", {"name": object_name})
         
         # Just return the JSON representation of what Blender sent us
         return json.dumps(result, indent=2)
@@ -277,7 +1617,98 @@ def get_object_info(ctx: Context, object_name: str) -> str:
 
 
 @mcp.tool()
-def create_object(
+async def get_objects_info(
+    ctx: Context,
+    names: List[str] = None,
+    types: List[str] = None,
+    collection: str = None,
+    name_pattern: str = None,
+    visible: bool = None,
+    fields: List[str] = None
+) -> str:
+    """
+    Get information about many objects in one call instead of calling get_object_info repeatedly.
+    
+    Parameters:
+    - names: Optional object names; if omitted, all scene objects matching the filters
+    - types: Optional object types to include, e.g. ["MESH"]
+    - collection: Optional collection name
+    - name_pattern: Optional glob on object names
+    - visible: Optional; True for visible objects only, False for hidden ones only
+    - fields: Fields to return (name, type, location, rotation, scale, dimensions, visible,
+      parent, collections, data, materials, mesh, world_bounding_box). Default: name, type,
+      location, rotation, scale, visible. Only ask for materials, mesh and
+      world_bounding_box when needed; they cost more.
+    
+    Returns "columns": one list per field, in the same object order for every field.
+    """
+    try:
+        blender = await get_async_blender_connection()
+        params = {}
+        for key, value in (("names", names), ("types", types), ("collection", collection),
+                           ("name_pattern", name_pattern), ("visible", visible), ("fields", fields)):
+            if value is not None:
+                params[key] = value
+        result = await blender.send_command("get_objects_info", params)
+        return json.dumps(result, separators=(",", ":"))
+    except Exception as e:
+        logger.error(f"Error getting objects info from Blender: {str(e)}")
+        return f"Error getting objects info: {str(e)}"
+
+@mcp.tool()
+async def get_mesh_data(
+    ctx: Context,
+    object_name: str,
+    evaluated: bool = False,
+    attributes: List[str] = None,
+    output_dir: str = None
+) -> str:
+    """
+    Get the raw geometry of a mesh object as binary buffers (vertices, triangles, normals, uvs).
+    
+    Parameters:
+    - object_name: Name of the mesh object
+    - evaluated: Use the mesh with modifiers applied instead of the base mesh
+    - attributes: Buffers to fetch, any of "vertices", "triangles", "normals", "uvs" (default: all)
+    - output_dir: Optional directory; each buffer is written there as <object>_<attribute>.bin
+      (raw little-endian data) and the file paths are returned
+    
+    Returns counts, the world matrix and the dtype and shape of each buffer. Buffers are
+    in object space; apply matrix_world for world coordinates.
+    """
+    try:
+        blender = await get_async_blender_connection()
+        params = {"name": object_name, "evaluated": evaluated}
+        if attributes is not None:
+            params["attributes"] = attributes
+        result = await blender.send_command("get_mesh_data", params)
+        
+        summary = {}
+        buffers = {}
+        for key, value in result.items():
+            if isinstance(value, memoryview):
+                buffers[key] = value
+                dtypes = {fmt: dtype for dtype, fmt in ATTACHMENT_FORMATS.items()}
+                summary[key] = {"dtype": dtypes.get(value.format, "uint8"),
+                                "shape": list(value.shape), "bytes": value.nbytes}
+            else:
+                summary[key] = value
+        
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", object_name)
+            for key, view in buffers.items():
+                path = os.path.join(output_dir, f"{safe_name}_{key}.bin")
+                with open(path, "wb") as f:
+                    f.write(view)
+                summary[key]["path"] = path
+        return json.dumps(summary, separators=(",", ":"))
+    except Exception as e:
+        logger.error(f"Error getting mesh data from Blender: {str(e)}")
+        return f"Error getting mesh data: {str(e)}"
+
+@mcp.tool()
+async def create_object(
     ctx: Context,
     type: str = "CUBE",
     name: str = None,
@@ -293,7 +1724,8 @@ def create_object(
     minor_radius: float = 0.25,
     abso_major_rad: float = 1.25,
     abso_minor_rad: float = 0.75,
-    generate_uvs: bool = True
+    generate_uvs: bool = True,
+    share_mesh: bool = True
 ) -> str:
     """
     Create a new object in the Blender scene.
@@ -304,6 +1736,8 @@ def create_object(
     - location: Optional [x, y, z] location coordinates
     - rotation: Optional [x, y, z] rotation in radians
     - scale: Optional [x, y, z] scale factors (not used for TORUS)
+    - share_mesh: Reuse one mesh for identical primitives (default). Call make_single_user()
+      before editing the geometry of a shared object.
     
     Torus-specific parameters (only used when type == "TORUS"):
     - align: How to align the torus ('WORLD', 'VIEW', or 'CURSOR')
@@ -321,7 +1755,7 @@ def create_object(
     """
     try:
         # Get the global connection
-        blender = get_blender_connection()
+        blender = await get_async_blender_connection()
         
         # Set default values for missing parameters
         loc = location or [0, 0, 0]
@@ -336,6 +1770,8 @@ def create_object(
         
         if name:
             params["name"] = name
+        if not share_mesh:
+            params["share_mesh"] = False
 
         if type == "TORUS":
             # For torus, the scale is not used.
@@ -350,12 +1786,12 @@ def create_object(
                 "abso_minor_rad": abso_minor_rad,
                 "generate_uvs": generate_uvs
             })
-            result = blender.send_command("create_object", params)
+            result = await blender.send_command("create_object", params)
             return f"Created {type} object: {result['name']}"
         else:
             # For non-torus objects, include scale
             params["scale"] = sc
-            result = blender.send_command("create_object", params)
+            result = await blender.send_command("create_object", params)
             return f"Created {type} object: {result['name']}"
     except Exception as e:
         logger.error(f"Error creating object: {str(e)}")
@@ -363,7 +1799,56 @@ def create_object(
 
 
 @mcp.tool()
-def modify_object(
+async def create_objects(ctx: Context, objects: List[Dict[str, Any]], collection: str = None) -> str:
+    """
+    Create many objects in the Blender scene in one call.
+    
+    Much faster than calling create_object repeatedly: the scene is only updated once,
+    so thousands of objects can be created at a time.
+    
+    Parameters:
+    - objects: List of object specs, each with the same keys as create_object
+      (type, name, location, rotation, scale, share_mesh, and the torus parameters).
+      Identical primitives share one mesh unless share_mesh is false.
+    - collection: Optional name of the collection to put the objects in (created if missing)
+    
+    Returns the names of the created objects and any specs that failed.
+    """
+    try:
+        blender = await get_async_blender_connection()
+        params = {"objects": objects}
+        if collection:
+            params["collection"] = collection
+        result = await blender.send_command("create_objects", params)
+        # Compact JSON: the name list can be long
+        return json.dumps(result, separators=(",", ":"))
+    except Exception as e:
+        logger.error(f"Error creating objects: {str(e)}")
+        return f"Error creating objects: {str(e)}"
+
+
+@mcp.tool()
+async def make_single_user(ctx: Context, names: List[str]) -> str:
+    """
+    Give objects their own copy of a shared mesh.
+    
+    Primitives created with the same type and parameters share one mesh, so editing the
+    geometry of one edits all of them. Call this first for the objects you want to edit.
+    
+    Parameters:
+    - names: Names of the objects to make single user
+    """
+    try:
+        blender = await get_async_blender_connection()
+        result = await blender.send_command("make_single_user", {"names": names})
+        return json.dumps(result, indent=2)
+    except Exception as e:
+        logger.error(f"Error making objects single user: {str(e)}")
+        return f"Error making objects single user: {str(e)}"
+
+
+@mcp.tool()
+async def modify_object(
     ctx: Context,
     name: str,
     location: List[float] = None,
@@ -383,7 +1868,7 @@ def modify_object(
     """
     try:
         # Get the global connection
-        blender = get_blender_connection()
+        blender = await get_async_blender_connection()
         
         params = {"name": name}
         
@@ -396,14 +1881,14 @@ def modify_object(
         if visible is not None:
             params["visible"] = visible
             
-        result = blender.send_command("modify_object", params)
+        result = await blender.send_command("modify_object", params)
         return f"Modified object: {result['name']}"
     except Exception as e:
         logger.error(f"Error modifying object: {str(e)}")
         return f"Error modifying object: {str(e)}"
 
 @mcp.tool()
-def delete_object(ctx: Context, name: str) -> str:
+async def delete_object(ctx: Context, name: str) -> str:
     """
     Delete an object from the Blender scene.
     
@@ -412,16 +1897,16 @@ def delete_object(ctx: Context, name: str) -> str:
     """
     try:
         # Get the global connection
-        blender = get_blender_connection()
+        blender = await get_async_blender_connection()
         
-        result = blender.send_command("delete_object", {"name": name})
+        result = await blender.send_command("delete_object", {"name": name})
         return f"Deleted object: {name}"
     except Exception as e:
         logger.error(f"Error deleting object: {str(e)}")
         return f"Error deleting object: {str(e)}"
 
 @mcp.tool()
-def animate_object(ctx: Context, object_name: str, animation_fbx_path: str, temp_format: str = "glb", 
+async def animate_object(ctx: Context, object_name: str, animation_fbx_path: str, temp_format: str = "glb", 
                  handle_original: str = "hide", collection_name: str = None) -> str:
     """
     Animate a 3D model using a provided FBX animation file.
@@ -438,11 +1923,11 @@ def animate_object(ctx: Context, object_name: str, animation_fbx_path: str, temp
     """
     try:
         # Get the global connection
-        blender = get_blender_connection()
+        blender = await get_async_blender_connection()
         
         # First check if the object exists
         try:
-            blender.send_command("get_object_info", {"name": object_name})
+            await blender.send_command("get_object_info", {"name": object_name})
         except Exception as e:
             return json.dumps({
                 "status": "error",
@@ -471,7 +1956,7 @@ if obj:
         
         try:
             # Execute the duplication code
-            duplicate_result = blender.send_command("execute_code", {"code": duplicate_code})
+            duplicate_result = await blender.send_command("execute_code", {"code": duplicate_code})
             # Get the name of the duplicated object from the result
             duplicated_name = duplicate_result.get("result", f"{object_name}_to_animate")
             logger.info(f"Created duplicate of '{object_name}' named '{duplicated_name}'")
@@ -807,7 +2292,7 @@ result
         
         # Execute the code in Blender
         try:
-            result = blender.send_command("execute_code", {"code": code})
+            result = await blender.send_command("execute_code", {"code": code})
             
             # Parse the result
             if isinstance(result, dict) and "result" in result:
@@ -836,7 +2321,7 @@ result
         return f"Error animating object: {str(e)}"
 
 @mcp.tool()
-def set_material(
+async def set_material(
     ctx: Context,
     object_name: str,
     material_name: str = None,
@@ -852,7 +2337,7 @@ def set_material(
     """
     try:
         # Get the global connection
-        blender = get_blender_connection()
+        blender = await get_async_blender_connection()
         
         params = {"object_name": object_name}
         
@@ -861,14 +2346,14 @@ def set_material(
         if color:
             params["color"] = color
             
-        result = blender.send_command("set_material", params)
+        result = await blender.send_command("set_material", params)
         return f"Applied material to {object_name}: {result.get('material_name', 'unknown')}"
     except Exception as e:
         logger.error(f"Error setting material: {str(e)}")
         return f"Error setting material: {str(e)}"
 
 @mcp.tool()
-def execute_blender_code(ctx: Context, code: str) -> str:
+async def execute_blender_code(ctx: Context, code: str) -> str:
     """
     Execute arbitrary Python code in Blender.
     
@@ -877,14 +2362,120 @@ def execute_blender_code(ctx: Context, code: str) -> str:
     """
     try:
         # Get the global connection
-        blender = get_blender_connection()
+        blender = await get_async_blender_connection()
         
-        result = blender.send_command("execute_code", {"code": code})
+        result = await blender.send_command("execute_code", {"code": code})
         return f"Code executed successfully: {result.get('result', '')}"
     except Exception as e:
         logger.error(f"Error executing code: {str(e)}")
         return f"Error executing code: {str(e)}"
 
+@mcp.tool()
+async def batch_commands(ctx: Context, commands: List[Dict[str, Any]], stop_on_error: bool = False) -> str:
+    """
+    Run many commands in Blender in one go, in order, and return a result for each.
+    
+    Much faster than calling the individual tools one at a time when building a scene
+    with many objects. The whole batch is recorded as a single undo step.
+    
+    Parameters:
+    - commands: Ordered list of commands, each {"type": <command>, "params": {...}}.
+      Types are the addon commands, e.g. "create_object", "modify_object", "delete_object",
+      "set_material", "get_object_info"; params use the same names as the matching tools.
+    - stop_on_error: If True, skip the remaining commands after the first failure
+    
+    Returns the per-command results and a summary of how many succeeded.
+    """
+    try:
+        blender = await get_async_blender_connection()
+        result = await blender.send_command("batch", {
+            "commands": commands,
+            "stop_on_error": stop_on_error
+        })
+        # Compact JSON: batch results can be large
+        return json.dumps(result, separators=(",", ":"))
+    except Exception as e:
+        logger.error(f"Error running batch in Blender: {str(e)}")
+        return f"Error running batch: {str(e)}"
+
+@mcp.tool()
+async def render_scene(ctx: Context, output_path: str, resolution_x: int = None, resolution_y: int = None) -> str:
+    """
+    Render the current scene to an image file.
+    
+    When background workers are running the render happens on a copy of the scene in a
+    worker, so Blender stays responsive.
+    
+    Parameters:
+    - output_path: Path of the image file to write (on the Blender machine)
+    - resolution_x: Optional render width in pixels
+    - resolution_y: Optional render height in pixels
+    """
+    try:
+        blender = await get_async_blender_connection()
+        params = {"output_path": output_path}
+        if resolution_x is not None:
+            params["resolution_x"] = resolution_x
+        if resolution_y is not None:
+            params["resolution_y"] = resolution_y
+        
+        if workers_available():
+            result = await run_on_scene_snapshot(blender, "render_scene", params)
+        else:
+            result = await blender.send_command("render_scene", params)
+        return json.dumps(result, indent=2)
+    except Exception as e:
+        logger.error(f"Error rendering scene: {str(e)}")
+        return f"Error rendering scene: {str(e)}"
+
+@mcp.tool()
+async def export_scene(ctx: Context, filepath: str, format: str = "GLB", object_names: List[str] = None) -> str:
+    """
+    Export the scene, or only some objects, to a 3D file.
+    
+    When background workers are running the export happens on a copy of the scene in a
+    worker, so Blender stays responsive.
+    
+    Parameters:
+    - filepath: Path of the file to write (on the Blender machine)
+    - format: GLB, GLTF, FBX or OBJ (default: GLB)
+    - object_names: Optional list of objects to export instead of the whole scene
+    """
+    try:
+        blender = await get_async_blender_connection()
+        params = {"filepath": filepath, "format": format}
+        if object_names:
+            params["names"] = object_names
+        
+        if workers_available():
+            result = await run_on_scene_snapshot(blender, "export_scene", params)
+        else:
+            result = await blender.send_command("export_scene", params)
+        return json.dumps(result, indent=2)
+    except Exception as e:
+        logger.error(f"Error exporting scene: {str(e)}")
+        return f"Error exporting scene: {str(e)}"
+
+@mcp.tool()
+async def get_server_stats(ctx: Context) -> str:
+    """
+    Get runtime statistics of the Blender addon server.
+    
+    Returns the main-thread command queue depth, how many commands ran, and how long
+    they waited in the queue before running.
+    """
+    try:
+        blender = await get_async_blender_connection()
+        result = await blender.send_command("get_server_stats")
+        if _worker_pool:
+            result["workers"] = _worker_pool.get_stats()
+        result["shared_memory"] = shared_memory.get_stats()
+        result["decompression"] = decompression_stats.get_stats()
+        return json.dumps(result, indent=2)
+    except Exception as e:
+        logger.error(f"Error getting server stats from Blender: {str(e)}")
+        return f"Error getting server stats: {str(e)}"
+
 @mcp.prompt()
 def asset_creation_strategy() -> str:
     """Defines the preferred strategy for creating assets in Blender"""
@@ -903,13 +2494,17 @@ def asset_creation_strategy() -> str:
 
     2. If CSM integrations are disabled or when falling back to basic tools:
        - create_object() for basic primitives (CUBE, SPHERE, CYLINDER, etc.)
+       - create_objects() when creating many primitives at once
        - set_material() for basic colors and materials
+       - batch_commands() when creating or modifying many objects at once
     
     3. When including an object into scene, ALWAYS make sure that the name of the object is meanful.
 
     4. Always check the world_bounding_box for each item so that:
         - Ensure that all objects that should not be clipping are not clipping.
         - Items have right spatial relationship.
+       find_overlapping_objects(), find_objects_in_box() and find_nearest_objects() answer
+       these questions for the whole scene at once.
     
     5. After giving the tool location/scale/rotation information (via create_object() and modify_object()),
        double check the related object's location, scale, rotation, and world_bounding_box using get_object_info(),
@@ -967,29 +2562,31 @@ def asset_creation_strategy() -> str:
     """
 
 @mcp.tool()
-def get_csm_status(ctx: Context) -> str:
+async def get_csm_status(ctx: Context) -> str:
     """
     Check if CSM.ai integration is enabled in Blender.
     
     Returns a message indicating whether CSM.ai features are available.
     """
     try:
-        blender = get_blender_connection()
-        result = blender.send_command("get_csm_status")
-        return f"CSM.ai integration is {'enabled' if result.get('enabled', False) else 'disabled'}"
+        blender = await get_async_blender_connection()
+        enabled = await get_csm_enabled(blender, refresh=True)
+        return f"CSM.ai integration is {'enabled' if enabled else 'disabled'}"
     except Exception as e:
         return f"Error checking CSM.ai status: {str(e)}"
 
 @mcp.tool()
-def search_csm_models(ctx: Context, search_text: str, limit: int = 20) -> str:
+async def search_csm_models(ctx: Context, search_text: str, limit: int = 20, bypass_cache: bool = False) -> str:
     """
     Search for 3D models on CSM.ai using text.
     
     Parameters:
     - search_text: The text query to search for models
     - limit: Maximum number of results to return (default: 20)
+    - bypass_cache: Search CSM.ai again even if the same query was answered recently
     
-    Returns a list of matching models with their details.
+    Returns a list of matching models with their details. "cache" tells whether the results
+    came from the cache ("hit", or "stale" while they are being refreshed) or from CSM.ai.
     """
     try:
         # Debug logging for the incoming parameters
@@ -997,10 +2594,10 @@ def search_csm_models(ctx: Context, search_text: str, limit: int = 20) -> str:
         
         # First try the Blender addon method
         try:
-            blender = get_blender_connection()
+            blender = await get_async_blender_connection()
             
             # Get the private assets setting from Blender for logging
-            private_assets_result = blender.send_command(
+            private_assets_result = await blender.send_command(
                 "execute_code", 
                 {"code": "import bpy; bpy.context.scene.blendermcp_csm_use_private_assets"}
             )
@@ -1009,14 +2606,12 @@ def search_csm_models(ctx: Context, search_text: str, limit: int = 20) -> str:
             # Log detailed information about what we're sending
             logger.info(f"CLAUDE SEARCH REQUEST: search_text={search_text}, limit={limit}, private_assets={use_private_assets}")
             
-            # Request the search from the addon - no tier parameter needed
-            result = blender.send_command(
-                "search_csm_models", 
-                {
-                    "search_text": search_text,
-                    "limit": limit
-                }
-            )
+            # Request the search from the addon - no tier parameter needed. bypass_cache is only
+            # sent when set, so older addons (whose search_csm_models has no such parameter) keep working
+            params = {"search_text": search_text, "limit": limit}
+            if bypass_cache:
+                params["bypass_cache"] = True
+            result = await blender.send_command("search_csm_models", params)
             
             # Log the result for debugging
             if isinstance(result, dict):
@@ -1031,21 +2626,21 @@ def search_csm_models(ctx: Context, search_text: str, limit: int = 20) -> str:
             else:
                 logger.warning(f"Blender addon search failed: {result}")
                 # Fall back to direct method - IMPORTANT: Pass "user" as tier to use the user's actual tier
-                return direct_search_csm_models_with_user_token(ctx, search_text, limit, "user", None)
+                return await direct_search_csm_models_with_user_token(ctx, search_text, limit, "user", None)
                 
         except Exception as addon_error:
             # Log the error
             logger.error(f"Error using Blender addon for CSM search: {str(addon_error)}")
             
             # Fall back to direct method with user's token - IMPORTANT: Pass "user" as tier
-            return direct_search_csm_models_with_user_token(ctx, search_text, limit, "user", None)
+            return await direct_search_csm_models_with_user_token(ctx, search_text, limit, "user", None)
             
     except Exception as e:
         logger.error(f"All CSM search methods failed: {str(e)}")
         return f"Error searching CSM models: {str(e)}"
 
 @mcp.tool()
-def import_csm_model(ctx: Context, model_id: str, mesh_url_glb: str, name: str = None) -> str:
+async def import_csm_model(ctx: Context, model_id: str, mesh_url_glb: str, name: str = None) -> str:
     """
     Import a 3D model from CSM.ai into the Blender scene.
     
@@ -1059,8 +2654,19 @@ def import_csm_model(ctx: Context, model_id: str, mesh_url_glb: str, name: str =
     try:
         # First try the Blender addon method
         try:
-            blender = get_blender_connection()
-            result = blender.send_command(
+            blender = await get_async_blender_connection()
+            
+            # Keep the primary Blender responsive by downloading and importing in a worker
+            if workers_available():
+                try:
+                    result = await import_csm_model_via_worker(blender, model_id, mesh_url_glb, name)
+                    if isinstance(result, dict) and result.get("succeed", False):
+                        return json.dumps(result, indent=2)
+                    logger.warning(f"Worker CSM import failed: {result}")
+                except Exception as worker_error:
+                    logger.warning(f"Worker CSM import failed: {str(worker_error)}")
+            
+            result = await blender.send_command(
                 "import_csm_model", 
                 {
                     "model_id": model_id,
@@ -1096,7 +2702,7 @@ def import_csm_model(ctx: Context, model_id: str, mesh_url_glb: str, name: str =
         }, indent=2)
 
 @mcp.tool()
-def direct_search_csm_models(ctx: Context, search_text: str, limit: int = 20, tier: str = "enterprise") -> str:
+async def direct_search_csm_models(ctx: Context, search_text: str, limit: int = 20, tier: str = "enterprise") -> str:
     """
     Search for 3D models on CSM.ai using a direct API call.
     
@@ -1110,20 +2716,17 @@ def direct_search_csm_models(ctx: Context, search_text: str, limit: int = 20, ti
     
     Returns a list of matching models with their details.
     """
-    return direct_search_csm_models_with_user_token(ctx, search_text, limit, tier, None)
+    return await direct_search_csm_models_with_user_token(ctx, search_text, limit, tier, None)
 
 @mcp.tool()
-def direct_search_csm_models_with_user_token(ctx: Context, search_text: str, limit: int = 20, tier: str = "user", session_code: str = None) -> str:
+async def direct_search_csm_models_with_user_token(ctx: Context, search_text: str, limit: int = 20, tier: str = "user", session_code: str = None) -> str:
     """Helper function that performs direct CSM.ai search with the user's token"""
     try:
         # Get the user's token from Blender
-        blender = get_blender_connection()
+        blender = await get_async_blender_connection()
         
         # First check if CSM is enabled
-        status_result = blender.send_command("get_csm_status")
-        logger.info(f"CSM status check result: {status_result}")
-        
-        if not status_result.get('enabled', False):
+        if not await get_csm_enabled(blender):
             return json.dumps({
                 "status": "error",
                 "message": "CSM.ai integration is not enabled in Blender",
@@ -1131,14 +2734,16 @@ def direct_search_csm_models_with_user_token(ctx: Context, search_text: str, lim
             }, indent=2)
         
         # Get the token from Blender using the get_correct_tier method which will already have the API key
-        # This is a more reliable way to get the API key than execute_code
-        tier_result = blender.send_command("get_correct_tier", {"get_key_only": True})
+        # This is a more reliable way to get the API key than execute_code. The tier comes back
+        # in the same response when the search needs it, so one main-thread slot serves both.
+        need_tier = not session_code and tier == "user"
+        tier_result = await blender.send_command("get_correct_tier", {"get_key_only": not need_tier, "with_key": True})
         logger.info(f"Getting API key via get_correct_tier - Result type: {type(tier_result)}, Content: {tier_result}")
         
         # Try different methods to extract the API key
         token = ""
         if isinstance(tier_result, dict) and "api_key" in tier_result:
-            token = tier_result["api_key"]
+            token = tier_result["api_key"] or ""
             logger.info(f"Got API key from tier_result dict: {token[:5]}...")
         elif isinstance(tier_result, str) and len(tier_result) > 10:
             # If we got the key directly as a string
@@ -1147,7 +2752,7 @@ def direct_search_csm_models_with_user_token(ctx: Context, search_text: str, lim
         else:
             # Fallback to execute_code
             logger.info("Falling back to execute_code to get API key")
-            token_result = blender.send_command(
+            token_result = await blender.send_command(
                 "execute_code", 
                 {"code": "import bpy; bpy.context.scene.blendermcp_csm_api_key"}
             )
@@ -1183,7 +2788,7 @@ def direct_search_csm_models_with_user_token(ctx: Context, search_text: str, lim
             logger.info(f"Getting session details for session code: {session_code}")
             
             # Make the API request to CSM.ai
-            response = requests.get(url, headers=headers)
+            response = await asyncio.to_thread(csm_session.get, url, headers=headers, timeout=CSM_API_TIMEOUT)
             logger.info(f"CSM API response status: {response.status_code}")
             
             if response.status_code != 200:
@@ -1241,12 +2846,9 @@ def direct_search_csm_models_with_user_token(ctx: Context, search_text: str, lim
             # Determine which tier to use
             actual_tier = tier
             if tier == "user":
-                # Get the user's actual tier from Blender
-                tier_info = blender.send_command("get_correct_tier", {"get_key_only": False})
-                if isinstance(tier_info, dict) and "tier" in tier_info:
-                    actual_tier = tier_info["tier"]
-                elif isinstance(tier_info, str) and tier_info in ["free", "pro", "enterprise"]:
-                    actual_tier = tier_info
+                # The user's actual tier came with the API key
+                if isinstance(tier_result, dict) and tier_result.get("tier"):
+                    actual_tier = tier_result["tier"]
                 else:
                     actual_tier = "enterprise"  # Default to enterprise
                 
@@ -1262,7 +2864,8 @@ def direct_search_csm_models_with_user_token(ctx: Context, search_text: str, lim
             logger.info(f"Searching CSM.ai with: {search_params}")
             
             # Make the search API request
-            response = requests.get(search_url, headers=headers, params=search_params)
+            response = await asyncio.to_thread(csm_session.get, search_url, headers=headers, params=search_params,
+                                             timeout=CSM_API_TIMEOUT)
             logger.info(f"CSM Search API response status: {response.status_code}")
             
             if response.status_code != 200:
@@ -1322,22 +2925,22 @@ def direct_search_csm_models_with_user_token(ctx: Context, search_text: str, lim
         }, indent=2)
 
 @mcp.tool()
-def get_correct_tier(ctx: Context, api_key: str = None, get_key_only: bool = False) -> str:
+async def get_correct_tier(ctx: Context, api_key: str = None, get_key_only: bool = False, refresh: bool = False) -> str:
     """
     Get the correct tier for the user's CSM.ai account (or the API key if requested)
     
     Parameters:
     - api_key: Optional API key to check (if None, will use the one from Blender)
     - get_key_only: If True, return only the API key and don't check the tier
+    - refresh: If True, look the tier up again instead of using the cached one
     
     Returns the tier or API key as specified.
     """
     try:
-        blender = get_blender_connection()
+        blender = await get_async_blender_connection()
         
         # First check if CSM is enabled
-        status_result = blender.send_command("get_csm_status")
-        if not status_result.get('enabled', False):
+        if not await get_csm_enabled(blender):
             return json.dumps({
                 "status": "error",
                 "message": "CSM.ai integration is not enabled in Blender",
@@ -1345,7 +2948,7 @@ def get_correct_tier(ctx: Context, api_key: str = None, get_key_only: bool = Fal
             }, indent=2)
         
         # Get the tier or API key from the addon
-        result = blender.send_command("get_correct_tier", {"api_key": api_key, "get_key_only": get_key_only})
+        result = await blender.send_command("get_correct_tier", {"api_key": api_key, "get_key_only": get_key_only, "refresh": refresh})
         
         # If we got a string, it's either the API key or tier
         if isinstance(result, str):
@@ -1383,7 +2986,7 @@ def get_correct_tier(ctx: Context, api_key: str = None, get_key_only: bool = Fal
         }, indent=2)
 
 @mcp.tool()
-def get_csm_session_details(ctx: Context, session_code: str) -> str:
+async def get_csm_session_details(ctx: Context, session_code: str) -> str:
     """
     Get detailed information about a specific CSM.ai session by its session code.
     
@@ -1395,7 +2998,7 @@ def get_csm_session_details(ctx: Context, session_code: str) -> str:
     """
     try:
         # Call the existing function with just the session code
-        return direct_search_csm_models_with_user_token(ctx, "", 0, "user", session_code)
+        return await direct_search_csm_models_with_user_token(ctx, "", 0, "user", session_code)
     except Exception as e:
         logger.error(f"Error getting CSM session details: {str(e)}")
         return json.dumps({
@@ -1407,6 +3010,19 @@ def get_csm_session_details(ctx: Context, session_code: str) -> str:
 
 def main():
     """Run the MCP server"""
+    global BLENDER_ENDPOINT
+    parser = argparse.ArgumentParser(prog="blender-mcp")
+    parser.add_argument(
+        "--endpoint",
+        default=BLENDER_ENDPOINT,
+        help="Where the Blender addon listens: tcp://host:port or unix:///path (default: %(default)s)"
+    )
+    args = parser.parse_args()
+    try:
+        parse_endpoint(args.endpoint)
+    except ValueError as e:
+        parser.error(str(e))
+    BLENDER_ENDPOINT = args.endpoint
     mcp.run()
 
 if __name__ == "__main__":
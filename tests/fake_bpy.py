@@ -0,0 +1,49 @@
+"""Load addon.py outside Blender, for unit tests of its pure-Python parts.
+
+When Blender's own modules cannot be imported, minimal stand-ins for bpy, bmesh and
+mathutils are installed first. They only cover what addon.py needs at import time;
+anything that touches a scene needs a real Blender (see test_background_parity.py).
+"""
+
+import importlib.util
+import os
+import sys
+import types
+
+ADDON_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "addon.py")
+MODULE_NAME = "blender_mcp_addon"
+
+def _install_stubs():
+    bpy = types.ModuleType("bpy")
+    bpy.props = types.ModuleType("bpy.props")
+    for name in ("StringProperty", "IntProperty", "FloatProperty", "BoolProperty", "EnumProperty"):
+        setattr(bpy.props, name, lambda *args, **kwargs: None)
+    bpy.types = types.ModuleType("bpy.types")
+    for name in ("Operator", "Panel", "Scene"):
+        setattr(bpy.types, name, type(name, (), {}))
+    bpy.app = types.SimpleNamespace(background=True, handlers=types.SimpleNamespace(persistent=lambda f: f))
+    sys.modules.update({
+        "bpy": bpy,
+        "bpy.props": bpy.props,
+        "bpy.types": bpy.types,
+        "bmesh": types.ModuleType("bmesh"),
+        "mathutils": types.ModuleType("mathutils"),
+    })
+
+def load_addon():
+    """The addon module, imported once under the name blender_mcp_addon"""
+    if MODULE_NAME in sys.modules:
+        return sys.modules[MODULE_NAME]
+    try:
+        import bpy  # noqa: F401
+    except ImportError:
+        _install_stubs()
+    spec = importlib.util.spec_from_file_location(MODULE_NAME, ADDON_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[MODULE_NAME] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        del sys.modules[MODULE_NAME]
+        raise
+    return module
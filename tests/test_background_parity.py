@@ -0,0 +1,189 @@
+"""Every addon command must work in a headless worker (blender -b) as it does with a UI.
+
+Starts a real Blender in background mode with the addon, sends each command a
+representative request over the legacy raw JSON protocol and checks the result against
+the values the same request returns with a UI. Skipped when no Blender
+executable is found; set BLENDER_EXECUTABLE to point at one that is not on PATH.
+"""
+
+import json
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+import unittest
+
+ADDON_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "addon.py")
+BLENDER_EXECUTABLE = shutil.which(os.environ.get("BLENDER_EXECUTABLE", "blender"))
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+def _error_message(response):
+    """The error reported by a response, at the protocol or handler level, or None"""
+    if response.get("status") == "error":
+        return response.get("message", "")
+    result = response.get("result")
+    if isinstance(result, dict) and (result.get("status") == "error" or "error" in result
+                                     or result.get("succeed") is False):
+        return str(result.get("message") or result.get("error"))
+    return None
+
+@unittest.skipIf(BLENDER_EXECUTABLE is None, "Blender executable not found")
+class BackgroundParityTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.scratch_dir = tempfile.mkdtemp(prefix="blender-mcp-test-")
+        cls.port = _free_port()
+        cls.process = subprocess.Popen(
+            [BLENDER_EXECUTABLE, "-b", "--factory-startup", "--python", ADDON_PATH, "--", "--port", str(cls.port)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                cls.sock = socket.create_connection(("localhost", cls.port), timeout=120)
+                break
+            except OSError:
+                if cls.process.poll() is not None or time.monotonic() > deadline:
+                    cls.process.kill()
+                    shutil.rmtree(cls.scratch_dir, ignore_errors=True)
+                    raise RuntimeError("Blender worker did not start")
+                time.sleep(0.5)
+        cls.decoder = json.JSONDecoder()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.sock.close()
+        cls.process.terminate()
+        try:
+            cls.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            cls.process.kill()
+        shutil.rmtree(cls.scratch_dir, ignore_errors=True)
+
+    def send(self, command_type, **params):
+        self.sock.sendall(json.dumps({"type": command_type, "params": params}).encode("utf-8"))
+        buffer = ""
+        while True:
+            data = self.sock.recv(65536)
+            if not data:
+                raise ConnectionError("Blender worker closed the connection")
+            buffer += data.decode("utf-8")
+            try:
+                return self.decoder.raw_decode(buffer)[0]
+            except ValueError:
+                continue
+
+    def scratch(self, name):
+        return os.path.join(self.scratch_dir, name)
+
+    def command(self, command_type, **params):
+        """Send a command that must succeed and return its result"""
+        self.covered.add(command_type)
+        response = self.send(command_type, **params)
+        error = _error_message(response)
+        self.assertIsNone(error, f"{command_type} failed in background mode: {error}")
+        return response.get("result")
+
+    def command_failing(self, command_type, message, **params):
+        """Send a command that must fail with the given (non-context) error"""
+        self.covered.add(command_type)
+        error = _error_message(self.send(command_type, **params))
+        self.assertIsNotNone(error, f"{command_type} unexpectedly succeeded")
+        self.assertIn(message, error)
+
+    def assertClose(self, actual, expected, places=3):
+        for a, e in zip(actual, expected):
+            if isinstance(e, (list, tuple)):
+                self.assertClose(a, e, places)
+            else:
+                self.assertAlmostEqual(a, e, places=places)
+
+    def test_commands_match_gui_results(self):
+        """Each command returns what it returns with a UI (the values below); every registered
+        command is exercised, in an order where each finds the objects and files it needs"""
+        self.covered = set()
+        self.command("clear_scene")
+        self.assertClose(self.command("create_object", type="CUBE", name="ParityCube")["world_bounding_box"],
+                         [[-1, -1, -1], [1, 1, 1]])
+        created = self.command("create_objects", objects=[{"type": "SPHERE", "name": "ParitySphere", "location": [1.5, 0, 0]}])
+        self.assertEqual((created["created"], created["errors"]), (["ParitySphere"], []))
+        
+        info = self.command("get_scene_info")
+        self.assertEqual([obj["name"] for obj in info["objects"]], ["ParityCube", "ParitySphere"])
+        self.assertIsNone(info["next_cursor"])
+        bounds = self.command("get_bounds", names=["ParityCube", "ParitySphere"])
+        self.assertClose(bounds["bounds"], [[-1, -1, -1], [2.5, 1, 1]])
+        columns = self.command("get_objects_info", names=["ParitySphere"], fields=["name", "type", "location"])["columns"]
+        self.assertEqual((columns["name"], columns["type"]), (["ParitySphere"], ["MESH"]))
+        self.assertClose(columns["location"], [[1.5, 0, 0]])
+        mesh = self.command("get_mesh_data", name="ParityCube")
+        self.assertEqual((mesh["vertex_count"], mesh["triangle_count"]), (8, 12))
+        self.assertEqual(self.command("find_objects_in_box", min=[1.5, 1.5, 1.5], max=[-1.5, -1.5, -1.5], contain=True)["objects"],
+                         ["ParityCube"])
+        nearest = self.command("find_nearest_objects", point=[5, 0, 0], k=1)["objects"]
+        self.assertEqual(nearest[0]["name"], "ParitySphere")
+        self.assertAlmostEqual(nearest[0]["distance"], 2.5, places=3)
+        self.assertEqual(self.command("find_overlapping_objects")["pairs"], [["ParityCube", "ParitySphere"]])
+        
+        # Edits must reach the change feed and the spatial index without a redraw
+        self.assertEqual(self.command("make_single_user", names=["ParityCube"])["objects"], {"ParityCube": "made single user"})
+        moved = self.command("modify_object", name="ParityCube", location=[0, 0, 3])
+        self.assertClose(moved["world_bounding_box"], [[-1, -1, 2], [1, 1, 4]])
+        changes = self.command("get_scene_changes", since_revision=info["revision"])
+        self.assertIn({"change": "transformed", "name": "ParityCube"},
+                      [{"change": record["change"], "name": record["name"]} for record in changes["changes"]])
+        self.assertEqual(self.command("find_objects_in_box", min=[-1, -1, 2.5], max=[1, 1, 3.5])["objects"], ["ParityCube"])
+        self.assertClose(self.command("get_object_info", name="ParityCube")["location"], [0, 0, 3])
+        self.assertEqual(self.command("execute_code", code="len(bpy.data.objects)"), {"executed": True, "result": 2})
+        material = self.command("set_material", object_name="ParityCube", color=[1, 0, 0])
+        self.assertEqual(material["material"], "ParityCube_material")
+        batch = self.command("batch", commands=[{"type": "get_object_info", "params": {"name": "ParitySphere"}}])
+        self.assertEqual((batch["succeeded"], batch["results"][0]["result"]["name"]), (1, "ParitySphere"))
+        
+        self.command("create_object", type="CAMERA", name="ParityCamera", location=[0, -10, 1], rotation=[1.5708, 0, 0])
+        # Cycles renders on the CPU, so the test needs no GPU
+        self.command("execute_code", code="scene = bpy.context.scene; scene.camera = bpy.data.objects['ParityCamera']; "
+                                          "scene.render.engine = 'CYCLES'; scene.cycles.samples = 1")
+        render = self.command("render_scene", output_path=self.scratch("render.png"), resolution_x=32, resolution_y=32)
+        self.assertEqual(render["resolution"], [32, 32])
+        self.assertTrue(os.path.exists(self.scratch("render.png")))
+        self.assertEqual(self.command("export_scene", filepath=self.scratch("scene.glb"), names=["ParitySphere"])["format"], "GLB")
+        self.assertTrue(os.path.exists(self.scratch("scene.glb")))
+        imported = self.command("import_file", filepath=self.scratch("scene.glb"), name="ParityImport")
+        self.assertEqual(imported["active_object"], "ParityImport")
+        self.command("save_blend", filepath=self.scratch("scene.blend"))
+        self.assertEqual(self.command("open_blend", filepath=self.scratch("scene.blend"))["object_count"], 4)
+        self.assertEqual(self.command("get_csm_status")["enabled"], False)
+        self.assertEqual(self.command("get_correct_tier", get_key_only=True), "")
+        
+        # Expected failures: no CSM.ai API key is configured, so these stop before any network request
+        self.command_failing("search_csm_models", "CSM.ai integration is disabled", search_text="chair")
+        self.command_failing("import_csm_model", "No GLB URL provided", model_id="parity", mesh_url_glb="")
+        self.command_failing("animate_object", "Object not found: MissingObject", object_name="MissingObject",
+                             animation_prompt="jump")
+        
+        commands = self.send("get_server_stats")["result"]["commands"]
+        self.assertEqual(sorted(set(commands) - self.covered), [])
+
+    def test_material_not_shared_through_mesh_cache(self):
+        # Identical primitives share one cached mesh; a material set on one must not reach the
+        # others, nor primitives created later from the cache
+        self.send("clear_scene")
+        self.send("create_object", type="CUBE", name="MaterialFirst")
+        self.send("create_object", type="CUBE", name="MaterialSecond")
+        response = self.send("set_material", object_name="MaterialFirst", material_name="ParityRed", color=[1, 0, 0])
+        self.assertIsNone(_error_message(response))
+        self.send("create_object", type="CUBE", name="MaterialThird")
+
+        self.assertEqual(self.send("get_object_info", name="MaterialFirst")["result"]["materials"], ["ParityRed"])
+        for name in ("MaterialSecond", "MaterialThird"):
+            self.assertEqual(self.send("get_object_info", name=name)["result"]["materials"], [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""Streamed replies on AsyncBlenderConnection, without Blender.
+
+The connection writes to a fake socket writer, and the tests feed the chunks and the final
+response that the read loop would route to the stream.
+"""
+
+import asyncio
+import unittest
+
+from blender_mcp import server
+
+class FakeWriter:
+    def __init__(self):
+        self.frames = []
+
+    def write(self, data):
+        self.frames.append(bytes(data))
+
+    async def drain(self):
+        pass
+
+    def is_closing(self):
+        return False
+
+def _connection(max_in_flight=1):
+    connection = server.AsyncBlenderConnection(host="localhost", port=0, max_in_flight=max_in_flight)
+    connection.writer = FakeWriter()
+    connection.framed = connection.pipelined = connection.streaming = True
+    return connection
+
+class CommandStreamTest(unittest.IsolatedAsyncioTestCase):
+    async def test_records_and_summary(self):
+        connection = _connection()
+        stream = await connection.stream_command("get_scene_info")
+        chunks = connection._streams[1]
+        chunks.put_nowait(b'{"id":1}\n{"name":"A"}\n{"name":"B"}\n')
+        chunks.put_nowait({"id": 1, "status": "success", "result": {"count": 2}})
+        self.assertEqual([record["name"] async for record in stream], ["A", "B"])
+        self.assertEqual(stream.result, {"count": 2})
+
+    async def test_stream_holds_an_in_flight_slot_until_exhausted(self):
+        connection = _connection(max_in_flight=1)
+        stream = await connection.stream_command("get_scene_info")
+        second = asyncio.create_task(connection.stream_command("get_scene_info"))
+        await asyncio.sleep(0.05)
+        self.assertFalse(second.done())
+
+        connection._streams[1].put_nowait({"id": 1, "status": "success", "result": {}})
+        self.assertEqual([record async for record in stream], [])
+        await asyncio.wait_for(second, 1)
+        self.assertEqual(list(connection._streams), [2])
+
+    async def test_aclose_frees_the_slot(self):
+        connection = _connection(max_in_flight=1)
+        stream = await connection.stream_command("get_scene_info")
+        await stream.aclose()
+        await stream.aclose()
+        self.assertEqual(connection._streams, {})
+        await asyncio.wait_for(connection.stream_command("get_scene_info"), 1)
+
+    async def test_connection_error_frees_the_slot(self):
+        connection = _connection(max_in_flight=1)
+        stream = await connection.stream_command("get_scene_info")
+        connection._streams.pop(1).put_nowait(ConnectionError("Connection to Blender lost"))
+        with self.assertRaises(Exception):
+            await stream.__anext__()
+        await asyncio.wait_for(connection.stream_command("get_scene_info"), 1)
+
+if __name__ == "__main__":
+    unittest.main()
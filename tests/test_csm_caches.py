@@ -0,0 +1,253 @@
+"""The addon's CSM.ai caches (tiers, search results, GLB assets), without Blender or network."""
+
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from fake_bpy import load_addon
+
+addon = load_addon()
+
+def _wait_for(condition, timeout=5.0):
+    """Wait for a background refresh to finish"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out waiting for a background refresh")
+        time.sleep(0.01)
+
+def _glb(body):
+    """A minimal GLB file: magic, version and total length, then the body"""
+    return b"glTF" + struct.pack("<II", 2, 12 + len(body)) + body
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+class FakeHttpClient:
+    def __init__(self, files):
+        self.files = files
+        self.requests = []
+
+    def get(self, url, **kwargs):
+        self.requests.append(url)
+        return FakeResponse(self.files[url])
+
+class TierCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.tiers = {"key-a": "pro"}
+        self.cache = addon.TierCache(self.fetch, ttl=100.0, refresh_after=10.0)
+
+    def fetch(self, api_key):
+        self.calls.append(api_key)
+        return self.tiers.get(api_key)
+
+    def test_fresh_entry_is_served_from_cache(self):
+        self.assertEqual(self.cache.get("key-a"), "pro")
+        self.assertEqual(self.cache.get("key-a"), "pro")
+        self.assertEqual(self.calls, ["key-a"])
+        self.assertEqual(self.cache.get_stats()["hits"], 1)
+
+    def test_refresh_bypasses_cache(self):
+        self.cache.get("key-a")
+        self.tiers["key-a"] = "enterprise"
+        self.assertEqual(self.cache.get("key-a", refresh=True), "enterprise")
+        self.assertEqual(len(self.calls), 2)
+
+    def test_failed_lookup_is_not_cached(self):
+        self.assertIsNone(self.cache.get("key-b"))
+        self.assertIsNone(self.cache.get("key-b"))
+        self.assertEqual(self.calls, ["key-b", "key-b"])
+
+    def test_aging_entry_is_served_and_refreshed_in_background(self):
+        self.cache._entries["key-a"] = ("free", time.monotonic() - 50.0)
+        self.assertEqual(self.cache.get("key-a"), "free")
+        _wait_for(lambda: self.cache._entries["key-a"][0] == "pro")
+        self.assertEqual(self.cache.get_stats()["background_refreshes"], 1)
+
+    def test_expired_entry_is_fetched_in_foreground(self):
+        self.cache._entries["key-a"] = ("free", time.monotonic() - 500.0)
+        self.assertEqual(self.cache.get("key-a"), "pro")
+        self.assertEqual(self.cache.get_stats()["misses"], 1)
+
+    def test_invalidate(self):
+        self.cache.get("key-a")
+        self.cache.invalidate("key-a")
+        self.cache.get("key-a")
+        self.assertEqual(len(self.calls), 2)
+
+class SearchCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="blender-mcp-test-")
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.cache = self.make_cache()
+        self.calls = 0
+
+    def make_cache(self, **kwargs):
+        return addon.SearchCache(self.directory, **{"ttl": 100.0, "stale_ttl": 1000.0, **kwargs})
+
+    def fetch(self):
+        self.calls += 1
+        return {"status": "success", "models": [f"model-{self.calls}"]}
+
+    def test_key_normalizes_query_and_separates_accounts(self):
+        key = addon.SearchCache.make_key("  Blue   CAR ", 10, "pro", False, "key-a")
+        self.assertEqual(key, addon.SearchCache.make_key("blue car", 10, "pro", False, "key-a"))
+        self.assertNotEqual(key, addon.SearchCache.make_key("blue car", 10, "pro", False, "key-b"))
+        self.assertNotIn("key-a", key)
+
+    def test_miss_then_hit(self):
+        self.assertEqual(self.cache.get("k", self.fetch), ({"status": "success", "models": ["model-1"]}, "miss"))
+        self.assertEqual(self.cache.get("k", self.fetch)[1], "hit")
+        self.assertEqual(self.calls, 1)
+
+    def test_bypass_fetches_and_stores(self):
+        self.cache.get("k", self.fetch)
+        result, state = self.cache.get("k", self.fetch, bypass=True)
+        self.assertEqual((result["models"], state), (["model-2"], "bypass"))
+        self.assertEqual(self.cache.get("k", self.fetch)[0]["models"], ["model-2"])
+
+    def test_failed_search_is_not_stored(self):
+        self.cache.get("k", lambda: {"status": "error"})
+        self.assertEqual(self.cache.get("k", self.fetch)[1], "miss")
+
+    def test_stale_result_is_served_while_revalidating(self):
+        self.cache._remember("k", ({"status": "success", "models": ["old"]}, time.time() - 500.0))
+        result, state = self.cache.get("k", self.fetch, persist=False)
+        self.assertEqual((result["models"], state), (["old"], "stale"))
+        _wait_for(lambda: self.cache._entries["k"][0]["models"] == ["model-1"])
+
+    def test_expired_result_is_fetched_again(self):
+        self.cache._remember("k", ({"status": "success", "models": ["old"]}, time.time() - 5000.0))
+        self.assertEqual(self.cache.get("k", self.fetch, persist=False)[1], "miss")
+
+    def test_results_persist_across_instances(self):
+        self.cache.get("k", self.fetch)
+        other = self.make_cache()
+        self.assertEqual(other.get("k", self.fetch), ({"status": "success", "models": ["model-1"]}, "hit"))
+        self.assertEqual(other.get_stats()["disk_hits"], 1)
+
+    def test_not_persisted_when_disabled(self):
+        self.cache.get("k", self.fetch, persist=False)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_file_for_another_key_is_ignored(self):
+        self.cache.get("k", self.fetch)
+        os.replace(self.cache._path("k"), self.cache._path("other"))
+        self.assertEqual(self.make_cache().get("other", self.fetch)[1], "miss")
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = self.make_cache(max_entries=2)
+        for key in ("a", "b"):
+            cache.get(key, self.fetch, persist=False)
+        cache.get("a", self.fetch, persist=False)
+        cache.get("c", self.fetch, persist=False)
+        self.assertEqual(list(cache._entries), ["a", "c"])
+
+    def test_clear_keeps_files(self):
+        self.cache.get("k", self.fetch)
+        self.cache.clear()
+        self.assertEqual(self.cache.get_stats()["entries"], 0)
+        self.assertEqual(self.cache.get("k", self.fetch)[1], "hit")
+        self.assertEqual(self.calls, 1)
+
+class AssetCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="blender-mcp-test-")
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.http = FakeHttpClient({
+            "https://cdn/a.glb": _glb(b"a" * 1000),
+            "https://cdn/b.glb": _glb(b"b" * 1000),
+            "https://cdn/truncated.glb": _glb(b"c" * 1000)[:500],
+            "https://cdn/not-a-glb": b"<html></html>",
+        })
+        patcher = mock.patch.object(addon, "http_client", self.http)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = addon.AssetCache(self.directory, max_bytes=1 << 20)
+
+    def test_download_then_hit(self):
+        path, from_cache = self.cache.fetch("model-a", "https://cdn/a.glb")
+        self.assertFalse(from_cache)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), self.http.files["https://cdn/a.glb"])
+        self.assertEqual(self.cache.fetch("model-a", "https://cdn/a.glb"), (path, True))
+        self.assertEqual(len(self.http.requests), 1)
+
+    def test_other_process_verifies_digest(self):
+        path, _ = self.cache.fetch("model-a", "https://cdn/a.glb")
+        other = addon.AssetCache(self.directory, max_bytes=1 << 20)
+        self.assertEqual(other.lookup("model-a"), path)
+
+    def test_corrupt_file_is_removed_and_downloaded_again(self):
+        path, _ = self.cache.fetch("model-a", "https://cdn/a.glb")
+        with open(path, "r+b") as f:
+            f.seek(100)
+            f.write(b"x")
+        other = addon.AssetCache(self.directory, max_bytes=1 << 20)
+        self.assertIsNone(other.lookup("model-a"))
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(other.get_stats()["corrupt"], 1)
+        self.assertEqual(other.fetch("model-a", "https://cdn/a.glb"), (path, False))
+
+    def test_bad_downloads_leave_no_files(self):
+        for url in ("https://cdn/truncated.glb", "https://cdn/not-a-glb"):
+            with self.subTest(url=url):
+                with self.assertRaises(ValueError):
+                    self.cache.fetch("model-c", url)
+        self.assertEqual([name for name in os.listdir(self.directory) if name != "locks"], [])
+
+    def test_model_ids_are_made_safe_for_file_names(self):
+        path, _ = self.cache.fetch("../model/a", "https://cdn/a.glb")
+        self.assertEqual(os.path.dirname(path), self.directory)
+
+    def test_ids_that_sanitize_alike_do_not_share_a_file(self):
+        path, _ = self.cache.fetch("a-b", "https://cdn/a.glb")
+        for model_id in ("a/b", "a_b"):
+            with self.subTest(model_id=model_id):
+                self.assertIsNone(self.cache.lookup(model_id))
+        self.assertEqual(self.cache.lookup("a-b"), path)
+
+    def test_least_recently_used_files_are_evicted(self):
+        cache = addon.AssetCache(self.directory, max_bytes=1500, min_age=0.0)
+        old, _ = cache.fetch("model-a", "https://cdn/a.glb")
+        past = time.time() - 100
+        os.utime(old, (past, past))
+        new, _ = cache.fetch("model-b", "https://cdn/b.glb")
+        self.assertFalse(os.path.exists(old))
+        self.assertTrue(os.path.exists(new))
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+
+    def test_recently_used_files_are_kept(self):
+        cache = addon.AssetCache(self.directory, max_bytes=1500, min_age=300.0)
+        first, _ = cache.fetch("model-a", "https://cdn/a.glb")
+        second, _ = cache.fetch("model-b", "https://cdn/b.glb")
+        self.assertTrue(os.path.exists(first) and os.path.exists(second))
+        self.assertEqual(cache.get_stats()["evictions"], 0)
+
+    def test_concurrent_fetches_download_once(self):
+        paths = []
+        threads = [threading.Thread(target=lambda: paths.append(self.cache.fetch("model-a", "https://cdn/a.glb")[0]))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(paths)), 1)
+        self.assertEqual(len(self.http.requests), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+"""The wire protocol between the addon and the MCP server, without Blender.
+
+Messages are encoded with the addon's _encode_message and decoded with the server's frame
+functions, so both halves of the protocol are checked against each other.
+"""
+
+import json
+import os
+import unittest
+import zlib
+
+import numpy as np
+
+from fake_bpy import load_addon
+from blender_mcp import server
+
+addon = load_addon()
+
+def _decode(buffers):
+    """Decode one encoded message the way the server's connections do"""
+    message = b"".join(bytes(buffer) for buffer in buffers)
+    flags, length = server._parse_frame_header(message[:server.FRAME_HEADER.size])
+    payload = bytearray(message[server.FRAME_HEADER.size:])
+    assert len(payload) == length
+    return flags, server._decode_payload(*server._decompress(flags, payload))
+
+class FramingTest(unittest.TestCase):
+    def test_legacy_message_is_raw_json(self):
+        response = {"status": "success", "result": {"name": "Cube"}}
+        buffers = addon._encode_message(response, framed=False)
+        self.assertEqual(len(buffers), 1)
+        self.assertEqual(json.loads(buffers[0]), response)
+
+    def test_framed_round_trip(self):
+        response = {"status": "success", "result": {"name": "Cube", "location": [1, 2, 3]}, "id": 7}
+        flags, decoded = _decode(addon._encode_message(response, framed=True))
+        self.assertEqual(flags, 0)
+        self.assertEqual(decoded, response)
+
+    def test_rejects_bad_magic(self):
+        header = server.FRAME_HEADER.pack(b"HTTP", server.PROTOCOL_VERSION, 0, 0, 0)
+        with self.assertRaises(ValueError):
+            server._parse_frame_header(header)
+
+    def test_rejects_newer_version(self):
+        header = server.FRAME_HEADER.pack(server.PROTOCOL_MAGIC, server.PROTOCOL_VERSION + 1, 0, 0, 0)
+        with self.assertRaises(ValueError):
+            server._parse_frame_header(header)
+
+    def test_rejects_oversized_length(self):
+        header = server.FRAME_HEADER.pack(server.PROTOCOL_MAGIC, server.PROTOCOL_VERSION, 0, 0,
+                                          server.MAX_PAYLOAD_SIZE + 1)
+        with self.assertRaises(ValueError):
+            server._parse_frame_header(header)
+
+class AttachmentTest(unittest.TestCase):
+    def test_arrays_travel_as_attachments(self):
+        vertices = np.arange(12, dtype=np.float32).reshape(4, 3)
+        triangles = np.array([[0, 1, 2], [0, 2, 3]], dtype=np.uint32)
+        response = {"status": "success", "result": {"vertices": vertices, "triangles": triangles, "count": 4}}
+        buffers = addon._encode_message(response, framed=True)
+        self.assertEqual(len(buffers), 3)
+
+        flags, decoded = _decode(buffers)
+        self.assertTrue(flags & server.FLAG_ATTACHMENTS)
+        result = decoded["result"]
+        self.assertEqual(result["count"], 4)
+        self.assertIsInstance(result["vertices"], memoryview)
+        self.assertEqual(result["vertices"].tolist(), vertices.tolist())
+        self.assertEqual(result["triangles"].tolist(), triangles.tolist())
+
+    def test_legacy_clients_get_lists(self):
+        response = {"status": "success", "result": {"vertices": np.zeros((2, 3), dtype=np.float32)}}
+        decoded = json.loads(addon._encode_message(response, framed=False)[0])
+        self.assertEqual(decoded["result"]["vertices"], [[0.0] * 3] * 2)
+
+    @unittest.skipUnless(os.name == "posix", "shared memory transport is POSIX only")
+    def test_shared_memory_round_trip(self):
+        self.addCleanup(server.shared_memory.close)
+        writer = addon.SharedMemoryWriter.accept(server.shared_memory.offer())
+        self.assertIsNotNone(writer)
+        writer.threshold = 0
+
+        vertices = np.arange(30, dtype=np.float64).reshape(10, 3)
+        buffers = addon._encode_message({"status": "success", "result": {"vertices": vertices}}, framed=True,
+                                        shared=writer)
+        self.assertEqual(len(buffers), 1)
+        flags, decoded = _decode(buffers)
+        self.assertTrue(flags & server.FLAG_SHARED)
+        self.assertEqual(decoded["result"]["vertices"].tolist(), vertices.tolist())
+        # The server removes the file as soon as it is mapped
+        self.assertEqual([name for name in os.listdir(server.shared_memory.path) if name.endswith(".bin")], [])
+
+class CompressionTest(unittest.TestCase):
+    def setUp(self):
+        self.compressor = addon.PayloadCompressor.negotiate({"codecs": ["zlib"], "threshold": 1024})
+
+    def test_large_payload_is_compressed(self):
+        response = {"status": "success", "result": {"objects": [{"name": f"Cube.{i:03d}"} for i in range(500)]}}
+        buffers = addon._encode_message(response, framed=True, compressor=self.compressor)
+        self.assertLess(len(buffers[0]), len(json.dumps(response)))
+        flags, decoded = _decode(buffers)
+        self.assertTrue(flags & server.FLAG_COMPRESSED)
+        self.assertEqual(decoded, response)
+
+    def test_small_payload_is_sent_as_is(self):
+        response = {"status": "success", "result": {}}
+        buffers = addon._encode_message(response, framed=True, compressor=self.compressor)
+        flags, _ = server._parse_frame_header(buffers[0][:server.FRAME_HEADER.size])
+        self.assertEqual(flags & server.FLAG_COMPRESSED, 0)
+
+    def test_unknown_codec_is_not_negotiated(self):
+        self.assertIsNone(addon.PayloadCompressor.negotiate({"codecs": ["brotli"]}))
+
+    def test_rejects_wrong_declared_length(self):
+        data = b"x" * 4096
+        payload = server.COMPRESSION_HEADER.pack(server.CODEC_IDS["zlib"], len(data) - 1) + zlib.compress(data)
+        with self.assertRaises(ValueError):
+            server._decompress(server.FLAG_COMPRESSED, payload)
+
+    def test_rejects_unknown_codec(self):
+        payload = server.COMPRESSION_HEADER.pack(99, 1) + b"x"
+        with self.assertRaises(ValueError):
+            server._decompress(server.FLAG_COMPRESSED, payload)
+
+class ParseEndpointTest(unittest.TestCase):
+    def test_tcp(self):
+        self.assertEqual(server.parse_endpoint("tcp://localhost:9876"),
+                         {"host": "localhost", "port": 9876, "unix_path": None})
+        self.assertEqual(addon.parse_endpoint("tcp://localhost:9876"), ("localhost", 9876, None))
+
+    def test_tcp_ipv6(self):
+        self.assertEqual(server.parse_endpoint("tcp://[::1]:9876")["host"], "::1")
+        self.assertEqual(addon.parse_endpoint("tcp://[::1]:9876"), ("::1", 9876, None))
+
+    def test_unix(self):
+        self.assertEqual(server.parse_endpoint("unix:///tmp/blender.sock"),
+                         {"host": "localhost", "port": 0, "unix_path": "/tmp/blender.sock"})
+        self.assertEqual(addon.parse_endpoint("unix:///tmp/blender.sock"), ("localhost", 0, "/tmp/blender.sock"))
+
+    def test_invalid(self):
+        for endpoint in ("localhost:9876", "tcp://localhost", "tcp://:9876", "unix://", "http://localhost:80"):
+            with self.subTest(endpoint=endpoint):
+                with self.assertRaises(ValueError):
+                    server.parse_endpoint(endpoint)
+                with self.assertRaises(ValueError):
+                    addon.parse_endpoint(endpoint)
+
+if __name__ == "__main__":
+    unittest.main()
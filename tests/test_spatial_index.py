@@ -0,0 +1,125 @@
+"""SpatialIndex queries over fixed boxes, without Blender.
+
+The index is filled directly instead of from a scene, and sync() is disabled, so the
+grid, the large-object list and the NumPy refinement are tested on their own.
+"""
+
+import unittest
+
+import numpy as np
+
+from fake_bpy import load_addon
+
+addon = load_addon()
+
+def _index(boxes, cell_size=1.0, types=None):
+    """A SpatialIndex over {name: (min, max)} boxes"""
+    index = addon.SpatialIndex()
+    index.sync = lambda: None
+    index.cell_size = cell_size
+    rows = []
+    for name, (lo, hi) in boxes.items():
+        row = index._allocate(name)
+        index._mins[row] = lo
+        index._maxs[row] = hi
+        index._types[row] = (types or {}).get(name, "MESH")
+        rows.append(row)
+    index._insert(rows)
+    return index
+
+BOXES = {
+    "A": ((0, 0, 0), (1, 1, 1)),
+    "B": ((0.5, 0.5, 0.5), (1.5, 1.5, 1.5)),
+    "C": ((5, 5, 5), (6, 6, 6)),
+    # Spans far more than MAX_CELLS cells, so it is kept out of the grid
+    "Ground": ((-100, -100, -1), (100, 100, 0.1)),
+}
+
+class InBoxTest(unittest.TestCase):
+    def setUp(self):
+        self.index = _index(BOXES, types={"Ground": "EMPTY"})
+
+    def test_large_objects_are_kept_aside(self):
+        self.assertEqual(self.index.get_stats()["large_objects"], 1)
+
+    def test_intersecting(self):
+        self.assertEqual(self.index.in_box((0.9, 0.9, 0.9), (1.1, 1.1, 1.1)), ["A", "B"])
+        self.assertEqual(self.index.in_box((4, 4, 4), (5.5, 5.5, 5.5)), ["C"])
+
+    def test_large_object_is_found_from_any_cell(self):
+        self.assertEqual(self.index.in_box((50, 50, 0), (51, 51, 1)), ["Ground"])
+
+    def test_contain(self):
+        self.assertEqual(self.index.in_box((-1, -1, -1), (1.2, 1.2, 1.2), contain=True), ["A"])
+
+    def test_types(self):
+        self.assertEqual(self.index.in_box((0, 0, 0), (1, 1, 1), types=["empty"]), ["Ground"])
+
+    def test_swapped_corners(self):
+        self.assertEqual(self.index.in_box((6, 6, 6), (4, 4, 4)), ["C"])
+
+    def test_huge_query_box_scans_all_rows(self):
+        self.assertEqual(self.index.in_box((-1000, -1000, -1000), (1000, 1000, 1000)), ["A", "B", "C", "Ground"])
+
+    def test_removed_object_is_not_found(self):
+        self.index._release("A")
+        self.assertEqual(self.index.in_box((0, 0, 0), (0.4, 0.4, 0.4)), ["Ground"])
+
+class NearestTest(unittest.TestCase):
+    def setUp(self):
+        self.index = _index({name: box for name, box in BOXES.items() if name != "Ground"})
+
+    def test_nearest_first(self):
+        result = self.index.nearest((7, 6, 6), k=2)
+        self.assertEqual([item["name"] for item in result], ["C", "B"])
+        self.assertEqual(result[0]["distance"], 1.0)
+
+    def test_inside_is_zero(self):
+        self.assertEqual(self.index.nearest((0.75, 0.75, 0.75), k=2),
+                         [{"name": "A", "distance": 0.0}, {"name": "B", "distance": 0.0}])
+
+    def test_max_distance(self):
+        self.assertEqual([item["name"] for item in self.index.nearest((7, 6, 6), k=5, max_distance=2)], ["C"])
+
+    def test_k_larger_than_index(self):
+        self.assertEqual(len(self.index.nearest((0, 0, 0), k=10)), 3)
+
+    def test_empty_index(self):
+        self.assertEqual(_index({}).nearest((0, 0, 0)), [])
+
+class OverlapTest(unittest.TestCase):
+    def test_pairs(self):
+        index = _index(BOXES)
+        self.assertEqual(index.overlapping_pairs(), {
+            "pairs": [["A", "B"], ["A", "Ground"]],
+            "count": 2,
+            "truncated": False,
+        })
+
+    def test_touching_boxes_do_not_overlap(self):
+        index = _index({"A": ((0, 0, 0), (1, 1, 1)), "B": ((1, 0, 0), (2, 1, 1))})
+        self.assertEqual(index.overlapping_pairs()["pairs"], [])
+
+    def test_margin_and_names(self):
+        index = _index(BOXES)
+        self.assertEqual(index.overlapping_pairs(margin=0.2)["pairs"], [["A", "B"]])
+        self.assertEqual(index.overlapping_pairs(names=["Ground"])["pairs"], [["A", "Ground"]])
+
+    def test_limit(self):
+        result = _index(BOXES).overlapping_pairs(limit=1)
+        self.assertEqual((len(result["pairs"]), result["count"], result["truncated"]), (1, 2, True))
+
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        mins = rng.uniform(0, 20, (200, 3))
+        maxs = mins + rng.uniform(0.1, 3, (200, 3))
+        index = _index({f"Obj{i}": (mins[i], maxs[i]) for i in range(200)})
+        expected = sorted(
+            sorted((f"Obj{i}", f"Obj{j}"))
+            for i in range(200) for j in range(i + 1, 200)
+            if np.all(mins[i] < maxs[j]) and np.all(mins[j] < maxs[i])
+        )
+        self.assertEqual(index.overlapping_pairs(limit=100000)["pairs"], expected)
+
+if __name__ == "__main__":
+    unittest.main()